@@ -0,0 +1,33 @@
+import json
+import sys
+from . import main
+from ..db.bench import Bench, LocalServer
+
+
+class Main(main.Main):
+    def start(self):
+        batch = self.args.get('batch')
+        options = {
+            'rows': self.args.get('rows') or 10000,
+            'repeat': self.args.get('repeat') or 3,
+            'batch_sizes': [int(i) for i in batch.split(',')] if batch else None,
+        }
+        if self.args.get('local'):
+            with LocalServer() as dsn:
+                from ..db.conn import connect
+                conn = connect(dsn)
+                conn.exec('CREATE DATABASE IF NOT EXISTS liger_bench')
+                conn.close()
+                result = Bench(dsn, db='liger_bench', **options).run()
+        else:
+            result = Bench(self.args['dsn'], **options).run()
+
+        if self.args.get('output'):
+            Bench.save(result, self.args['output'])
+        print(json.dumps(result, indent=2))
+        if self.args.get('compare'):
+            regressions = Bench.compare(Bench.load(self.args['compare']), result, self.args.get('tolerance') or 0.1)
+            for r in regressions:
+                print(f"REGRESSION {r['metric']}: {r['baseline']:.2f} -> {r['value']:.2f} ({r['change']:+.1%})")
+            if regressions:
+                sys.exit(1)
@@ -1,5 +1,7 @@
 # -*- coding: utf-8 -*-
 import sys
+import threading
+import time
 from pathlib import Path
 from ..core import fn
 from . import main
@@ -11,5 +13,13 @@ class Main(main.Main):
             self.args['path']=''
         path=Path(self.args['path'])
         sys.path[0]=f'{path.resolve()}'
-        
+
+        if self.args.get('interval'):
+            threading.Thread(target=self.refresh, daemon=True).start()
         fn.monitor_files()
+
+    def refresh(self):
+        """Refresh the DSN snapshots every `interval` seconds."""
+        while True:
+            fn.monitor_dsn(self.args['path'] or None)
+            time.sleep(self.args['interval'])
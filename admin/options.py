@@ -1,6 +1,6 @@
 import argparse
 
-commands = ['init', 'run', 'web', 'monitor']
+commands = ['init', 'run', 'web', 'monitor', 'bench']
 
 
 def init(parser: argparse.ArgumentParser):
@@ -57,3 +57,71 @@ def monitor(parser: argparse.ArgumentParser):
         help="Path for the project (optional). Defaults to current directory.",
         default=None,
     )
+    parser.add_argument(
+        "-i",
+        "--interval",
+        type=float,
+        help="Seconds between the refreshes of the DSN snapshots (optional). Defaults to no refresh.",
+        default=None,
+    )
+
+
+def bench(parser: argparse.ArgumentParser):
+    """Benchmarks a database connection and writes the results as JSON."""
+    parser.add_argument(
+        "dsn",
+        nargs='?',
+        help="DSN name of dsn.json or URI. Defaults to an in-memory SQLite database.",
+        default='sqlite:///:memory:',
+    )
+    parser.add_argument(
+        "-l",
+        "--local",
+        action='store_true',
+        help="Start a local MariaDB/MySQL server in a temporary directory instead of using the DSN.",
+    )
+    parser.add_argument(
+        "-r",
+        "--rows",
+        type=int,
+        help="Rows loaded and read. Defaults to 10000.",
+        default=10000,
+    )
+    parser.add_argument(
+        "-b",
+        "--batch",
+        help="Comma separated batch sizes of the loads. Defaults to 100,1000,5000.",
+        default=None,
+    )
+    parser.add_argument(
+        "-n",
+        "--repeat",
+        type=int,
+        help="Runs of each measure, the best one is kept. Defaults to 3.",
+        default=3,
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        help="JSON file of the results (optional).",
+        default=None,
+    )
+    parser.add_argument(
+        "-c",
+        "--compare",
+        help="JSON file of a previous run to check for regressions (optional).",
+        default=None,
+    )
+    parser.add_argument(
+        "-t",
+        "--tolerance",
+        type=float,
+        help="Accepted relative change before a measure counts as a regression. Defaults to 0.1.",
+        default=0.1,
+    )
+    parser.add_argument(
+        "-p",
+        "--path",
+        help="Path for the project (optional). Defaults to current directory.",
+        default=None,
+    )
@@ -92,10 +92,8 @@ def dsn(conn: 'str|dict') -> dict:
             }
             ```
     """
-    from ..db import dsn as d
-    o = d.Dsn()
-    c = o(conn)
-    return c if isinstance(c, dict) else {}
+    from ..db.dsn import Dsn
+    return Dsn.resolve(conn)[0]
 
 
 def copy(source_dir: str = None,
@@ -640,5 +638,44 @@ def monitor_files():
     monitor.Handler.start()
 
 
-def monitor_dsn():
-    dsn_disct = conf('dsn.json')
+def monitor_dsn(path: str = None) -> dict:
+    """
+    Refresh the reverse engineering snapshot of every MySQL/MariaDB DSN of `dsn.json`.
+
+    Snapshots are kept in the binary `conf/snapshot/<dsn>.cat` and only the tables whose
+    fingerprint changed since the last pass are reverse engineered again.
+
+    Args:
+        path (str, optional): The base path to locate configuration files. Defaults to None.
+
+    Returns:
+        dict: DSN name to the changes of `Snapshot.refresh()`, or to the error.
+    """
+    import os
+    from ..db.dsn import Dsn
+    from ..db.conn import connect
+    from ..db.snapshot import Snapshot
+    from . import log
+    logger = log.Logger()
+
+    file = get_conf_fullfilename(Dsn.config_file, path)
+    if not file:
+        return {}
+    folder = os.path.join(os.path.dirname(file), 'snapshot')
+    out = {}
+    for name in list(Dsn().keys):
+        cfg = dsn(name)
+        if cfg.get('scheme', 'mysql').lower() not in ('mysql', 'mariadb') or 'host' not in cfg:
+            continue
+        try:
+            with connect(name) as db:
+                if not db.conn:
+                    out[name] = db.error
+                    continue
+                out[name] = Snapshot(db, file=os.path.join(folder, f'{name}.cat')).refresh()
+            if any(out[name].values()):
+                logger.info(f'Snapshot "{name}": {out[name]}')
+        except Exception as e:
+            out[name] = e
+            logger.warning(f'Snapshot "{name}": {e}')
+    return out
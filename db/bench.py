@@ -0,0 +1,355 @@
+import json
+import os
+import platform
+import shutil
+import socket
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Callable
+
+
+class LocalServer:
+    """
+    MariaDB/MySQL server started in a temporary data directory, for benchmarks
+    that must not touch a shared server.
+
+    Examples:
+        ```python
+        with LocalServer() as dsn:
+            Bench(dsn).run()
+        ```
+    """
+
+    binaries = ('mariadbd', 'mysqld')
+    """Server binaries looked up in `PATH`, in order."""
+
+    def __init__(self, port: int = None, timeout: float = 60.0) -> None:
+        """
+        Args:
+            port (int, optional): TCP port. Defaults to a free one.
+            timeout (float, optional): Seconds to wait for the server to accept connections. Defaults to 60.
+        """
+        self.port: int = port or self.free_port()
+        self.timeout: float = timeout
+        self.datadir: 'str|None' = None
+        self.__process: 'subprocess.Popen|None' = None
+
+    def __enter__(self) -> dict:
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    @staticmethod
+    def free_port() -> int:
+        with socket.socket() as s:
+            s.bind(('127.0.0.1', 0))
+            return s.getsockname()[1]
+
+    @classmethod
+    def binary(cls) -> 'str|None':
+        """Path of the first server binary found."""
+        for name in cls.binaries:
+            path = shutil.which(name)
+            if path:
+                return path
+
+    def start(self) -> dict:
+        """
+        Initialize the data directory and start the server.
+
+        Returns:
+            dict: DSN of the server, `root` without password.
+
+        Raises:
+            RuntimeError: No server binary, or the server did not start in time.
+        """
+        binary = self.binary()
+        if not binary:
+            raise RuntimeError(f"No {' or '.join(self.binaries)} in PATH")
+        self.datadir = tempfile.mkdtemp(prefix='liger_bench_')
+        mariadb = os.path.basename(binary).startswith('mariadb')
+        user = ['--user=root'] if hasattr(os, 'geteuid') and os.geteuid() == 0 else []
+        if mariadb:
+            install = shutil.which('mariadb-install-db') or shutil.which('mysql_install_db')
+            init = [install, '--no-defaults', f'--datadir={self.datadir}', '--auth-root-authentication-method=normal']
+        else:
+            init = [binary, '--no-defaults', '--initialize-insecure', f'--datadir={self.datadir}']
+        subprocess.run(init + user, check=True, capture_output=True)
+        self.__process = subprocess.Popen(
+            [
+                binary, '--no-defaults',
+                f'--datadir={self.datadir}',
+                f'--socket={os.path.join(self.datadir, "mysqld.sock")}',
+                f'--port={self.port}',
+                '--bind-address=127.0.0.1',
+                '--skip-log-bin',
+            ] + user,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        deadline = time.monotonic() + self.timeout
+        while time.monotonic() < deadline:
+            if self.__process.poll() is not None:
+                break
+            try:
+                socket.create_connection(('127.0.0.1', self.port), 1).close()
+                return {
+                    'scheme': 'mariadb' if mariadb else 'mysql',
+                    'host': '127.0.0.1',
+                    'port': self.port,
+                    'user': 'root',
+                    'password': '',
+                }
+            except OSError:
+                time.sleep(0.2)
+        self.stop()
+        raise RuntimeError(f'{binary} did not start')
+
+    def stop(self):
+        """Stop the server and remove its data directory."""
+        if self.__process:
+            self.__process.terminate()
+            try:
+                self.__process.wait(30)
+            except subprocess.TimeoutExpired:
+                self.__process.kill()
+            self.__process = None
+        if self.datadir:
+            shutil.rmtree(self.datadir, ignore_errors=True)
+            self.datadir = None
+
+
+class Bench:
+    """
+    Benchmark of a database driver: connection setup latency, read throughput
+    of `query`, `all`, `line` and `value`, and `many` at several batch sizes.
+
+    The rows come from the synthetic `Dummy` backend, so every run loads the
+    same data. Each measure is repeated and the best run is kept, which is the
+    one least disturbed by the machine. Results are plain dicts that `save()`
+    writes as JSON, and `compare()` finds the regressions against a baseline.
+
+    Examples:
+        ```python
+        bench = Bench('sqlite:///:memory:', rows=20000)
+        result = bench.run()
+        Bench.save(result, 'bench.json')
+        print(Bench.compare(Bench.load('baseline.json'), result))
+        ```
+    """
+
+    table: str = 'liger_bench'
+    """Scratch table, dropped before and after the run."""
+
+    batch_sizes: 'tuple[int, ...]' = (100, 1000, 5000)
+    """Batch sizes of `many`."""
+
+    def __init__(self,
+                 dsn: 'str|dict',
+                 rows: int = 10000,
+                 repeat: int = 3,
+                 connects: int = 20,
+                 lookups: int = 1000,
+                 db: str = None,
+                 batch_sizes: 'tuple[int, ...]' = None,
+                 ) -> None:
+        """
+        Args:
+            dsn (str|dict): DSN name of `dsn.json`, URI or config dict.
+            rows (int, optional): Rows loaded and read. Defaults to 10000.
+            repeat (int, optional): Runs of each measure. Defaults to 3.
+            connects (int, optional): Connections opened to measure the setup latency. Defaults to 20.
+            lookups (int, optional): Calls of `line` and `value`. Defaults to 1000.
+            db (str, optional): Database to select. Defaults to None.
+            batch_sizes (tuple[int, ...], optional): Overrides `batch_sizes`. Defaults to None.
+        """
+        self.dsn: 'str|dict' = dsn
+        self.rows: int = rows
+        self.repeat: int = max(1, repeat)
+        self.connects: int = connects
+        self.lookups: int = min(lookups, rows)
+        self.database: 'str|None' = db
+        if batch_sizes:
+            self.batch_sizes = tuple(batch_sizes)
+
+    def open(self, pool: 'dict|bool' = False):
+        from .conn import connect
+        return connect(self.dsn, self.database, pool)
+
+    def data(self) -> 'list[dict]':
+        """Rows of the scratch table, generated by `Dummy`."""
+        from .dummy import Dummy
+        from .models.types import number, string
+        gen = Dummy({'scheme': 'dummy', 'rows': self.rows, 'seed': 0, 'tables': {self.table: {
+            'id': number.Int(auto_increment=True),
+            'name': string.VarChar(40),
+            'amount': number.Float(12, 2, max=100000),
+            'code': {'type': string.Char(8), 'cardinality': 100},
+        }}})
+        return gen.all(f'SELECT * FROM {self.table}')
+
+    def run(self) -> dict:
+        """
+        Run every measure.
+
+        Returns:
+            dict: `{'meta': {...}, 'connect': {...}, 'many': {size: {...}}, 'read': {method: {...}}}`
+        """
+        db = self.open()
+        if not db.conn:
+            raise RuntimeError(f'Connection failed: {db.error}')
+        result = {
+            'meta': {
+                'driver': db.__class__.__name__,
+                'dsn': db.dsn.get('dsn'),
+                'rows': self.rows,
+                'repeat': self.repeat,
+                'python': platform.python_version(),
+                'machine': platform.machine(),
+                'date': datetime.now().isoformat(timespec='seconds'),
+            },
+            'connect': self.connect(),
+        }
+        rows = self.data()
+        try:
+            result['many'] = self.many(db, rows)
+            result['read'] = self.read(db)
+        finally:
+            db.exec(f'DROP TABLE IF EXISTS {self.table}')
+            db.close()
+        return result
+
+    def connect(self) -> dict:
+        """Setup latency of dedicated connections and of pooled ones, in milliseconds."""
+        out = {}
+        for name, pool in (('direct', False), ('pool', True)):
+            times = []
+            for _ in range(self.connects):
+                start = time.perf_counter()
+                db = self.open(pool)
+                times.append((time.perf_counter() - start) * 1000)
+                db.close()
+            out[name] = self.__latency(times)
+        return out
+
+    def many(self, db, rows: 'list[dict]') -> dict:
+        """Inserts per second of `many` at each batch size."""
+        out = {}
+        for size in self.batch_sizes:
+            def load():
+                self.__create(db)
+                return db.many(self.table, rows, {'max_rows': size})
+            seconds, result = self.__best(load)
+            if not result:
+                raise RuntimeError(f'many failed: {db.error}')
+            out[str(size)] = {
+                'seconds': seconds,
+                'rows_per_sec': len(rows) / seconds,
+                'batches': result.batches,
+            }
+        return out
+
+    def read(self, db) -> dict:
+        """Rows per second of `query` and `all`, and calls per second of `line` and `value`."""
+        sql = f'SELECT * FROM {self.table}'
+        lookup = f'SELECT * FROM {self.table} WHERE id = %s'
+        keys = [(i,) for i in range(1, self.lookups + 1)]
+        measures: 'dict[str, tuple[Callable[[], Any], int]]' = {
+            'query': (lambda: sum(1 for _ in db.query(sql)), self.rows),
+            'all': (lambda: len(db.all(sql)), self.rows),
+            'line': (lambda: [db.line(lookup, k) for k in keys], len(keys)),
+            'value': (lambda: [db.value(f'SELECT name FROM {self.table} WHERE id = %s', k) for k in keys], len(keys)),
+        }
+        out = {}
+        for name, (fn, count) in measures.items():
+            seconds, _ = self.__best(fn)
+            out[name] = {'seconds': seconds, 'rows_per_sec': count / seconds}
+        return out
+
+    def __create(self, db):
+        db.exec(f'DROP TABLE IF EXISTS {self.table}')
+        db.exec(
+            f'CREATE TABLE {self.table} (' +
+            'id INTEGER NOT NULL PRIMARY KEY, name VARCHAR(40), amount DOUBLE, code CHAR(8))'
+        )
+
+    def __best(self, fn: 'Callable[[], Any]') -> 'tuple[float, Any]':
+        best, result = None, None
+        for _ in range(self.repeat):
+            start = time.perf_counter()
+            result = fn()
+            seconds = time.perf_counter() - start
+            best = seconds if best is None else min(best, seconds)
+        return max(best, 1e-9), result
+
+    @staticmethod
+    def __latency(times: 'list[float]') -> dict:
+        if not times:
+            return {}
+        times = sorted(times)
+        return {
+            'n': len(times),
+            'min_ms': times[0],
+            'p50_ms': statistics.median(times),
+            'p95_ms': times[min(len(times) - 1, int(len(times) * 0.95))],
+            'max_ms': times[-1],
+        }
+
+    @staticmethod
+    def save(result: dict, path: str):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2)
+
+    @staticmethod
+    def load(path: str) -> dict:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+
+    @classmethod
+    def compare(cls, baseline: dict, result: dict, tolerance: float = 0.1) -> 'list[dict]':
+        """
+        Measures worse than the baseline by more than `tolerance`.
+
+        Throughput (`rows_per_sec`) regresses when it drops, latency (`*_ms`) when it grows.
+
+        Args:
+            baseline (dict): Result of a previous `run()`.
+            result (dict): Result to check.
+            tolerance (float, optional): Accepted relative change. Defaults to 0.1.
+
+        Returns:
+            list[dict]: `{'metric': 'read.all.rows_per_sec', 'baseline': float, 'value': float, 'change': float}`
+        """
+        old = cls.__flatten(baseline)
+        out = []
+        for metric, value in cls.__flatten(result).items():
+            base = old.get(metric)
+            if not base:
+                continue
+            if metric.endswith('rows_per_sec'):
+                change = value / base - 1
+                worse = change < -tolerance
+            elif metric.endswith('_ms'):
+                change = value / base - 1
+                worse = change > tolerance
+            else:
+                continue
+            if worse:
+                out.append({'metric': metric, 'baseline': base, 'value': value, 'change': change})
+        return out
+
+    @classmethod
+    def __flatten(cls, data: dict, prefix: str = '') -> 'dict[str, float]':
+        out = {}
+        for k, v in data.items():
+            if k == 'meta':
+                continue
+            if isinstance(v, dict):
+                out |= cls.__flatten(v, f'{prefix}{k}.')
+            elif isinstance(v, (int, float)):
+                out[f'{prefix}{k}'] = v
+        return out
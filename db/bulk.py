@@ -0,0 +1,199 @@
+import time
+from itertools import chain
+from typing import Any, Iterable, Iterator
+
+
+class BulkResult:
+    """Outcome of a bulk load: rows written, throughput and per-batch errors."""
+
+    def __init__(self) -> None:
+        self.rows: int = 0
+        """Rows sent in batches that succeeded."""
+        self.batches: int = 0
+        """Batches executed, including the failed ones."""
+        self.commits: int = 0
+        """Commits issued."""
+        self.errors: 'list[dict]' = []
+        """Failed batches as `{'batch': int, 'rows': int, 'error': Exception}`."""
+        self.seconds: float = 0.0
+        """Wall time of the load."""
+        self.__start: float = time.perf_counter()
+
+    def __bool__(self) -> bool:
+        return not self.errors
+
+    def __repr__(self) -> str:
+        return \
+            f'{self.__class__.__name__}(' +\
+            f'rows={self.rows}, ' +\
+            f'batches={self.batches}, ' +\
+            f'errors={len(self.errors)}, ' +\
+            f'rows_per_sec={self.rows_per_sec:.0f})'
+
+    @property
+    def rows_per_sec(self) -> float:
+        """Rows written per second."""
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def stop(self) -> 'BulkResult':
+        """Record the elapsed time."""
+        self.seconds = time.perf_counter() - self.__start
+        return self
+
+
+class Bulk:
+    """
+    Builder of multi-row `INSERT`/`REPLACE` statements.
+
+    Streams rows from any iterable and groups them into `VALUES (...), (...)`
+    batches whose estimated size stays under `max_packet`, so a load of any
+    size never needs the whole list in memory.
+
+    Examples:
+        ```python
+        bulk = Bulk('tbl', rows, {'update': True})
+        for sql, values, count in bulk:
+            cursor.execute(sql, values)
+        ```
+    """
+
+    commands = ('INSERT', 'INSERT IGNORE', 'REPLACE')
+    """Supported commands."""
+
+    default = {
+        'command': 'INSERT',
+        'columns': None,
+        'update': None,
+        'max_packet': 4 * 1024 * 1024,
+        'max_rows': 5000,
+        'max_params': None,
+        'row_alias': False,
+    }
+    """
+    Default configuration:
+    - command (str): `INSERT`, `INSERT IGNORE` or `REPLACE`
+    - columns (list[str]): Keys of the rows to write, missing keys are NULL. Defaults to
+      the keys of all the rows of a list, or of the first row of a stream, whose other
+      rows must then have the same keys
+    - update (bool|list|dict): `ON DUPLICATE KEY UPDATE` of all columns (`True`),
+      of some columns (`list`) or with expressions (`dict` column to SQL)
+    - max_packet (int): Statement size limit in bytes, usually `max_allowed_packet`
+    - max_rows (int): Rows limit of a batch
+    - max_params (int): Placeholders limit of a batch, as in prepared statements
+    - row_alias (bool): Use the MySQL 8.0.19+ row alias instead of the deprecated `VALUES()`
+    """
+
+    def __init__(self, tbl: str, data: 'Iterable[dict]', config: dict = {}) -> None:
+        """
+        Initialize the builder.
+
+        Args:
+            tbl (str): Target table name.
+            data (Iterable[dict]): Rows as dictionaries, a list or a generator.
+            config (dict, optional): See `default`. Defaults to {}.
+
+        Raises:
+            ValueError: If the command is not supported, or, while iterating, if a row of a
+                stream without `columns` has other keys than the first one.
+        """
+        self.config: dict = {**self.default, **{k: v for k, v in config.items() if v is not None}}
+        command = self.config['command'].upper()
+        if command not in self.commands:
+            raise ValueError(f'Unsupported bulk command: {command}')
+        self.command: str = command
+        self.tbl: str = tbl
+
+        self.__same: 'set|None' = None
+        """Keys every row must have, for a stream without `columns`."""
+        if self.config['columns']:
+            keys = self.config['columns']
+            self.__rows: 'Iterator[dict]' = iter(data)
+        elif isinstance(data, (list, tuple)):
+            # a list is read twice: once for the union of its keys, in order of appearance
+            keys = list(dict.fromkeys(k for row in data for k in row))
+            self.__rows = iter(data)
+        else:
+            rows = iter(data)
+            first = next(rows, None)
+            self.__rows = chain([first], rows) if first is not None else iter([])
+            keys = list(first.keys()) if first else []
+            self.__same = set(keys)
+        self.keys: 'list[str]' = list(keys)
+        """Keys read from every row."""
+        self.columns: 'list[str]' = [k.replace(' ', '_') if k else '' for k in self.keys]
+        """Column names of the statement."""
+        self.__head: str = \
+            f'{command} {tbl} (`' + '`, `'.join(self.columns) + '`) VALUES '
+        self.__tail: str = self.__update()
+        self.__row: str = '(' + ', '.join(['%s'] * len(self.keys)) + ')'
+
+    def __iter__(self) -> 'Iterator[tuple[str, list, int]]':
+        """
+        Yields:
+            tuple[str, list, int]: Statement, flat list of values and row count of each batch.
+        """
+        if not self.keys:
+            return
+        limit = self.config['max_packet'] * 0.9 - len(self.__head) - len(self.__tail)
+        max_rows = self.config['max_rows']
+        keys = self.keys
+        if self.config['max_params']:
+            max_rows = max(1, min(max_rows, self.config['max_params'] // len(keys)))
+        size = self.size
+        overhead = len(self.__row) + 2
+        values: list = []
+        count = 0
+        total = 0
+        same = self.__same
+        for n, row in enumerate(self.__rows):
+            if same is not None and row.keys() != same:
+                raise ValueError(
+                    f'Row {n} of {self.tbl} has keys {sorted(row.keys() ^ same)} unlike the first row, pass columns')
+            line = [row.get(k) for k in keys]
+            bytes_row = overhead + sum(map(size, line))
+            if count and (total + bytes_row > limit or count >= max_rows):
+                yield self.statement(count), values, count
+                values, count, total = [], 0, 0
+            values.extend(line)
+            count += 1
+            total += bytes_row
+        if count:
+            yield self.statement(count), values, count
+
+    def statement(self, rows: int) -> str:
+        """
+        SQL of a batch.
+
+        Args:
+            rows (int): Number of rows in the batch.
+
+        Returns:
+            str: Multi-row statement with `%s` placeholders.
+        """
+        return self.__head + ', '.join([self.__row] * rows) + self.__tail
+
+    @staticmethod
+    def size(value: Any) -> int:
+        """Estimated bytes of a value in the statement."""
+        if value is None:
+            return 4
+        if isinstance(value, str):
+            return len(value.encode()) + 2
+        if isinstance(value, (bytes, bytearray)):
+            return len(value) + 2
+        return 24
+
+    def __update(self) -> str:
+        update = self.config['update']
+        if not update or self.command != 'INSERT':
+            return ''
+        if isinstance(update, dict):
+            arr = [f'`{k}` = {v}' for k, v in update.items()]
+        else:
+            cols = self.columns if update is True else [c.replace(' ', '_') for c in update]
+            if self.config['row_alias']:
+                arr = [f'`{c}` = new.`{c}`' for c in cols]
+            else:
+                arr = [f'`{c}` = VALUES(`{c}`)' for c in cols]
+        alias = ' AS new' if self.config['row_alias'] else ''
+        return f'{alias} ON DUPLICATE KEY UPDATE ' + ', '.join(arr)
@@ -0,0 +1,243 @@
+import re
+import sys
+import time
+import threading
+from collections import OrderedDict
+from typing import Any
+
+
+class Cache:
+    """
+    Query result cache with TTL, LRU eviction and table-based invalidation.
+
+    Entries are keyed by the normalized SQL plus its parameters and bounded by
+    entry count and estimated bytes. Each entry records the tables its SQL reads,
+    so a write to any of them (`exec`, `many`, `load_stream`) drops it at once.
+
+    Examples:
+        ```python
+        cache = Cache.get_cache(key, ttl=30)
+        cache.set(Cache.key(sql, param), rows, Cache.tables(sql))
+        cache.invalidate(Cache.tables('UPDATE users SET name = %s'))
+        ```
+    """
+
+    caches: 'dict[str, Cache]' = {}
+    """Registry of caches by DSN key."""
+
+    __lock = threading.Lock()
+    """Lock that protects the registry."""
+
+    re_space = re.compile(r"""('(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*")|\s+""")
+    """Whitespace outside of quoted literals."""
+
+    re_read = re.compile(r'^\s*(?:\(\s*)*(?:SELECT|WITH)\b', re.I)
+    """Statements that can be cached."""
+
+    re_lock = re.compile(r'\bFOR\s+UPDATE\b|\bLOCK\s+IN\s+SHARE\s+MODE\b|\bINTO\s+(?:@|OUTFILE|DUMPFILE)', re.I)
+    """Reads with side effects, never cached."""
+
+    re_table = re.compile(
+        r'\b(?:FROM|JOIN|INTO|UPDATE|TRUNCATE(?:\s+TABLE)?|TABLE)\s+([`\w$.]+)'
+        r'|\b(?:INSERT|REPLACE)(?:\s+(?:IGNORE|LOW_PRIORITY|DELAYED|HIGH_PRIORITY))*\s+(?!INTO\b)([`\w$.]+)',
+        re.I)
+    """Table references of a statement."""
+
+    re_list = re.compile(r'\bFROM\s+((?:[`\w$.]+(?:\s+(?:AS\s+)?\w+)?\s*,\s*)+[`\w$.]+)', re.I)
+    """Comma separated table lists of `FROM a, b`."""
+
+    def __init__(self, size: int = 1000, max_bytes: int = 64 * 1024 * 1024, ttl: float = 60) -> None:
+        """
+        Initialize a result cache.
+
+        Args:
+            size (int, optional): Maximum entries. Defaults to 1000.
+            max_bytes (int, optional): Maximum estimated bytes of all entries. Defaults to 64 MiB.
+            ttl (float, optional): Seconds an entry stays valid. Defaults to 60.
+        """
+        self.size: int = size
+        self.max_bytes: int = max_bytes
+        self.ttl: float = ttl
+        self.hits: int = 0
+        self.misses: int = 0
+        self.bytes: int = 0
+        """Estimated bytes of all entries."""
+        self.__items: 'OrderedDict[Any, tuple]' = OrderedDict()
+        """Entries as `key: (value, tables, bytes, expires)`."""
+        self.__tables: 'dict[str, set]' = {}
+        """Keys of the entries by table."""
+        self.__lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self.__items)
+
+    def __contains__(self, key: Any) -> bool:
+        return self.get(key, False) is not None
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({self.stats})'
+
+    @classmethod
+    def get_cache(cls, key: str, **options) -> 'Cache':
+        """
+        Get the cache of a DSN key, creating it on first use.
+
+        Args:
+            key (str): DSN key, see `Pool.key()`.
+            **options: Options of a new cache (`size`, `max_bytes`, `ttl`).
+
+        Returns:
+            Cache: The shared cache of the key.
+        """
+        with cls.__lock:
+            cache = cls.caches.get(key)
+            if cache is None:
+                cache = cls.caches[key] = cls(**options)
+        return cache
+
+    @classmethod
+    def clear_all(cls):
+        """Empty every cache and the registry."""
+        with cls.__lock:
+            caches = list(cls.caches.values())
+            cls.caches.clear()
+        for cache in caches:
+            cache.clear()
+
+    @classmethod
+    def normalize(cls, sql: str) -> str:
+        """Collapse the whitespace of a SQL outside of quoted literals."""
+        return cls.re_space.sub(lambda m: m.group(1) or ' ', sql).strip()
+
+    @classmethod
+    def key(cls, sql: str, param: 'tuple|list|dict' = [], *extra) -> tuple:
+        """
+        Key of a query.
+
+        Args:
+            sql (str): SQL query string.
+            param (tuple|list|dict, optional): Parameters of the query. Defaults to empty list.
+            *extra: Other values that change the result, like the selected database.
+
+        Returns:
+            tuple: Hashable key.
+        """
+        return (cls.normalize(sql), repr(param)) + extra
+
+    @classmethod
+    def cacheable(cls, sql: str) -> bool:
+        """Whether the SQL is a plain read."""
+        return bool(cls.re_read.match(sql)) and not cls.re_lock.search(sql)
+
+    @classmethod
+    def tables(cls, sql: str) -> 'set[str]':
+        """
+        Tables referenced by a statement, lowercase and without schema or quotes.
+
+        Args:
+            sql (str): SQL statement, or a bare table name.
+
+        Returns:
+            set[str]: Table names.
+        """
+        if re.fullmatch(r'[`\w$.]+', sql.strip()):
+            return {cls.__table(sql)}
+        out = {cls.__table(a or b) for a, b in cls.re_table.findall(sql)}
+        for group in cls.re_list.findall(sql):
+            out |= {cls.__table(i.split()[0]) for i in group.split(',')}
+        out.discard('')
+        return out
+
+    @staticmethod
+    def sizeof(rows: 'list[tuple]') -> int:
+        """Estimated bytes of raw rows."""
+        getsizeof = sys.getsizeof
+        return getsizeof(rows) + sum(getsizeof(r) + sum(map(getsizeof, r)) for r in rows)
+
+    @property
+    def stats(self) -> dict:
+        """Counters of the cache."""
+        return {
+            'entries': len(self.__items),
+            'bytes': self.bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+        }
+
+    def get(self, key: Any, count: bool = True) -> Any:
+        """
+        Value of a key, or None if missing or expired.
+
+        Args:
+            key (Any): Key built by `key()`.
+            count (bool, optional): Update the hit/miss counters. Defaults to True.
+        """
+        with self.__lock:
+            item = self.__items.get(key)
+            if item is not None and item[3] < time.monotonic():
+                self.__remove(key)
+                item = None
+            if item is None:
+                self.misses += count
+                return None
+            self.hits += count
+            self.__items.move_to_end(key)
+            return item[0]
+
+    def set(self, key: Any, value: Any, tables: 'set[str]', nbytes: int = 0):
+        """
+        Store a value.
+
+        Args:
+            key (Any): Key built by `key()`.
+            value (Any): Value to cache.
+            tables (set[str]): Tables read by the query.
+            nbytes (int, optional): Estimated bytes of the value. Defaults to 0.
+        """
+        if nbytes > self.max_bytes:
+            return
+        with self.__lock:
+            if key in self.__items:
+                self.__remove(key)
+            self.__items[key] = (value, tables, nbytes, time.monotonic() + self.ttl)
+            self.bytes += nbytes
+            for t in tables:
+                self.__tables.setdefault(t, set()).add(key)
+            while self.__items and (len(self.__items) > self.size or self.bytes > self.max_bytes):
+                self.__remove(next(iter(self.__items)))
+
+    def invalidate(self, tables: 'set[str]|None' = None):
+        """
+        Drop the entries that read any of the tables.
+
+        Args:
+            tables (set[str]|None, optional): Written tables. Empty or None drops everything.
+        """
+        if not tables:
+            self.clear()
+            return
+        with self.__lock:
+            for t in tables:
+                for key in list(self.__tables.get(t, ())):
+                    self.__remove(key)
+
+    def clear(self):
+        """Drop every entry."""
+        with self.__lock:
+            self.__items.clear()
+            self.__tables.clear()
+            self.bytes = 0
+
+    def __remove(self, key: Any):
+        value, tables, nbytes, _ = self.__items.pop(key)
+        self.bytes -= nbytes
+        for t in tables:
+            keys = self.__tables.get(t)
+            if keys:
+                keys.discard(key)
+                if not keys:
+                    del self.__tables[t]
+
+    @staticmethod
+    def __table(name: str) -> str:
+        return name.replace('`', '').split('.')[-1].lower()
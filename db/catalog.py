@@ -0,0 +1,413 @@
+import mmap
+import os
+import struct
+from collections.abc import MutableMapping
+from typing import Any, Iterator
+
+
+class Catalog:
+    """
+    Binary snapshot of reverse engineered tables, read lazily through `mmap`.
+
+    Every string (names, types, collations, attribute keys) is stored once in
+    a string table and referenced by number. Table descriptions, as made by
+    `Snapshot.dump()`, are encoded one after the other and found through an
+    index sorted by `schema.table`. Opening a catalog reads only its header:
+    a lookup is a binary search on the index followed by the decoding of a
+    single table, so a worker that needs one definition does not parse, or
+    keep in memory, the other thousands.
+
+    Layout (little endian):
+        - header: magic, version, counts and the offsets of the sections
+        - records: tagged values, strings as references to the string table
+        - strings: `count + 1` offsets (u32) and the UTF-8 data
+        - index: `(key, fingerprint, offset, length)` sorted by key bytes
+        - meta: one record with the collation of each schema
+
+    Examples:
+        ```python
+        Catalog.write('warehouse.cat', {'sales.orders': Snapshot.dump(orders)})
+        with Catalog('warehouse.cat') as cat:
+            orders = cat.table('sales.orders')
+        ```
+    """
+
+    magic: bytes = b'LGRC'
+    version: int = 1
+
+    header = struct.Struct('<4sHHIIQQQ')
+    """magic, version, flags, strings, entries, strings offset, index offset, meta offset."""
+
+    entry = struct.Struct('<IIQI')
+    """Index entry: key string, fingerprint string, record offset, record length."""
+
+    NONE, FALSE, TRUE, INT, FLOAT, STR, LIST, DICT = range(8)
+    """Value tags."""
+
+    def __init__(self, file: str) -> None:
+        """
+        Map a catalog file.
+
+        Args:
+            file (str): Catalog written by `write()`.
+
+        Raises:
+            ValueError: The file is not a catalog of this version.
+        """
+        self.file: str = file
+        self.__fh = open(file, 'rb')
+        try:
+            self.__mm = mmap.mmap(self.__fh.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self.__fh.close()
+            raise ValueError(f'Empty catalog: {file}')
+        if len(self.__mm) < self.header.size or self.__mm[:4] != self.magic:
+            self.close()
+            raise ValueError(f'Not a catalog: {file}')
+        magic, version, _, strings, entries, self.__strings_at, self.__index_at, self.__meta_at = \
+            self.header.unpack_from(self.__mm, 0)
+        if version != self.version:
+            self.close()
+            raise ValueError(f'Not a catalog of version {self.version}: {file}')
+        self.__count: int = entries
+        self.__blob_at: int = self.__strings_at + 4 * (strings + 1)
+        self.__strings: 'dict[int, str]' = {}
+        self.__tables: 'dict[str, Any]' = {}
+        self.__dbs: 'dict[str, Any]' = {}
+
+    def __enter__(self) -> 'Catalog':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self) -> int:
+        return self.__count
+
+    def __contains__(self, key: str) -> bool:
+        return self.__find(key) >= 0
+
+    def __iter__(self) -> Iterator[str]:
+        return self.keys()
+
+    def close(self):
+        """Unmap the file. Tables already built stay usable."""
+        if self.__mm is not None:
+            self.__mm.close()
+            self.__mm = None
+            self.__fh.close()
+
+    def keys(self) -> Iterator[str]:
+        """`schema.table` keys in index order."""
+        for i in range(self.__count):
+            yield self.string(self.__entry(i)[0])
+
+    @property
+    def fingerprints(self) -> 'dict[str, str]':
+        """`schema.table` to fingerprint."""
+        out = {}
+        for i in range(self.__count):
+            key, fingerprint, _, _ = self.__entry(i)
+            out[self.string(key)] = self.string(fingerprint)
+        return out
+
+    @property
+    def schemata(self) -> 'dict[str, str]':
+        """Schema name to default collation."""
+        return self.__decode(self.__meta_at)[0]
+
+    def string(self, i: int) -> str:
+        """String `i` of the string table."""
+        s = self.__strings.get(i)
+        if s is None:
+            s = self.__strings[i] = self.__bytes(i).decode()
+        return s
+
+    def record(self, key: str) -> 'dict|None':
+        """
+        Description of a table, as made by `Snapshot.dump()`.
+
+        Args:
+            key (str): `schema.table`.
+
+        Returns:
+            dict|None: The description, None if the table is not in the catalog.
+        """
+        i = self.__find(key)
+        if i < 0:
+            return None
+        return self.__decode(self.__entry(i)[2])[0]
+
+    def table(self, key: str, db: Any = None) -> 'Any|None':
+        """
+        Table of the catalog, decoded on first use.
+
+        Args:
+            key (str): `schema.table`.
+            db (Db, optional): Database of the table. Defaults to a `Db` with the schema name and collation.
+
+        Returns:
+            type[Table]|None: The table, None if it is not in the catalog.
+        """
+        table = self.__tables.get(key)
+        if table is None:
+            arr = self.record(key)
+            if arr is None:
+                return None
+            from .snapshot import Snapshot
+            if db is None:
+                db = self.__db(key.split('.', 1)[0])
+            table = self.__tables[key] = Snapshot.restore(arr, db)
+        return table
+
+    def schemas(self) -> 'dict[str, CatalogTables]':
+        """Schema name to a lazy mapping of its tables."""
+        out = {}
+        for key in self.keys():
+            schema, name = key.split('.', 1)
+            if schema not in out:
+                out[schema] = CatalogTables(self, schema)
+            out[schema].names.append(name)
+        return out
+
+    def __db(self, schema: str) -> Any:
+        db = self.__dbs.get(schema)
+        if db is None:
+            from .models import Db
+            db = self.__dbs[schema] = Db()
+            db.name = schema
+            db.collate = self.schemata.get(schema)
+        return db
+
+    def __entry(self, i: int) -> 'tuple[int, int, int, int]':
+        return self.entry.unpack_from(self.__mm, self.__index_at + i * self.entry.size)
+
+    def __bytes(self, i: int) -> bytes:
+        start, end = struct.unpack_from('<II', self.__mm, self.__strings_at + 4 * i)
+        return self.__mm[self.__blob_at + start:self.__blob_at + end]
+
+    def __find(self, key: str) -> int:
+        """Position of a key in the index, -1 if absent."""
+        target = key.encode()
+        lo, hi = 0, self.__count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            probe = self.__bytes(self.__entry(mid)[0])
+            if probe < target:
+                lo = mid + 1
+            elif probe > target:
+                hi = mid
+            else:
+                return mid
+        return -1
+
+    def __decode(self, pos: int) -> 'tuple[Any, int]':
+        mm = self.__mm
+        tag = mm[pos]
+        pos += 1
+        if tag == self.STR:
+            i, pos = self.__varint(pos)
+            return self.string(i), pos
+        if tag == self.DICT:
+            n, pos = self.__varint(pos)
+            out = {}
+            for _ in range(n):
+                k, pos = self.__varint(pos)
+                out[self.string(k)], pos = self.__decode(pos)
+            return out, pos
+        if tag == self.LIST:
+            n, pos = self.__varint(pos)
+            out = []
+            for _ in range(n):
+                v, pos = self.__decode(pos)
+                out.append(v)
+            return out, pos
+        if tag == self.INT:
+            z, pos = self.__varint(pos)
+            return (z >> 1) ^ -(z & 1), pos
+        if tag == self.NONE:
+            return None, pos
+        if tag == self.FALSE:
+            return False, pos
+        if tag == self.TRUE:
+            return True, pos
+        if tag == self.FLOAT:
+            return struct.unpack_from('<d', mm, pos)[0], pos + 8
+        raise ValueError(f'Corrupt catalog {self.file} at {pos - 1}')
+
+    def __varint(self, pos: int) -> 'tuple[int, int]':
+        mm = self.__mm
+        out = shift = 0
+        while True:
+            b = mm[pos]
+            pos += 1
+            out |= (b & 0x7f) << shift
+            if b < 0x80:
+                return out, pos
+            shift += 7
+
+    @classmethod
+    def write(cls,
+              file: str,
+              records: 'dict[str, dict]',
+              fingerprints: 'dict[str, str]' = None,
+              schemata: 'dict[str, str]' = None,
+              ):
+        """
+        Write a catalog, replacing the file atomically.
+
+        Args:
+            file (str): Catalog file.
+            records (dict[str, dict]): `schema.table` to description, see `Snapshot.dump()`.
+            fingerprints (dict[str, str], optional): `schema.table` to fingerprint. Defaults to None.
+            schemata (dict[str, str], optional): Schema name to default collation. Defaults to None.
+        """
+        fingerprints = fingerprints or {}
+        writer = _Writer()
+        out = bytearray(cls.header.size)
+        index = []
+        for key in sorted(records, key=lambda k: k.encode()):
+            data = writer.encode(records[key])
+            index.append((writer.intern(key), writer.intern(fingerprints.get(key, '')), len(out), len(data)))
+            out += data
+        meta = writer.encode(schemata or {})
+
+        strings_at = len(out)
+        offsets, blob = [0], bytearray()
+        for s in writer.strings:
+            blob += s.encode()
+            offsets.append(len(blob))
+        out += struct.pack(f'<{len(offsets)}I', *offsets)
+        out += blob
+        index_at = len(out)
+        for item in index:
+            out += cls.entry.pack(*item)
+        meta_at = len(out)
+        out += meta
+        cls.header.pack_into(out, 0, cls.magic, cls.version, 0, len(writer.strings), len(index), strings_at, index_at, meta_at)
+
+        os.makedirs(os.path.dirname(os.path.abspath(file)), exist_ok=True)
+        tmp = f'{file}.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(out)
+        # a reader keeps its mapping of the replaced file
+        os.replace(tmp, file)
+
+
+class _Writer:
+    """Encoder of tagged values with a shared string table."""
+
+    def __init__(self) -> None:
+        self.strings: 'list[str]' = []
+        self.__ids: 'dict[str, int]' = {}
+
+    def intern(self, s: str) -> int:
+        i = self.__ids.get(s)
+        if i is None:
+            i = self.__ids[s] = len(self.strings)
+            self.strings.append(s)
+        return i
+
+    def encode(self, value: Any) -> bytearray:
+        out = bytearray()
+        self.__value(value, out)
+        return out
+
+    def __value(self, v: Any, out: bytearray):
+        if v is None:
+            out.append(Catalog.NONE)
+        elif v is True:
+            out.append(Catalog.TRUE)
+        elif v is False:
+            out.append(Catalog.FALSE)
+        elif isinstance(v, str):
+            out.append(Catalog.STR)
+            self.__varint(self.intern(v), out)
+        elif isinstance(v, int):
+            out.append(Catalog.INT)
+            self.__varint((v << 1) if v >= 0 else ((-v << 1) - 1), out)
+        elif isinstance(v, float):
+            out.append(Catalog.FLOAT)
+            out += struct.pack('<d', v)
+        elif isinstance(v, dict):
+            out.append(Catalog.DICT)
+            self.__varint(len(v), out)
+            for k, item in v.items():
+                self.__varint(self.intern(str(k)), out)
+                self.__value(item, out)
+        elif isinstance(v, (list, tuple)):
+            out.append(Catalog.LIST)
+            self.__varint(len(v), out)
+            for item in v:
+                self.__value(item, out)
+        else:
+            # like the JSON snapshot: dates, decimals, ... as text
+            out.append(Catalog.STR)
+            self.__varint(self.intern(str(v)), out)
+
+    @staticmethod
+    def __varint(n: int, out: bytearray):
+        while n >= 0x80:
+            out.append((n & 0x7f) | 0x80)
+            n >>= 7
+        out.append(n)
+
+
+class CatalogTables(MutableMapping):
+    """
+    Tables of one schema of a catalog, decoded on first access.
+
+    Tables set or deleted are kept in memory, so a snapshot can be refreshed
+    without decoding the tables that did not change.
+    """
+
+    def __init__(self, catalog: Catalog, schema: str) -> None:
+        self.catalog: Catalog = catalog
+        self.schema: str = schema
+        self.names: 'list[str]' = []
+        """Names of the tables in the catalog."""
+        self.__set: 'dict[str, Any]' = {}
+        self.__deleted: set = set()
+
+    def __getitem__(self, name: str) -> Any:
+        if name in self.__set:
+            return self.__set[name]
+        if name in self.__deleted:
+            raise KeyError(name)
+        table = self.catalog.table(f'{self.schema}.{name}')
+        if table is None:
+            raise KeyError(name)
+        return table
+
+    def __setitem__(self, name: str, table: Any):
+        self.__set[name] = table
+        self.__deleted.discard(name)
+
+    def __delitem__(self, name: str):
+        if name not in self:
+            raise KeyError(name)
+        self.__set.pop(name, None)
+        self.__deleted.add(name)
+
+    def __contains__(self, name: object) -> bool:
+        if name in self.__set:
+            return True
+        return name not in self.__deleted and f'{self.schema}.{name}' in self.catalog
+
+    def __iter__(self) -> Iterator[str]:
+        for name in self.names:
+            if name not in self.__deleted and name not in self.__set:
+                yield name
+        yield from self.__set
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def record(self, name: str) -> dict:
+        """Description of a table, from the catalog unless it was set."""
+        if name in self.__set:
+            from .snapshot import Snapshot
+            return Snapshot.dump(self.__set[name])
+        if name in self.__deleted:
+            raise KeyError(name)
+        return self.catalog.record(f'{self.schema}.{name}')
@@ -1,15 +1,33 @@
 from ..core import fn
 
 
-def connect(dsn: 'str|dict', db: str = None):
+def connect(dsn: 'str|dict', db: str = None, pool: 'dict|bool' = None):
+    """
+    Open a connection handler for a DSN.
+
+    Args:
+        dsn (str|dict): DSN name of `dsn.json`, URI or config dict.
+        db (str, optional): Database to select. Defaults to None.
+        pool (dict|bool, optional): Connection pool options, see `Main.pool`.
+            Defaults to None, which uses the class attribute of the driver.
+
+    Returns:
+        Main: Driver instance for the DSN scheme.
+    """
     arr = fn.dsn(dsn)
     if arr:
         t = arr['scheme'].lower() if 'scheme' in arr else 'mysql'
         if t == 'mysql':
             from .mysql import MySQL
-            return MySQL(arr, db)
+            return MySQL(arr, db, pool)
         elif t == 'mariadb':
             from .mariadb import MariaDB
-            return MariaDB(arr, db)
+            return MariaDB(arr, db, pool)
+        elif t == 'sqlite':
+            from .sqlite import SQLite
+            return SQLite(arr, db, pool)
+        elif t == 'dummy':
+            from .dummy import Dummy
+            return Dummy(arr, db, pool)
     from .dummy import Dummy
-    return Dummy(arr, db)
+    return Dummy(arr, db, pool)
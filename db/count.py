@@ -0,0 +1,241 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+from .models import Table
+from .record import Record
+
+
+class Count:
+    """Row count of a table or filter, and how it was found."""
+
+    def __init__(self, rows: 'int|None', exact: bool, source: str, age: float = 0.0) -> None:
+        self.rows: 'int|None' = rows
+        """Rows, None if no strategy could tell."""
+        self.exact: bool = exact
+        """Whether `rows` is a `COUNT(*)` that is fresh, not an estimate."""
+        self.source: str = source
+        """`stats`, `explain`, `exact` or `cache`."""
+        self.age: float = age
+        """Seconds since a cached count was made."""
+
+    def __int__(self) -> int:
+        return self.rows or 0
+
+    def __str__(self) -> str:
+        if self.rows is None:
+            return '?'
+        return f'{self.rows:,}' if self.exact else f'~{self.rows:,}'
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(rows={self.rows}, exact={self.exact}, source={self.source!r})'
+
+
+class Counter:
+    """
+    Row counts for grids, exact only when that is cheap or cached.
+
+    `SELECT COUNT(*)` reads a whole index on InnoDB, so a grid showing
+    "1-50 of N" on a big table would pay a full scan per page. The strategies:
+    - stats: `information_schema.TABLES.TABLE_ROWS`, an estimate kept by the engine
+    - explain: the row estimate of `EXPLAIN` for a filtered query
+    - exact: `SELECT COUNT(*)`
+    - cache: the last exact count, refreshed every `ttl` seconds by `refresh()`
+    - auto: a fresh cached count, else the estimate, replaced by an exact count
+      when the estimate is under `threshold` rows
+
+    Counts that are too big to make on demand are queued, and `refresh()`
+    (or the thread of `start()`) makes them in the background. Only the counts
+    asked for in the last `ttl` seconds are made again; the others, and the
+    least recently used beyond `size` entries, are dropped from the cache.
+
+    Examples:
+        ```python
+        counter = Counter(db, ttl=600)
+        total = counter.count('orders', 'status = %s', ['new'])
+        print(f'showing 1-50 of {total}')
+        ```
+    """
+
+    strategies = ('auto', 'stats', 'explain', 'exact', 'cache')
+    """Supported strategies."""
+
+    def __init__(self, db, ttl: float = 300.0, threshold: int = 10000, dsn: 'str|dict' = None, size: int = 1000) -> None:
+        """
+        Args:
+            db (Main): Open connection.
+            ttl (float, optional): Seconds a cached exact count stays fresh. Defaults to 300.
+            threshold (int, optional): Estimates up to this are counted exactly on demand. Defaults to 10000.
+            dsn (str|dict, optional): DSN of the connection of the `start()` thread. Defaults to None.
+            size (int, optional): Counts kept in the cache. Defaults to 1000.
+        """
+        self.db = db
+        self.ttl: float = ttl
+        self.threshold: int = threshold
+        self.dsn: 'str|dict|None' = dsn
+        self.size: int = max(1, size)
+        self.cache: 'OrderedDict[tuple, tuple[int|None, float, float]]' = OrderedDict()
+        """
+        `(table, where, param)` to `(rows, counted, used)` times, least recently
+        used first; rows is None for a queued count.
+        """
+        self.__lock = threading.Lock()
+        self.__stop: 'threading.Event|None' = None
+
+    def count(self, table: 'type[Table]|str', where: str = None, param: 'tuple|list' = [], strategy: str = 'auto') -> Count:
+        """
+        Rows of a table, or of the rows that match `where`.
+
+        Args:
+            table (type[Table]|str): Table model or name, `schema.table` allowed.
+            where (str, optional): Filter with `%s` placeholders. Defaults to None.
+            param (tuple|list, optional): Parameters of `where`. Defaults to empty list.
+            strategy (str, optional): One of `strategies`. Defaults to 'auto'.
+
+        Returns:
+            Count: The count and its source.
+
+        Raises:
+            ValueError: If the strategy is not supported.
+        """
+        if strategy not in self.strategies:
+            raise ValueError(f'Unsupported count strategy: {strategy}')
+        name = self.name(table)
+        key = (name, where or None, tuple(param))
+        if strategy == 'stats':
+            return Count(self.stats(name), False, 'stats')
+        if strategy == 'explain':
+            return Count(self.explain(name, where, param), False, 'explain')
+        self.__touch(key)
+        if strategy == 'exact':
+            return self.__exact(key, self.db)
+        cached = self.__cached(key)
+        if strategy == 'cache':
+            return cached or Count(None, False, 'cache')
+        if cached and cached.exact:
+            return cached
+        estimate = self.explain(name, where, param) if where else self.stats(name)
+        if estimate is None and not where:
+            estimate = self.explain(name, where, param)
+        if estimate is not None and estimate <= self.threshold:
+            return self.__exact(key, self.db)
+        return cached or Count(estimate, False, 'explain' if where else 'stats')
+
+    @staticmethod
+    def name(table: 'type[Table]|str') -> str:
+        """Quoted name of a table model or name."""
+        if isinstance(table, str):
+            return '.'.join(f"`{p.strip('`')}`" for p in table.split('.', 1))
+        if table.db and table.db.name:
+            return f'`{table.db.name}`.`{table.name}`'
+        return f'`{table.name}`'
+
+    def stats(self, name: str) -> 'int|None':
+        """`TABLE_ROWS` of `information_schema.TABLES`: exact for MyISAM, an estimate for InnoDB."""
+        parts = [p.strip('`') for p in name.split('.', 1)]
+        schema, table = (None, parts[0]) if len(parts) == 1 else parts
+        value = self.db.value(
+            'SELECT TABLE_ROWS FROM information_schema.TABLES WHERE TABLE_SCHEMA = COALESCE(%s, DATABASE()) AND TABLE_NAME = %s',
+            (schema, table),
+        )
+        return None if value is None else int(value)
+
+    def explain(self, name: str, where: str = None, param: 'tuple|list' = []) -> 'int|None':
+        """Rows the optimizer expects to read, times the `filtered` percentage."""
+        sql = f'EXPLAIN SELECT 1 FROM {name}' + (f' WHERE {where}' if where else '')
+        rows = self.db.all(sql, param)
+        if not rows:
+            return None
+        row = rows[0]
+        estimate = self.__get(row, 'rows')
+        if estimate is None:
+            return None
+        filtered = self.__get(row, 'filtered')
+        return int(float(estimate) * (float(filtered) if filtered is not None else 100.0) / 100)
+
+    def refresh(self, db=None) -> int:
+        """
+        Make the queued counts and the stale cached ones that were asked for in the last `ttl`.
+
+        The counts not asked for since are dropped.
+
+        Args:
+            db (Main, optional): Connection to count on. Defaults to the one of the counter.
+
+        Returns:
+            int: Counts made.
+        """
+        now = time.monotonic()
+        with self.__lock:
+            for key in [k for k, (_, _, used) in self.cache.items() if now - used > self.ttl]:
+                del self.cache[key]
+            todo = [k for k, (rows, at, _) in self.cache.items() if rows is None or now - at >= self.ttl]
+        for key in todo:
+            self.__exact(key, db or self.db)
+        return len(todo)
+
+    def start(self, interval: float = None) -> threading.Thread:
+        """
+        Call `refresh()` every `interval` seconds on a connection of `dsn`, in a daemon thread.
+
+        Args:
+            interval (float, optional): Defaults to `ttl`.
+
+        Raises:
+            ValueError: If the counter has no `dsn`.
+        """
+        if not self.dsn:
+            raise ValueError('Counter.start() needs a dsn for its own connection')
+        from .conn import connect
+        self.stop()
+        stop = self.__stop = threading.Event()
+
+        def run():
+            db = connect(self.dsn)
+            try:
+                while not stop.wait(interval or self.ttl):
+                    self.refresh(db)
+            finally:
+                db.close()
+        thread = threading.Thread(target=run, name='count-refresh', daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self):
+        """Stop the thread of `start()`."""
+        if self.__stop:
+            self.__stop.set()
+            self.__stop = None
+
+    def __exact(self, key: tuple, db) -> Count:
+        name, where, param = key
+        value = db.value(f'SELECT COUNT(*) FROM {name}' + (f' WHERE {where}' if where else ''), param)
+        rows = None if value is None else int(value)
+        with self.__lock:
+            # an entry evicted meanwhile is not brought back
+            if key in self.cache:
+                self.cache[key] = (rows, time.monotonic(), self.cache[key][2])
+        return Count(rows, rows is not None, 'exact')
+
+    def __cached(self, key: tuple) -> 'Count|None':
+        with self.__lock:
+            rows, at, _ = self.cache.get(key, (None, 0.0, 0.0))
+        if rows is None:
+            return None
+        age = time.monotonic() - at
+        return Count(rows, age < self.ttl, 'cache', age)
+
+    def __touch(self, key: tuple):
+        """Record a request of a count, queueing it if it is not cached."""
+        with self.__lock:
+            rows, at, _ = self.cache.get(key, (None, 0.0, 0.0))
+            self.cache[key] = (rows, at, time.monotonic())
+            self.cache.move_to_end(key)
+            while len(self.cache) > self.size:
+                self.cache.popitem(last=False)
+
+    def __get(self, row: Any, name: str) -> Any:
+        if isinstance(row, dict):
+            return row.get(name)
+        names = row._fields if isinstance(row, Record) else [d[0] for d in self.db.description or []]
+        return row[names.index(name)] if name in names else None
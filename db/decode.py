@@ -0,0 +1,122 @@
+import datetime
+import ipaddress
+import json
+import uuid
+from decimal import Decimal
+from operator import methodcaller
+from typing import Any, Callable
+from .models.types import main as t_main, number as t_number, string as t_string, time as t_time, geo as t_geo
+
+
+def _time(value: bytes) -> datetime.timedelta:
+    """`[-]HHH:MM:SS[.ffffff]` of a `TIME` column."""
+    text = value.decode('ascii')
+    sign = -1 if text.startswith('-') else 1
+    hms, _, frac = text.lstrip('-').partition('.')
+    h, m, s = hms.split(':')
+    return sign * datetime.timedelta(hours=int(h), minutes=int(m), seconds=int(s), microseconds=int(frac.ljust(6, '0')) if frac else 0)
+
+
+def _uuid(value: 'bytes|str') -> uuid.UUID:
+    """Text or `BINARY(16)` UUID."""
+    if isinstance(value, str):
+        return uuid.UUID(value)
+    return uuid.UUID(bytes=bytes(value)) if len(value) == 16 else uuid.UUID(value.decode('ascii'))
+
+
+def _inet(value: 'bytes|str') -> 'ipaddress.IPv4Address|ipaddress.IPv6Address':
+    """Text or `BINARY(4)`/`BINARY(16)` address."""
+    if isinstance(value, str):
+        return ipaddress.ip_address(value)
+    return ipaddress.ip_address(bytes(value) if len(value) in (4, 16) else value.decode('ascii'))
+
+
+class Decoder:
+    """
+    Decode plan of a result: one specialized converter per column.
+
+    The plan is compiled once per result from the column types, so a text
+    protocol row is decoded by mapping a converter over each column of the
+    batch instead of dispatching on the field type of every value. The types
+    are classes or instances of `db.models.types`, from the cursor description
+    or given by the caller for what the description cannot tell, like an
+    `INET6`, `UUID` or `JSON` column to parse.
+
+    Examples:
+        ```python
+        decode = Decoder([number.Int, string.VarChar, string.INET6], 'utf-8')
+        rows = decode([(b'1', b'ann', b'::1')])
+        ```
+    """
+
+    converters: 'dict[type, Callable[[str], Callable[[bytes], Any]]]' = {
+        t_number.Bit: lambda cs: lambda v: int.from_bytes(v, 'big'),
+        t_number.Float: lambda cs: float,
+        t_number.Decimal: lambda cs: lambda v: Decimal(v.decode('ascii')),
+        t_number.Int: lambda cs: int,
+        t_time.DateTime: lambda cs: lambda v: datetime.datetime.fromisoformat(v.decode('ascii')),
+        t_time.TimeStamp: lambda cs: lambda v: datetime.datetime.fromisoformat(v.decode('ascii')),
+        t_time.Time: lambda cs: _time,
+        t_time.Year: lambda cs: int,
+        t_time.Date: lambda cs: lambda v: datetime.date.fromisoformat(v.decode('ascii')),
+        t_string.JSON: lambda cs: json.loads,
+        t_string.Set: lambda cs: lambda v: set(v.decode(cs).split(',')) if v else set(),
+        t_string.UUID: lambda cs: _uuid,
+        t_string.INET4: lambda cs: _inet,
+        t_string.Bin: lambda cs: bytes,
+        t_string.Char: lambda cs: methodcaller('decode', cs),
+        t_geo.Geometry: lambda cs: bytes,
+    }
+    """Converter factory by type, given the charset. A type uses the entry of its nearest class."""
+
+    def __init__(self, types: 'list[type|t_main.Type|None]', charset: str = 'utf-8', fallback: 'list[Callable|None]' = None) -> None:
+        """
+        Args:
+            types (list[type|Type|None]): Type of each column.
+            charset (str, optional): Python codec of the text columns. Defaults to 'utf-8'.
+            fallback (list[Callable|None], optional): Converter of each column without a known type,
+                                                      and of the values its converter rejects. Defaults to None.
+        """
+        fallback = fallback or [None] * len(types)
+        self.plan: 'list[tuple[Callable|None, Callable|None]]' = [
+            (self.converter(t, charset), f) for t, f in zip(types, fallback)
+        ]
+        """`(converter, fallback)` of each column, `None` keeps the value."""
+
+    @classmethod
+    def converter(cls, type_: 'type|t_main.Type|None', charset: str = 'utf-8') -> 'Callable[[bytes], Any]|None':
+        """Converter of a type, or None if there is none."""
+        if type_ is None:
+            return None
+        for c in (type_ if isinstance(type_, type) else type(type_)).__mro__:
+            if c in cls.converters:
+                return cls.converters[c](charset)
+        return None
+
+    def __call__(self, rows: 'list[tuple]') -> 'list[tuple]':
+        """Decode a batch of raw rows."""
+        if not rows:
+            return rows
+        columns = []
+        for (convert, fallback), values in zip(self.plan, zip(*rows)):
+            if convert is None:
+                columns.append(values if fallback is None else [None if v is None else fallback(v) for v in values])
+                continue
+            try:
+                if None in values:
+                    columns.append([None if v is None else convert(v) for v in values])
+                else:
+                    columns.append(list(map(convert, values)))
+            except (ValueError, TypeError, ArithmeticError, UnicodeDecodeError):
+                # zero dates, invalid text...: value by value
+                columns.append([self.__safe(convert, fallback, v) for v in values])
+        return list(zip(*columns))
+
+    @staticmethod
+    def __safe(convert: Callable, fallback: 'Callable|None', value: Any) -> Any:
+        if value is None:
+            return None
+        try:
+            return convert(value)
+        except (ValueError, TypeError, ArithmeticError, UnicodeDecodeError):
+            return fallback(value) if fallback else value
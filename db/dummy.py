@@ -1,27 +1,315 @@
-from typing import Any, Iterator
+import datetime
+import decimal
+import random
+import re
+import string
+import uuid
+from typing import Any, Callable, Iterable, Iterator
 from .main import Main
+from .bulk import Bulk, BulkResult
+from .models.types import main as t_main, number as t_number, string as t_string, time as t_time, element as t_element, geo as t_geo
 
 
-class Dummy(Main):
-    """
-    Dummy database connection and query handler class.
-    Extends the Main class to provide dummy database-specific functionality.
-    """
+class DummyConn:
+    """Connection stand-in that accepts every statement and keeps nothing."""
 
-    def select_db(self, db) -> bool:
-        return False
+    def cursor(self) -> 'DummyConn':
+        return self
 
-    def connect(self, config: dict) -> 'Any':
+    def execute(self, sql: str, param: 'tuple|list|dict' = ()):
         pass
 
-    def exec(self, sql: str | list | tuple, param: tuple | list | dict = ...) -> bool | list:
-        return False
+    def commit(self):
+        pass
 
-    def many(self, tbl: str, data: list[dict], config: dict = ...):
+    def rollback(self):
         pass
 
-    def query(self, conn: Any, sql: str, params: 'Any' = None) -> 'Iterator[Any]':
-        return iter([])
+    def close(self):
+        pass
+
+
+class Dummy(Main):
+    """
+    Synthetic database connection and query handler class.
+    Extends the Main class to generate typed rows from a schema instead of
+    reading them, so grids, exports and ETL pipelines can be measured
+    without a database.
+
+    Tables are described by `db.models.types` instances. Row `i` takes value
+    `i % cardinality` of a pool drawn once per column from a generator seeded
+    by `seed`, table and column name, so the same configuration always yields
+    the same rows, any `LIMIT` window included. `auto_increment` columns
+    count from 1. Batches are built column by column with list slicing, which
+    runs at millions of rows per second.
+
+    Only `SELECT <columns|*> FROM <table> [LIMIT [offset,] n | LIMIT n OFFSET m]`
+    and `SELECT COUNT(*) FROM <table>` are understood; other clauses are ignored.
+    Writes are accepted and discarded.
+
+    Examples:
+        ```python
+        from db.models.types import number as n, string as s, time as t
+
+        db = Dummy({'scheme': 'dummy', 'rows': 1_000_000, 'seed': 1, 'tables': {
+            'users': {
+                'id': n.Int(auto_increment=True),
+                'name': s.VarChar(40),
+                'city': {'type': s.VarChar(20), 'cardinality': 50, 'null': 0.1},
+                'created': t.DateTime(),
+            },
+        }})
+        for rows in db.query_batches('SELECT id, city FROM users LIMIT 5000'):
+            ...
+        ```
+    """
+    default = {
+        'rows': 1000,
+        'seed': 0,
+        'cardinality': 1000,
+        'null': 0.0,
+        'tables': {},
+    }
+    """
+    Default configuration:
+    - rows (int): Rows of each table without its own `rows`
+    - seed (int|str): Seed of every generator
+    - cardinality (int): Distinct values of each column without its own `cardinality`
+    - null (float): Share of `NULL` in the columns without `not_null`
+    - tables (dict): Table name to columns, `{column: Type | {'type': Type, 'cardinality': int, 'null': float}}`.
+      A table may also be `{'rows': int, 'columns': {...}}`
+    """
+
+    tables: 'dict[str, dict]' = {}
+    """Tables shared by every instance, in the format of the `tables` configuration."""
+
+    re_select = re.compile(
+        r'^\s*SELECT\s+(?P<columns>.+?)\s+FROM\s+[`"]?(?P<table>[\w$.]+?)[`"]?(?:\s.*?)?' +
+        r'(?:\bLIMIT\s+(?P<limit>\d+)(?:\s*,\s*(?P<count>\d+)|\s+OFFSET\s+(?P<offset>\d+))?)?\s*;?\s*$',
+        re.I | re.S
+    )
+    """Statements understood by the generator."""
 
     def _check_config(self, cfg: dict) -> dict:
-        return {}
+        arr = {**self.default, **{k: v for k, v in cfg.items() if k in self.default}}
+        for k in ('rows', 'cardinality'):
+            arr[k] = int(arr[k])
+        arr['null'] = float(arr['null'])
+        self.__config: dict = arr
+        self.__tables: 'dict[str, dict]' = {**self.tables, **arr['tables']}
+        self.__compiled: 'dict[str, tuple[int, dict[str, tuple]]]' = {}
+        return arr
+
+    def connect(self, config: dict) -> DummyConn:
+        return DummyConn()
+
+    def select_db(self, db: str) -> bool:
+        return True
+
+    def table(self, name: str, columns: 'dict[str, Any]', rows: int = None):
+        """
+        Describe a table of this instance.
+
+        Args:
+            name (str): Table name
+            columns (dict): Column name to `Type` or `{'type': Type, 'cardinality': int, 'null': float}`
+            rows (int, optional): Rows of the table. Defaults to the `rows` configuration.
+        """
+        self.__tables[name] = {'rows': rows, 'columns': columns} if rows is not None else columns
+        self.__compiled.pop(name, None)
+
+    def _fetch(self, sql: str, param: 'tuple|list|dict' = [], size: int = None) -> 'Iterator[list[tuple]]':
+        self.show_sql(sql, param)
+        self.description = None
+        m = self.re_select.match(sql)
+        compiled = m and self.__compile(m['table'])
+        if not compiled:
+            self.error = ValueError(f'Unknown dummy query: {sql}')
+            self.show(f"Erro: {self.error}")
+            return
+        rows, columns = compiled
+        names = m['columns'].strip()
+        if re.fullmatch(r'COUNT\(\s*\*\s*\)(?:\s+(?:AS\s+)?\w+)?', names, re.I):
+            self.description = [(names, None, None, None, None, None, None)]
+            yield [(rows,)]
+            return
+        if names == '*':
+            names = list(columns)
+        else:
+            names = [n.strip().strip('`"') for n in names.split(',')]
+            missing = [n for n in names if n not in columns]
+            if missing:
+                self.error = KeyError(f"Unknown dummy column: {', '.join(missing)}")
+                self.show(f"Erro: {self.error}")
+                return
+        start, stop = 0, rows
+        if m['limit'] is not None:
+            limit = int(m['limit'])
+            if m['count'] is not None:
+                start, limit = limit, int(m['count'])
+            elif m['offset'] is not None:
+                start = int(m['offset'])
+            start = min(start, rows)
+            stop = min(start + limit, rows)
+        self.description = [(n, columns[n][0], None, None, None, None, None) for n in names]
+        makers = [columns[n][1] for n in names]
+        size = size or self.batch_size
+        for a in range(start, stop, size):
+            b = min(a + size, stop)
+            yield list(zip(*[make(a, b) for make in makers]))
+
+    def query(self, sql: str, param: 'tuple|list|dict' = []) -> Iterator[dict]:
+        for batch in self.query_batches(sql, param):
+            yield from batch
+
+    def exec(self, sql: 'str|list|tuple', param: 'tuple|list|dict' = []) -> 'bool|list':
+        if type(sql) != str:
+            return [self.exec(s, param) for s in sql]
+        self.show_sql(sql, param)
+        self._commit()
+        self._written(sql)
+        return True
+
+    def many(self, tbl: str, data: 'Iterable[dict]', config: dict = {}) -> 'BulkResult|None':
+        """
+        Consume rows as a load would, in batches of `max_rows`, and discard them.
+
+        Args:
+            tbl (str): Target table name
+            data (Iterable[dict]): List or generator of dictionaries
+            config (dict, optional): `max_rows` of a batch, see `Bulk.default`
+
+        Returns:
+            BulkResult|None: Rows and batches consumed
+        """
+        if not data:
+            return
+        size = config.get('max_rows') or Bulk.default['max_rows']
+        result = BulkResult()
+        count = 0
+        for _ in data:
+            count += 1
+            if count == size:
+                result.rows += count
+                result.batches += 1
+                count = 0
+        if count:
+            result.rows += count
+            result.batches += 1
+        result.commits += self._commit()
+        self._written(tbl)
+        return result.stop()
+
+    def _dtype(self, column: tuple) -> str:
+        type_ = column[1]
+        if isinstance(type_, t_number.Float):
+            return 'float64'
+        if isinstance(type_, t_number.Decimal):
+            return 'O'
+        if isinstance(type_, t_number.Int):
+            return 'int64'
+        if isinstance(type_, t_time.Year):
+            return 'int64'
+        if isinstance(type_, (t_time.DateTime, t_time.TimeStamp)):
+            return 'datetime64[us]'
+        return 'O'
+
+    def __compile(self, table: str) -> 'tuple[int, dict[str, tuple]]|None':
+        """Rows and `{column: (type, maker)}` of a table, built once."""
+        hit = self.__compiled.get(table)
+        if hit is not None:
+            return hit
+        spec = self.__tables.get(table)
+        if spec is None and '.' in table:
+            spec = self.__tables.get(table.rsplit('.', 1)[1])
+        if not spec:
+            return None
+        cfg = self.__config
+        columns = spec['columns'] if 'columns' in spec else spec
+        rows = int(spec.get('rows') or cfg['rows']) if 'columns' in spec else cfg['rows']
+        compiled = {}
+        for name, col in columns.items():
+            if not isinstance(col, dict):
+                col = {'type': col}
+            type_ = col['type']
+            rng = random.Random(f"{cfg['seed']}:{table}:{name}")
+            if getattr(type_, 'auto_increment', False) and isinstance(type_, t_number.Int):
+                compiled[name] = (type_, self.__sequence())
+                continue
+            draw = self.__generator(type_, rng)
+            null = 0.0 if getattr(type_, 'not_null', False) else col.get('null', cfg['null'])
+            k = max(1, min(int(col.get('cardinality') or cfg['cardinality']), rows))
+            pool = [None if null and rng.random() < null else draw() for _ in range(k)]
+            compiled[name] = (type_, self.__cycle(pool))
+        hit = self.__compiled[table] = (rows, compiled)
+        return hit
+
+    @staticmethod
+    def __sequence() -> 'Callable[[int, int], list]':
+        return lambda a, b: list(range(a + 1, b + 1))
+
+    @staticmethod
+    def __cycle(pool: list) -> 'Callable[[int, int], list]':
+        k = len(pool)
+
+        def make(a: int, b: int) -> list:
+            s = a % k
+            e = s + b - a
+            if e <= k:
+                return pool[s:e]
+            return (pool * (e // k + 1))[s:e]
+        return make
+
+    @staticmethod
+    def __generator(type_: 't_main.Type', rng: random.Random) -> 'Callable[[], Any]':
+        """Random value of a type."""
+        lo = getattr(type_, 'min', None)
+        hi = getattr(type_, 'max', None)
+        length = getattr(type_, 'length', None) or 10
+        if isinstance(type_, t_element.EMail):
+            return lambda: ''.join(rng.choices(string.ascii_lowercase, k=8)) + '@example.com'
+        if isinstance(type_, t_string.UUID):
+            return lambda: str(uuid.UUID(int=rng.getrandbits(128), version=4))
+        if isinstance(type_, t_string.INET6):
+            return lambda: ':'.join(f'{rng.getrandbits(16):x}' for _ in range(8))
+        if isinstance(type_, t_string.INET4):
+            return lambda: '.'.join(str(rng.randrange(256)) for _ in range(4))
+        if isinstance(type_, t_string.JSON):
+            return lambda: f'{{"id": {rng.randrange(10 ** 6)}}}'
+        if isinstance(type_, t_string.Bin):
+            return lambda: rng.randbytes(min(length, 16))
+        if isinstance(type_, t_string.Char):
+            letters = string.ascii_letters
+            n = min(length, 16)
+            return lambda: ''.join(rng.choices(letters, k=rng.randint(1, n)))
+        if isinstance(type_, (t_number.Bool, t_number.Bit)):
+            return lambda: rng.randrange(2)
+        if isinstance(type_, t_number.Decimal):
+            scale = type_.decimals
+            lo = 0 if lo is None else lo
+            hi = 10 ** min(max(type_.length - scale, 1), 9) if hi is None else hi
+            if isinstance(type_, t_number.Float):
+                return lambda: round(rng.uniform(lo, hi), scale or 2)
+            return lambda: decimal.Decimal(f'{rng.uniform(lo, hi):.{scale}f}')
+        if isinstance(type_, t_number.Int):
+            bits = 8 if isinstance(type_, t_number.TinyInt) else \
+                16 if isinstance(type_, t_number.SmallInt) else \
+                24 if isinstance(type_, t_number.MediumInt) else \
+                64 if isinstance(type_, t_number.BigInt) else 32
+            if lo is None:
+                lo = 0 if type_.unsigned else -(1 << (bits - 1))
+            if hi is None:
+                hi = (1 << bits) - 1 if type_.unsigned else (1 << (bits - 1)) - 1
+            return lambda: rng.randint(lo, hi)
+        epoch = datetime.datetime(2000, 1, 1)
+        if isinstance(type_, t_time.Year):
+            return lambda: rng.randint(1970, 2037)
+        if isinstance(type_, (t_time.DateTime, t_time.TimeStamp)):
+            return lambda: epoch + datetime.timedelta(seconds=rng.randrange(30 * 365 * 86400))
+        if isinstance(type_, t_time.Date):
+            return lambda: epoch.date() + datetime.timedelta(days=rng.randrange(30 * 365))
+        if isinstance(type_, t_time.Time):
+            return lambda: datetime.timedelta(seconds=rng.randrange(86400))
+        if isinstance(type_, t_geo.Point):
+            return lambda: f'POINT({rng.uniform(-180, 180):.6f} {rng.uniform(-90, 90):.6f})'
+        return lambda: rng.randrange(10 ** 6)
@@ -0,0 +1,382 @@
+import json
+import queue
+import base64
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterator
+
+
+class Extractor:
+    """
+    Parallel extraction of a big table split into primary key ranges.
+
+    The key column is split into `parts` ranges, from its min/max, a column
+    histogram or sampled offsets, and every range is read at the same time on
+    its own pooled, unbuffered connection, so both the server and the client
+    use one core per range instead of a single `SELECT *`. The first and the
+    last ranges are open ended, so no row is lost to the split points.
+
+    Examples:
+        ```python
+        ext = Extractor('warehouse', 'orders', parts=8, db='sales')
+        rows = ext.run(writer.writerows)
+        if not ext.ok:
+            print(ext.errors)
+        ```
+    """
+
+    splits = ('auto', 'minmax', 'histogram', 'offset')
+    """Strategies to find the split points."""
+
+    buffer: int = 4
+    """Batches queued per range before its worker waits for the consumer."""
+
+    def __init__(self,
+                 dsn: 'str|dict',
+                 table: str,
+                 parts: int = 4,
+                 key: str = None,
+                 columns: str = '*',
+                 where: str = None,
+                 param: 'tuple|list' = [],
+                 db: str = None,
+                 pool: 'dict|bool' = None,
+                 split: str = 'auto',
+                 size: int = None,
+                 ) -> None:
+        """
+        Initialize the extractor.
+
+        Args:
+            dsn (str|dict): DSN name of `dsn.json`, URI or config dict.
+            table (str): Table to read.
+            parts (int, optional): Ranges read at the same time. Defaults to 4.
+            key (str, optional): Indexed column to split on. Defaults to the
+                first column of the primary key.
+            columns (str, optional): Select list. Defaults to '*'.
+            where (str, optional): Extra filter with `%s` placeholders. Defaults to None.
+            param (tuple|list, optional): Parameters of `where`. Defaults to empty list.
+            db (str, optional): Database to select. Defaults to None.
+            pool (dict|bool, optional): Connection pool options, see `Main.pool`.
+                Defaults to a pool of `parts` connections. A pool of the DSN that
+                already exists keeps its size, which then caps `workers`.
+            split (str, optional): `minmax` for integer keys, `histogram` from
+                the column statistics, `offset` by sampling the key every N rows
+                or `auto` (minmax for integers, offset otherwise). Defaults to 'auto'.
+            size (int, optional): Rows per batch. Defaults to `Main.batch_size`.
+
+        Raises:
+            ValueError: If the split strategy is not supported.
+        """
+        if split not in self.splits:
+            raise ValueError(f'Unsupported split: {split}')
+        self.dsn: 'str|dict' = dsn
+        self.table: str = table
+        self.parts: int = max(1, parts)
+        self.key: 'str|None' = key
+        self.columns: str = columns
+        self.where: 'str|None' = where
+        self.param: list = list(param)
+        self.db: 'str|None' = db
+        self.pool: 'dict|bool' = {'max_size': self.parts} if pool is None else pool
+        self.split: str = split
+        self.size: 'int|None' = size
+        self.workers: int = self.parts
+        """Ranges read at the same time in the last run, at most the size of the pool."""
+        self.ranges: 'list[tuple]' = []
+        """Ranges of the last run as `(lower, upper)`, None for an open end."""
+        self.counts: 'dict[int, int]' = {}
+        """Rows read in the last run by range index."""
+        self.errors: 'dict[int, BaseException]' = {}
+        """Errors of the last run by range index."""
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({self.table!r}, parts={self.parts}, key={self.key!r})'
+
+    @property
+    def ok(self) -> bool:
+        """Whether every range of the last run was read completely."""
+        return not self.errors
+
+    def open(self) -> Any:
+        """
+        Open a connection handler of the DSN. Runs in the worker threads.
+
+        Returns:
+            Main: Driver instance, see `db.conn.connect`.
+        """
+        from .conn import connect
+        return connect(self.dsn, self.db, self.pool)
+
+    def primary_key(self, conn: Any) -> 'list[str]':
+        """
+        Primary key columns of the table, from `information_schema` (MySQL/MariaDB).
+
+        Args:
+            conn (Main): Open connection handler.
+
+        Returns:
+            list[str]: Key columns in index order.
+        """
+        schema, _, name = self.table.replace('`', '').rpartition('.')
+        sql = \
+            'SELECT COLUMN_NAME FROM information_schema.KEY_COLUMN_USAGE ' +\
+            'WHERE TABLE_SCHEMA = ' + ('%s' if schema else 'DATABASE()') + ' ' +\
+            "AND TABLE_NAME = %s AND CONSTRAINT_NAME = 'PRIMARY' " +\
+            'ORDER BY ORDINAL_POSITION'
+        return [self.__values(r)[0] for r in conn.all(sql, [schema, name] if schema else [name])]
+
+    def split_points(self, conn: Any) -> list:
+        """
+        Values of the key that split the table into `parts` ranges.
+
+        Args:
+            conn (Main): Open connection handler.
+
+        Returns:
+            list: Up to `parts - 1` ascending, distinct values.
+        """
+        split = self.split
+        if split in ('auto', 'minmax'):
+            lo, hi = self.__values(conn.line(
+                f'SELECT MIN({self.__key}), MAX({self.__key}) FROM {self.table}{self.__filter(" WHERE ")}',
+                self.param)) or (None, None)
+            if lo is None:
+                return []
+            if isinstance(lo, int) and isinstance(hi, int):
+                step = (hi - lo + 1) / self.parts
+                return self.__distinct(lo + int(step * i) for i in range(1, self.parts))
+            if split == 'minmax':
+                raise TypeError(f'minmax split needs an integer key, got {type(lo).__name__}')
+            split = 'offset'
+        if split == 'histogram':
+            points = self.__histogram(conn)
+            if points:
+                return points
+        return self.__offsets(conn)
+
+    def plan(self) -> 'list[tuple]':
+        """
+        Find the key and the ranges without reading the table.
+
+        Returns:
+            list[tuple]: Ranges as `(lower, upper)`, None for an open end.
+        """
+        conn = self.open()
+        try:
+            if conn.error is not None:
+                raise ConnectionError(f'{self.table}: {conn.error}')
+            if not self.key:
+                keys = self.primary_key(conn)
+                if not keys:
+                    raise LookupError(f'{self.table}: no primary key, pass key=')
+                self.key = keys[0]
+            bounds = [None] + self.split_points(conn) + [None]
+            # an existing pool of the DSN ignores the options, a worker more would wait for a connection
+            pool = conn.connection_pool
+            self.workers = min(self.parts, pool.max_size) if pool is not None else self.parts
+        finally:
+            conn.close()
+        self.ranges = list(zip(bounds, bounds[1:]))
+        return self.ranges
+
+    def range_sql(self, lower: Any, upper: Any) -> 'tuple[str, list]':
+        """
+        Statement that reads one range in key order.
+
+        Args:
+            lower (Any): Inclusive lower bound, None for no bound.
+            upper (Any): Exclusive upper bound, None for no bound.
+
+        Returns:
+            tuple[str, list]: SQL and parameters.
+        """
+        cond = []
+        param = []
+        if lower is not None:
+            cond.append(f'{self.__key} >= %s')
+            param.append(lower)
+        if upper is not None:
+            cond.append(f'{self.__key} < %s')
+            param.append(upper)
+        if self.where:
+            cond.append(f'({self.where})')
+            param.extend(self.param)
+        where = ' WHERE ' + ' AND '.join(cond) if cond else ''
+        return f'SELECT {self.columns} FROM {self.table}{where} ORDER BY {self.__key}', param
+
+    def batches(self, ordered: bool = True) -> 'Iterator[list]':
+        """
+        Read every range at the same time and yield the batches.
+
+        Args:
+            ordered (bool, optional): Yield in key order, buffering up to `buffer`
+                batches of the ranges ahead. False yields the batches as they
+                arrive. Defaults to True.
+
+        Yields:
+            list: Batches of rows typed by the driver `row`.
+        """
+        ranges = self.plan()
+        self.counts, self.errors = {}, {}
+        stop = threading.Event()
+        shared: queue.Queue = queue.Queue(self.buffer * len(ranges))
+        queues = [queue.Queue(self.buffer) for _ in ranges] if ordered else [shared] * len(ranges)
+        # the ranges beyond `workers` start as the first ones end, in key order
+        executor = ThreadPoolExecutor(min(len(ranges), self.workers), 'extract')
+        for i, bounds in enumerate(ranges):
+            executor.submit(self.__run, i, bounds, queues[i], stop)
+        try:
+            if ordered:
+                for q in queues:
+                    yield from self.__drain(q, 1)
+            else:
+                yield from self.__drain(shared, len(ranges))
+        finally:
+            stop.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def rows(self, ordered: bool = True) -> 'Iterator[Any]':
+        """
+        Read every range at the same time and yield the rows.
+
+        See Also: batches
+        """
+        for batch in self.batches(ordered):
+            yield from batch
+
+    def run(self, sink: 'Callable[[list], Any]', ordered: bool = True) -> int:
+        """
+        Send every batch of the table to a sink.
+
+        Args:
+            sink (Callable[[list], Any]): Called with each batch, like `writer.writerows`.
+            ordered (bool, optional): See `batches`. Defaults to True.
+
+        Returns:
+            int: Rows sent to the sink. Check `ok`/`errors` for failed ranges.
+        """
+        count = 0
+        for batch in self.batches(ordered):
+            sink(batch)
+            count += len(batch)
+        return count
+
+    @property
+    def __key(self) -> str:
+        return '`' + self.key.replace('`', '') + '`'
+
+    def __filter(self, prefix: str) -> str:
+        return f'{prefix}({self.where})' if self.where else ''
+
+    def __drain(self, q: queue.Queue, ranges: int) -> 'Iterator[list]':
+        while ranges:
+            i, batch, error = q.get()
+            if batch is None:
+                ranges -= 1
+                if error is not None:
+                    self.errors[i] = error
+                continue
+            self.counts[i] = self.counts.get(i, 0) + len(batch)
+            yield batch
+
+    def __run(self, i: int, bounds: tuple, out: queue.Queue, stop: threading.Event):
+        error = None
+        conn = None
+        try:
+            conn = self.open()
+            if conn.error is not None:
+                raise ConnectionError(f'{self.table}: {conn.error}')
+            conn.stream = True
+            batches = conn.query_batches(*self.range_sql(*bounds), self.size)
+            try:
+                for batch in batches:
+                    if not self.__put(out, (i, batch, None), stop):
+                        return
+            finally:
+                batches.close()
+        except BaseException as e:
+            error = e
+        finally:
+            if conn is not None:
+                conn.close()
+        self.__put(out, (i, None, error), stop)
+
+    @staticmethod
+    def __put(out: queue.Queue, item: tuple, stop: threading.Event) -> bool:
+        """Queue an item, giving up when the consumer stopped."""
+        while not stop.is_set():
+            try:
+                out.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def __histogram(self, conn: Any) -> list:
+        """Split points from the MySQL 8.0 column histogram, if there is one."""
+        schema, _, name = self.table.replace('`', '').rpartition('.')
+        sql = \
+            'SELECT HISTOGRAM FROM information_schema.COLUMN_STATISTICS ' +\
+            'WHERE SCHEMA_NAME = ' + ('%s' if schema else 'DATABASE()') + ' ' +\
+            'AND TABLE_NAME = %s AND COLUMN_NAME = %s'
+        try:
+            row = conn.line(sql, ([schema] if schema else []) + [name, self.key])
+        except Exception:
+            return []
+        if not row:
+            return []
+        histogram = self.__values(row)[0]
+        if isinstance(histogram, (str, bytes)):
+            histogram = json.loads(histogram)
+        points = []
+        buckets = histogram.get('buckets', [])
+        for part in range(1, self.parts):
+            for bucket in buckets:
+                # equi-height: [lower, upper, cumulative, distinct]; singleton: [value, cumulative]
+                upper, cumulative = (bucket[1], bucket[2]) if len(bucket) == 4 else (bucket[0], bucket[1])
+                if cumulative >= part / self.parts:
+                    points.append(self.__decode(upper))
+                    break
+        return self.__distinct(points)
+
+    def __offsets(self, conn: Any) -> list:
+        """Split points read every `rows / parts` rows of the key index."""
+        schema, _, name = self.table.replace('`', '').rpartition('.')
+        total = conn.value(
+            'SELECT TABLE_ROWS FROM information_schema.TABLES ' +
+            'WHERE TABLE_SCHEMA = ' + ('%s' if schema else 'DATABASE()') + ' AND TABLE_NAME = %s',
+            [schema, name] if schema else [name])
+        if not total:
+            return []
+        sql = \
+            f'SELECT {self.__key} FROM {self.table}{self.__filter(" WHERE ")} ' +\
+            f'ORDER BY {self.__key} LIMIT 1 OFFSET %s'
+        points = []
+        for part in range(1, self.parts):
+            value = conn.value(sql, self.param + [int(total) * part // self.parts])
+            if value is None:
+                break
+            points.append(value)
+        return self.__distinct(points)
+
+    @staticmethod
+    def __decode(value: Any) -> Any:
+        # strings of a histogram come as `base64:type254:<data>`
+        if isinstance(value, str) and value.startswith('base64:'):
+            return base64.b64decode(value.split(':', 2)[2]).decode('utf-8', 'replace')
+        return value
+
+    @staticmethod
+    def __distinct(points) -> list:
+        out = []
+        for p in points:
+            if not out or p > out[-1]:
+                out.append(p)
+        return out
+
+    @staticmethod
+    def __values(row: Any) -> tuple:
+        if not row:
+            return ()
+        return tuple(row.values()) if isinstance(row, dict) else tuple(row)
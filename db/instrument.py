@@ -0,0 +1,223 @@
+import re
+import time
+import threading
+from collections import deque
+
+
+class Event:
+    """
+    One statement seen by the instruments.
+
+    `before` hooks get the event with the statement only; `after` hooks also
+    get the time spent in the driver, the rows and bytes fetched and the error.
+    The fingerprint is computed on first access, so hooks that do not use it
+    do not pay for it.
+    """
+    __slots__ = ('kind', 'sql', 'param', 'dsn', 'start', 'seconds', 'rows', 'bytes', 'error', '_fingerprint')
+
+    re_literal = re.compile(r"""'(?:[^'\\]|\\.|'')*'|"(?:[^"\\]|\\.|"")*"|%\(\w+\)s|%s|\b\d+(?:\.\d+)?(?:e[-+]?\d+)?\b""", re.I)
+    """Literals and placeholders, replaced by `?`."""
+
+    re_space = re.compile(r'\s+')
+
+    re_list = re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)')
+    """Lists of values, `IN (?, ?)` or a row of `VALUES`."""
+
+    re_rows = re.compile(r'(\(\?\+\))(?:\s*,\s*\(\?\+\))+')
+    """Repeated rows of a multi-row `VALUES`."""
+
+    def __init__(self, kind: str, sql: str, param: 'tuple|list|dict' = [], dsn: str = None) -> None:
+        """
+        Initialize an event.
+
+        Args:
+            kind (str): `query`, `exec`, `many` or `load`.
+            sql (str): SQL statement as sent to the driver.
+            param (tuple|list|dict, optional): Parameters of the statement. Defaults to empty list.
+            dsn (str, optional): Name of the DSN. Defaults to None.
+        """
+        self.kind: str = kind
+        self.sql: str = sql
+        self.param: 'tuple|list|dict' = param
+        self.dsn: 'str|None' = dsn
+        self.start: float = 0.0
+        self.seconds: float = 0.0
+        """Seconds spent in the driver."""
+        self.rows: int = 0
+        """Rows fetched, or affected by a write."""
+        self.bytes: int = 0
+        """Estimated bytes of the rows fetched."""
+        self.error: 'BaseException|None' = None
+        self._fingerprint: 'str|None' = None
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({self.kind}, {self.seconds:.6f}s, rows={self.rows}, {self.fingerprint!r})'
+
+    @property
+    def fingerprint(self) -> str:
+        """SQL with the literals replaced by `?`, so the same statement with other values matches."""
+        if self._fingerprint is None:
+            self._fingerprint = self.normalize(self.sql)
+        return self._fingerprint
+
+    @classmethod
+    def normalize(cls, sql: str) -> str:
+        """
+        Fingerprint of a SQL statement.
+
+        Examples:
+            ```python
+            Event.normalize("SELECT * FROM t WHERE id IN (1, 2, 3) AND name = 'a'")
+            # SELECT * FROM t WHERE id IN (?+) AND name = ?
+            ```
+        """
+        sql = cls.re_literal.sub('?', sql)
+        sql = cls.re_space.sub(' ', sql).strip()
+        sql = cls.re_list.sub('(?+)', sql)
+        return cls.re_rows.sub(r'\1, ...', sql)
+
+
+class Instrument:
+    """
+    Base class of the instruments of `Main.hooks`.
+
+    Both methods may run at the same time on many threads.
+    """
+
+    def before(self, event: Event):
+        """Called before the statement is sent."""
+        pass
+
+    def after(self, event: Event):
+        """Called after the statement finished, failed or the result was abandoned."""
+        pass
+
+
+class SlowLog(Instrument):
+    """
+    Log of the statements slower than a threshold.
+
+    Examples:
+        ```python
+        Main.hooks = [SlowLog(0.5)]
+        ...
+        for entry in Main.hooks[0].entries:
+            print(entry['seconds'], entry['fingerprint'])
+        ```
+    """
+
+    def __init__(self, threshold: float = 1.0, size: int = 100, log: bool = True) -> None:
+        """
+        Initialize the slow log.
+
+        Args:
+            threshold (float, optional): Seconds from which a statement is slow. Defaults to 1.0.
+            size (int, optional): Slow statements kept in `entries`. Defaults to 100.
+            log (bool, optional): Also write a warning with `core.log.Logger`. Defaults to True.
+        """
+        self.threshold: float = threshold
+        self.entries: deque = deque(maxlen=size)
+        """Last slow statements, oldest first."""
+        self.log: bool = log
+        self.__logger = None
+
+    def after(self, event: Event):
+        if event.seconds < self.threshold:
+            return
+        entry = {
+            'time': time.time(),
+            'kind': event.kind,
+            'dsn': event.dsn,
+            'seconds': event.seconds,
+            'rows': event.rows,
+            'bytes': event.bytes,
+            'fingerprint': event.fingerprint,
+            'error': event.error,
+        }
+        self.entries.append(entry)
+        if self.log:
+            if self.__logger is None:
+                from ..core import log
+                self.__logger = log.Logger()
+            self.__logger.warning(
+                f'Slow {event.kind} {event.seconds:.3f}s rows={event.rows} dsn={event.dsn}: {event.fingerprint}')
+
+
+class Stats(Instrument):
+    """
+    Totals by fingerprint, to find the statements that cost the most.
+
+    Examples:
+        ```python
+        stats = Stats()
+        Main.hooks = [stats]
+        ...
+        print(stats.report(10))
+        ```
+    """
+
+    columns = ('count', 'total', 'max', 'rows', 'bytes', 'errors')
+    """Totals kept by fingerprint."""
+
+    def __init__(self) -> None:
+        self.__items: 'dict[tuple, list]' = {}
+        self.__lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.__items)
+
+    def after(self, event: Event):
+        key = (event.kind, event.fingerprint)
+        with self.__lock:
+            item = self.__items.get(key)
+            if item is None:
+                item = self.__items[key] = [0, 0.0, 0.0, 0, 0, 0]
+            item[0] += 1
+            item[1] += event.seconds
+            if event.seconds > item[2]:
+                item[2] = event.seconds
+            item[3] += event.rows
+            item[4] += event.bytes
+            item[5] += event.error is not None
+
+    def top(self, n: int = 10, by: str = 'total') -> 'list[dict]':
+        """
+        Most expensive statements.
+
+        Args:
+            n (int, optional): Number of statements. Defaults to 10.
+            by (str, optional): Column to sort by, see `columns`. Defaults to 'total'.
+
+        Returns:
+            list[dict]: `kind`, `fingerprint`, the `columns` and `avg`, most expensive first.
+        """
+        i = self.columns.index(by)
+        with self.__lock:
+            items = sorted(self.__items.items(), key=lambda kv: kv[1][i], reverse=True)[:n]
+        return [
+            {
+                'kind': kind,
+                'fingerprint': fingerprint,
+                **dict(zip(self.columns, item)),
+                'avg': item[1] / item[0],
+            }
+            for (kind, fingerprint), item in items
+        ]
+
+    def report(self, n: int = 10, by: str = 'total') -> str:
+        """
+        Top statements as a text table.
+
+        See Also: top
+        """
+        lines = [f'{"count":>8} {"total s":>10} {"avg s":>10} {"max s":>10} {"rows":>10}  statement']
+        for t in self.top(n, by):
+            lines.append(
+                f'{t["count"]:>8} {t["total"]:>10.3f} {t["avg"]:>10.4f} {t["max"]:>10.3f} {t["rows"]:>10}  ' +
+                f'{t["kind"]}: {t["fingerprint"]}')
+        return '\n'.join(lines)
+
+    def clear(self):
+        """Drop every total."""
+        with self.__lock:
+            self.__items.clear()
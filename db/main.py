@@ -1,7 +1,14 @@
 import re
+import time
 from abc import ABC, abstractmethod
-from typing import Any, Iterator
-from ..core import fn
+from contextlib import contextmanager, nullcontext
+from typing import Any, Callable, Iterable, Iterator
+from .dsn import Dsn
+from .pool import Pool
+from .cache import Cache
+from .record import Record
+from .script import Script, ScriptResult
+from .instrument import Event, Instrument
 
 
 class Main(ABC):
@@ -16,11 +23,55 @@ class Main(ABC):
     verbose: bool = False
     """Whether to display verbose output about queries and operations."""
 
+    stream: bool = False
+    """Fetch rows unbuffered from the server, so big results run in constant memory."""
+
+    batch_size: int = 1000
+    """Rows per `fetchmany` call in `query_batches` and `query`."""
+
+    cache: 'dict|bool' = False
+    """
+    Result cache options (`size`, `max_bytes`, `ttl`) shared by every instance of the DSN.
+    `True` caches with the defaults and `False` disables it. Writes through `exec`,
+    `many` and `load_stream` invalidate the entries of the written tables.
+    """
+
+    row: str = 'dict'
+    """
+    Type of the rows returned by queries:
+    - `dict`: a dictionary per row
+    - `tuple`: plain tuples in column order
+    - `record`: `Record` tuples that also allow `row['col']` and `row.col`
+    """
+
+    group_commit: 'dict|bool' = False
+    """
+    Group commit options (`statements`, `seconds`). Writes outside of a transaction
+    are committed together once `statements` writes are pending, or by the next write
+    or query once the oldest one is `seconds` old, and on `flush()` and `close()`.
+    There is no timer: an idle instance holds its pending writes (and their row locks)
+    until it runs another statement, so call `flush()` before waiting. `True` uses 100
+    statements and 1 second. Pending writes are lost if the process dies before they
+    are committed.
+    """
+
+    hooks: 'list[Instrument]' = []
+    """
+    Instruments called before and after every statement, see `db.instrument`.
+    With no hooks a statement only pays for checking this list.
+    """
+
     default = {
     }
     """Default configuration values for database connections"""
 
-    def __init__(self, dsn: 'str|dict', db: str = None) -> None:
+    pool: 'dict|bool' = False
+    """
+    Connection pool options (`min_size`, `max_size`, `idle_timeout`, `timeout`).
+    `True` pools with the defaults and `False` opens a dedicated connection.
+    """
+
+    def __init__(self, dsn: 'str|dict', db: str = None, pool: 'dict|bool' = None) -> None:
         """
         Initialize a database connection instance.
 
@@ -28,19 +79,56 @@ class Main(ABC):
             dsn (str|dict): Data Source Name as a connection string or a dictionary 
                            containing connection parameters.
             db (str, optional): Database name to select after connection. Defaults to None.
+            pool (dict|bool, optional): Overrides the `pool` class attribute. Defaults to None.
 
         Raises:
             Fatal error if connection configuration is invalid or incomplete.
         """
-        cfg = fn.dsn(dsn)
+        cfg, anonymized = Dsn.resolve(dsn)
         if not cfg:
             self.fatal_error('Dada connection config required')
 
         self.error = None
         """Stores the last error that occurred during database operations"""
-        
-        self.__dsn: dict = fn.anonymize(cfg)
-        self.__conn = self.connect(self._check_config(cfg))
+
+        self.description: 'list[tuple]|None' = None
+        """DB-API cursor description of the last query"""
+
+        self.__conn = None
+        self.__db = None
+        self.__tx: 'list[list]' = []
+        """Open transaction levels as `[savepoint, error at start]`."""
+        self.__pending: int = 0
+        """Writes waiting for the group commit."""
+        self.__since: float = 0.0
+        self.__dirty: set = set()
+        """Tables written by uncommitted statements."""
+        self.__dsn: dict = anonymized
+        config = self._check_config(cfg)
+        key = Pool.key(config)
+
+        self.__cache: 'Cache|None' = None
+        if self.cache is not False:
+            self.__cache = Cache.get_cache(
+                key,
+                **(self.cache if isinstance(self.cache, dict) else {})
+            )
+
+        options = self.pool if pool is None else pool
+        self.__pool: 'Pool|None' = None
+        if options is False:
+            self.__conn = self.connect(config)
+        else:
+            self.__pool = Pool.get(
+                key,
+                **(options if isinstance(options, dict) else {})
+            )
+            try:
+                self.__conn = self.__pool.acquire(
+                    lambda: self.connect(config), self.ping)
+            except TimeoutError as e:
+                self.error = e
+                self.show(f"Erro: {e}")
 
         self.db = db
 
@@ -53,6 +141,12 @@ class Main(ABC):
         """
         self.close()
 
+    def __enter__(self) -> 'Main':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
     @property
     def dsn(self) -> dict:
         """
@@ -80,6 +174,26 @@ class Main(ABC):
     def conn(self):
         self.__conn = None
 
+    @property
+    def connection_pool(self) -> 'Pool|None':
+        """
+        Get the connection pool of the DSN.
+
+        Returns:
+            Pool|None: The shared pool, or None for a dedicated connection.
+        """
+        return self.__pool
+
+    @property
+    def result_cache(self) -> 'Cache|None':
+        """
+        Get the result cache of the DSN.
+
+        Returns:
+            Cache|None: The shared result cache, or None if `cache` is disabled.
+        """
+        return self.__cache
+
     @property
     def db(self):
         """
@@ -121,6 +235,30 @@ class Main(ABC):
         """
         pass
 
+    def ping(self, conn) -> bool:
+        """
+        Check whether a pooled connection is still usable before reusing it.
+
+        Args:
+            conn (Any): Connection returned by connect()
+
+        Returns:
+            bool: True if the connection can be reused, False to discard it
+        """
+        return True
+
+    def reset(self, conn) -> bool:
+        """
+        Clean the session state of a connection before it goes back to the pool.
+
+        Args:
+            conn (Any): Connection returned by connect()
+
+        Returns:
+            bool: False if the state cannot be restored, and the connection must be closed instead.
+        """
+        return True
+
     @abstractmethod
     def select_db(self, db) -> bool:
         """
@@ -146,11 +284,11 @@ class Main(ABC):
         Args:
             sql (str|list|tuple): 
                 - SQL statement(s) to execute.
-                - Can be a single string or a list/tuple of strings for multiple statements.
+                - Can be a single string or a list/tuple of strings and `(sql, param)` pairs for multiple statements.
             param (tuple|list|dict, optional): 
                 - Parameters for the SQL statements.
                 - If sql is a string, these parameters apply to that statement.
-                - If sql is a list/tuple, these parameters apply to all statements.
+                - If sql is a list/tuple, each statement without its own parameters takes these from the first one.
                 - Defaults to empty list.
 
         Returns:
@@ -162,33 +300,108 @@ class Main(ABC):
         Examples:
             ```python
             # Executa uma única consulta com sucesso
-            success = self.queryExec("INSERT INTO tabela (coluna) VALUES (%s)", ('valor',))
+            success = self.exec("INSERT INTO tabela (coluna) VALUES (%s)", ('valor',))
 
             # Executa múltiplas consultas com sucesso
-            results = self.queryExec(["INSERT INTO tabela (coluna) VALUES (%s)", "UPDATE tabela SET coluna = %s WHERE id = %s"], ('valor', 'novo_valor', 1))
+            results = self.exec([
+                ("INSERT INTO tabela (coluna) VALUES (%s)", ('valor',)),
+                ("UPDATE tabela SET coluna = %s WHERE id = %s", ('novo_valor', 1)),
+            ])
 
             # Exemplo de erro na execução
-            success = self.queryExec("INSERT INTO tabela (coluna) VALUES (%s)", ('valor_errado',))
+            success = self.exec("INSERT INTO tabela (coluna) VALUES (%s)", ('valor_errado',))
             ```
+
+        See Also: script
         """
         pass
 
+    def script(self, sql: 'str|list|tuple', param: 'tuple|list|dict' = [], atomic: bool = True) -> ScriptResult:
+        """
+        Execute a script or a list of statements and report each statement.
+
+        Drivers with multi-statement support send the whole script in one round
+        trip. This fallback runs the statements one by one with `exec`.
+
+        Args:
+            sql (str|list|tuple): Script with `;` separated statements, or a list of
+                statements and `(sql, param)` tuples, see `db.script.Script`.
+            param (tuple|list|dict, optional): Parameters of the statements without
+                their own. Defaults to empty list.
+            atomic (bool, optional): Run in one transaction, rolled back if a statement
+                fails. False keeps the statements before the failure. Defaults to True.
+
+        Returns:
+            ScriptResult: Results by statement, falsy with `error` and `index` if one failed.
+
+        Examples:
+            ```python
+            result = self.script('''
+                UPDATE stock SET qty = qty - 1 WHERE id = 7;
+                INSERT INTO moves (stock_id, qty) VALUES (7, -1);
+            ''')
+            if not result:
+                print(result.index, result.error)
+            ```
+        """
+        script = Script(sql, param)
+        result = ScriptResult(script.statements)
+        params = iter(script.params)
+        with self.transaction() if atomic else nullcontext():
+            for statement, count in zip(script.statements, script.counts):
+                values = [next(params) for _ in range(count)]
+                if not self.exec(statement, values):
+                    result.fail(self.error)
+                    break
+                result.add(-1)
+        return result.stop()
+
     @abstractmethod
-    def many(self, tbl: str, data: 'list[dict]', config: dict = {}):
+    def many(self, tbl: str, data: 'Iterable[dict]', config: dict = {}):
         """
         Executes a batch operation (like INSERT) on multiple rows of data.
 
         Args:
             tbl (str): Target table name
-            data (list[dict]): List of dictionaries containing the data to insert
+            data (Iterable[dict]): List or generator of dictionaries containing the data to insert
             config (dict, optional): Configuration for the batch operation. 
                                      Defaults to {'command': 'INSERT'}.
+                                     See `db.bulk.Bulk.default` and `commit`,
+                                     which commits every N batches (default 1).
 
         Returns:
-            bool: True if operation was successful, False otherwise
+            BulkResult|bool: Result of the load, falsy if any batch failed
         """
         pass
 
+    def load_stream(self, table: str, rows: 'Iterable[Any]', columns: 'list[str]', config: dict = {}) -> 'int|bool':
+        """
+        Load an iterable of rows into a table with the fastest path of the driver.
+
+        Drivers with a bulk file protocol (`LOAD DATA LOCAL INFILE` in MySQL/MariaDB)
+        stream the rows straight to the server. This fallback uses `many`.
+
+        Args:
+            table (str): Target table name.
+            rows (Iterable): Rows as sequences in column order or dictionaries.
+            columns (list[str]): Column names of the table, in the order of the rows.
+            config (dict, optional): Options of the driver. Defaults to {}.
+
+        Returns:
+            int|bool: Rows loaded, or False if the load failed.
+
+        Examples:
+            ```python
+            rows = ((i, f'name {i}') for i in range(1_000_000))
+            self.load_stream('users', rows, ['id', 'name'])
+            ```
+        """
+        data = (r if isinstance(r, dict) else dict(zip(columns, r)) for r in rows)
+        result = self.many(table, data, {**config, 'columns': columns})
+        if result is None:
+            return False
+        return result.rows if result else False
+
     @abstractmethod
     def query(self, sql: str, param: 'tuple|list|dict' = []) -> Iterator[tuple]:
         """
@@ -225,6 +438,426 @@ class Main(ABC):
         """
         pass
 
+    def _fetch(self, sql: str, param: 'tuple|list|dict' = [], size: int = None) -> 'Iterator[list[tuple]]':
+        """
+        Execute a SQL query and yield the raw rows in batches.
+
+        Drivers override this method with a cursor based implementation that
+        fills `self.description`. This fallback regroups the rows of `query`.
+
+        Args:
+            sql (str): SQL query string.
+            param (tuple|list|dict, optional): Parameters for the query. Defaults to empty list.
+            size (int, optional): Rows per batch. Defaults to `batch_size`.
+
+        Yields:
+            list[tuple]: Up to `size` rows as tuples.
+        """
+        size = size or self.batch_size
+        self.description = None
+        batch = []
+        for row in self.query(sql, param):
+            if self.description is None:
+                self.description = [(k, None, None, None, None, None, None) for k in row]
+            batch.append(tuple(row.values()))
+            if len(batch) >= size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def query_batches(self, sql: str, param: 'tuple|list|dict' = [], size: int = None) -> 'Iterator[list[dict]]':
+        """
+        Execute a SQL query and yield the result as lists of rows.
+
+        With `stream` enabled only one batch is held in client memory at a time,
+        so a table of any size can be exported in constant memory.
+
+        Args:
+            sql (str): SQL query string.
+            param (tuple|list|dict, optional): Parameters for the query. Defaults to empty list.
+            size (int, optional): Rows per batch. Defaults to `batch_size`.
+
+        Yields:
+            list[dict]: Up to `size` rows, typed by `row`.
+
+        Examples:
+            ```python
+            for rows in self.query_batches('SELECT * FROM big_table', size=5000):
+                writer.writerows(rows)
+            ```
+        """
+        return self.__batches(sql, param, size)
+
+    def __batches(self, sql: str, param: 'tuple|list|dict', size: 'int|None', first: bool = False) -> 'Iterator[list]':
+        make = None
+        for batch in self.__fetch(sql, param, size, first):
+            if make is None:
+                make = self._row_factory([d[0] for d in self.description])
+            yield make(batch)
+
+    def __fetch(self, sql: str, param: 'tuple|list|dict', size: 'int|None', first: bool = False) -> 'Iterator[list[tuple]]':
+        """`_fetch` through the result cache and the instruments."""
+        if self.__pending:
+            self.__expire()
+        batches = self.__cached(sql, param, size, first)
+        if not self.hooks:
+            return batches
+        return self.__measured(sql, param, batches)
+
+    def __measured(self, sql: str, param: 'tuple|list|dict', batches: 'Iterator[list[tuple]]') -> 'Iterator[list[tuple]]':
+        """Batches of a query, timing only the driver and not the consumer."""
+        event = self._before('query', sql, param)
+        clock = time.perf_counter
+        seconds = 0.0
+        rows = 0
+        nbytes = 0
+        error = None
+        try:
+            while True:
+                start = clock()
+                batch = next(batches, None)
+                seconds += clock() - start
+                if batch is None:
+                    break
+                rows += len(batch)
+                nbytes += Cache.sizeof(batch)
+                yield batch
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            batches.close()
+            self._after(event, rows, nbytes, error, seconds)
+
+    def _before(self, kind: str, sql: str, param: 'tuple|list|dict' = []) -> Event:
+        """
+        Start the event of a statement and call the `before` hooks.
+
+        Drivers call it only when `hooks` is not empty.
+
+        Args:
+            kind (str): `query`, `exec`, `many` or `load`.
+            sql (str): SQL statement.
+            param (tuple|list|dict, optional): Parameters of the statement. Defaults to empty list.
+
+        Returns:
+            Event: Event to pass to `_after`.
+        """
+        event = Event(kind, sql, param, self.__dsn.get('dsn'))
+        for hook in self.hooks:
+            hook.before(event)
+        event.start = time.perf_counter()
+        return event
+
+    def _after(self, event: Event, rows: int = 0, nbytes: int = 0, error: 'BaseException|None' = None, seconds: float = None):
+        """
+        Finish the event of a statement and call the `after` hooks.
+
+        Args:
+            event (Event): Event returned by `_before`.
+            rows (int, optional): Rows fetched or affected. Defaults to 0.
+            nbytes (int, optional): Estimated bytes fetched. Defaults to 0.
+            error (BaseException|None, optional): Error of the statement. Defaults to None.
+            seconds (float, optional): Time in the driver. Defaults to the time since `_before`.
+        """
+        event.seconds = time.perf_counter() - event.start if seconds is None else seconds
+        event.rows = rows
+        event.bytes = nbytes
+        event.error = error
+        for hook in self.hooks:
+            hook.after(event)
+
+    def __cached(self, sql: str, param: 'tuple|list|dict', size: 'int|None', first: bool = False) -> 'Iterator[list[tuple]]':
+        """
+        `_fetch` through the result cache.
+
+        Raw rows are cached, so hits are converted to the current `row` type and
+        callers can not change the cached values. With `first` only the first
+        row is needed, which a partial entry left by an earlier `line` serves.
+        """
+        cache = self.__cache
+        if cache is None or not cache.cacheable(sql):
+            yield from self._fetch(sql, param, size)
+            return
+        key = cache.key(sql, param, self.db)
+        hit = cache.get(key)
+        if hit is not None and (first or hit[2]):
+            self.description, rows, _ = hit
+            if first:
+                rows = rows[:1]
+            size = size or self.batch_size
+            for i in range(0, len(rows), size):
+                yield rows[i:i + size]
+            return
+        rows = []
+        nbytes = 0
+        for batch in self._fetch(sql, param, size):
+            if rows is not None:
+                rows.extend(batch)
+                nbytes += cache.sizeof(batch)
+                if nbytes > cache.max_bytes:
+                    rows = None
+            if first and rows is not None:
+                cache.set(key, (self.description, rows[:1], False), cache.tables(sql), nbytes)
+                rows = None
+            yield batch
+        if rows is not None and self.description:
+            cache.set(key, (self.description, rows, True), cache.tables(sql), nbytes)
+
+    def _written(self, sql: str):
+        """
+        Invalidate the cached results of the tables written by a statement.
+
+        Drivers call it after a successful write.
+
+        Args:
+            sql (str): Write statement or table name.
+        """
+        if self.__cache is not None:
+            tables = Cache.tables(sql)
+            self.__cache.invalidate(tables)
+            if self.__tx or self.group_commit:
+                # other connections may cache the old rows until the commit
+                self.__dirty |= tables or {''}
+
+    @property
+    def in_transaction(self) -> bool:
+        """Whether a `transaction()` block is open."""
+        return bool(self.__tx)
+
+    @contextmanager
+    def transaction(self, savepoint: bool = True) -> 'Iterator[Main]':
+        """
+        Run the statements of a block in one transaction.
+
+        The block commits once at the end, instead of once per statement, and
+        rolls back if it raises or any statement fails (sets `error`). A nested
+        block runs in a savepoint, so its failure only undoes its own statements.
+
+        Args:
+            savepoint (bool, optional): Use a savepoint when nested. False joins
+                the outer transaction. Defaults to True.
+
+        Yields:
+            Main: This instance.
+
+        Examples:
+            ```python
+            with db.transaction():
+                db.exec('INSERT INTO orders (id) VALUES (%s)', (1,))
+                with db.transaction():
+                    db.exec('INSERT INTO audit (id) VALUES (%s)', (1,))
+            ```
+        """
+        conn = self.conn
+        depth = len(self.__tx)
+        if not conn or (depth and not savepoint):
+            yield self
+            return
+        name = f'liger_sp{depth}' if depth else None
+        if name:
+            self._statement(f'SAVEPOINT {name}')
+        else:
+            self.flush()
+            self._begin(conn)
+        frame = [name, self.error]
+        self.__tx.append(frame)
+        try:
+            yield self
+        except BaseException:
+            self.__tx.pop()
+            self.__end(conn, name, False)
+            raise
+        self.__tx.pop()
+        ok = self.error is frame[1]
+        self.__end(conn, name, ok)
+        if not ok and self.__tx:
+            # the savepoint undid the failure, so the outer level can still commit
+            self.__tx[-1][1] = self.error
+
+    def flush(self) -> int:
+        """
+        Commit the writes waiting for the group commit.
+
+        Returns:
+            int: Writes committed.
+        """
+        pending = self.__pending
+        if pending and self.conn:
+            self.conn.commit()
+            self.__committed()
+        return pending
+
+    def _commit(self) -> bool:
+        """
+        Commit a write of the driver, unless it is part of a transaction or of a group commit.
+
+        Drivers call it instead of `conn.commit()` after each write.
+
+        Returns:
+            bool: Whether the write was committed now.
+        """
+        if self.__tx:
+            return False
+        options = self.group_commit
+        if options:
+            options = options if isinstance(options, dict) else {}
+            now = time.monotonic()
+            if not self.__pending:
+                self.__since = now
+            self.__pending += 1
+            if self.__pending < options.get('statements', 100) and now - self.__since < options.get('seconds', 1.0):
+                return False
+        self.conn.commit()
+        self.__committed()
+        return True
+
+    def __expire(self):
+        """Commit the grouped writes once the oldest one is `seconds` old."""
+        options = self.group_commit if isinstance(self.group_commit, dict) else {}
+        if not self.__tx and time.monotonic() - self.__since >= options.get('seconds', 1.0):
+            self.flush()
+
+    def _begin(self, conn):
+        """
+        Start a transaction. The default relies on the implicit transaction of DB-API connections.
+
+        Args:
+            conn (Any): Connection returned by connect()
+        """
+        pass
+
+    def _statement(self, sql: str):
+        """
+        Run a statement without result on the current connection, like `SAVEPOINT`.
+
+        Args:
+            sql (str): SQL statement.
+        """
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(sql)
+        finally:
+            cursor.close()
+
+    def __end(self, conn, savepoint: 'str|None', ok: bool):
+        try:
+            if savepoint:
+                self._statement(f'RELEASE SAVEPOINT {savepoint}' if ok else f'ROLLBACK TO SAVEPOINT {savepoint}')
+            elif ok:
+                conn.commit()
+                self.__committed()
+            else:
+                conn.rollback()
+                self.__committed()
+        except Exception as e:
+            self.error = e
+            self.show(f"Erro: {e}")
+            if not savepoint and ok:
+                conn.rollback()
+
+    def __committed(self):
+        self.__pending = 0
+        if self.__dirty:
+            if self.__cache is not None:
+                # '' stands for a statement whose tables are unknown
+                self.__cache.invalidate(None if '' in self.__dirty else self.__dirty)
+            self.__dirty = set()
+
+    def _row_factory(self, names: 'list[str]') -> 'Callable[[list[tuple]], list]':
+        """
+        Build the converter of raw row batches to the `row` type.
+
+        Args:
+            names (list[str]): Column names of the result.
+
+        Returns:
+            Callable: Converts a list of tuples into a list of rows.
+        """
+        if self.row == 'tuple':
+            return list
+        if self.row == 'record':
+            cls = Record.schema(names)
+            return lambda batch: list(map(cls, batch))
+        return lambda batch: [dict(zip(names, r)) for r in batch]
+
+    def query_columns(self, sql: str, param: 'tuple|list|dict' = []) -> 'dict[str, Any]':
+        """
+        Execute a SQL query and return the result as one NumPy array per column.
+
+        The dtype of each array comes from the cursor description (see `_dtype`),
+        so sums, min/max and group-bys run vectorized instead of over a dict per row.
+        Integer columns with NULLs become float64 with NaN, and values that do not
+        fit the dtype fall back to an object array.
+
+        Args:
+            sql (str): SQL query string.
+            param (tuple|list|dict, optional): Parameters for the query. Defaults to empty list.
+
+        Returns:
+            dict[str, numpy.ndarray]: Column name to array of values.
+
+        Examples:
+            ```python
+            cols = self.query_columns('SELECT region, amount FROM sales')
+            print(cols['amount'].sum())
+            ```
+        """
+        data = None
+        for batch in self.__fetch(sql, param, None):
+            if data is None:
+                data = [[] for _ in self.description]
+            for col, values in zip(data, zip(*batch)):
+                col.extend(values)
+        if not self.description:
+            return {}
+        if data is None:
+            data = [[] for _ in self.description]
+        return {
+            d[0]: self.__array(values, self._dtype(d))
+            for d, values in zip(self.description, data)
+        }
+
+    def frame(self, sql: str, param: 'tuple|list|dict' = []) -> Any:
+        """
+        Execute a SQL query and return the columns as a NumPy record array.
+
+        Args:
+            sql (str): SQL query string.
+            param (tuple|list|dict, optional): Parameters for the query. Defaults to empty list.
+
+        Returns:
+            numpy.recarray: Columns accessible as `frame['col']` or `frame.col`.
+
+        See Also: query_columns
+        """
+        import numpy as np
+        cols = self.query_columns(sql, param)
+        return np.rec.fromarrays(list(cols.values()), names=list(cols.keys()))
+
+    def _dtype(self, column: tuple) -> str:
+        """
+        NumPy dtype of a column of the cursor description.
+
+        Args:
+            column (tuple): DB-API description of the column.
+
+        Returns:
+            str: NumPy dtype. Drivers map their type codes; the default is object.
+        """
+        return 'O'
+
+    @staticmethod
+    def __array(values: list, dtype: str) -> Any:
+        import numpy as np
+        if dtype[0] in 'iu' and None in values:
+            dtype = 'float64'
+        try:
+            return np.array(values, dtype=dtype)
+        except (TypeError, ValueError, OverflowError):
+            return np.array(values, dtype='O')
+
     def line(self, sql: str, param: 'tuple|list|dict' = []) -> dict:
         """
         Execute a SQL query and return the first row of the result.
@@ -237,14 +870,13 @@ class Main(ABC):
             param (tuple|list|dict, optional): Parameters for the query. Defaults to empty list.
 
         Returns:
-            dict: First row of the query result as a dictionary, or empty dictionary if no results.
+            dict: First row of the query result, typed by `row`, or empty dictionary if no results.
 
         See Also: query
         """
-        try:
-            return next(self.query(sql, param))  # type: ignore
-        except StopIteration:
-            return {}
+        for batch in self.__batches(sql, param, 1, True):
+            return batch[0]
+        return {}
 
     def value(self, sql: str, param: 'tuple|list|dict' = []) -> Any:
         """
@@ -264,6 +896,8 @@ class Main(ABC):
         """
         first_line = self.line(sql, param)
         if first_line:
+            if isinstance(first_line, tuple):
+                return first_line[0]
             return next(iter(first_line.values()))
         return None
 
@@ -284,8 +918,8 @@ class Main(ABC):
         See Also: query
         """
         row = []
-        for r in self.query(sql, param):
-            row.append(r)
+        for batch in self.query_batches(sql, param):
+            row.extend(batch)
         return row
 
     def close(self):
@@ -293,12 +927,20 @@ class Main(ABC):
         Close the database connection.
 
         This method closes the active database connection if one exists, and sets
-        the internal connection reference to None.
+        the internal connection reference to None. Pooled connections are given
+        back to the pool instead of being closed.
         """
         conn = self.conn
         if conn:
-            conn.close()
-            conn = None
+            self.flush()
+            if self.__pool:
+                if self.reset(conn) is False:
+                    self.__pool.discard(conn)
+                else:
+                    self.__pool.release(conn)
+            else:
+                conn.close()
+            self.__conn = None
 
     def str_to_dict(self, csv_data: str, config: dict = {}) -> 'list[dict]':
         """
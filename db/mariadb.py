@@ -1,4 +1,4 @@
 from .mysql import MySQL
 
 class MariaDB(MySQL):
-    ...
+    row_alias: bool = False
@@ -1,3 +1,25 @@
+class Reference:
+    """Represents a foreign key of the table."""
+    def __init__(self,
+                 columns: 'list[str]',
+                 table: str,
+                 references: 'list[str]',
+                 schema: str = None,
+                 on_update: str = None,
+                 on_delete: str = None,
+                 ) -> None:
+        self.columns: 'list[str]' = columns
+        """Columns of the table."""
+        self.table: str = table
+        """Referenced table."""
+        self.references: 'list[str]' = references
+        """Referenced columns, in the order of `columns`."""
+        self.schema: str = schema
+        """Schema of the referenced table."""
+        self.on_update: str = on_update
+        self.on_delete: str = on_delete
+
+
 class ForeignKey:
     """Represents a collection of the foreign keys in the table."""
     pass
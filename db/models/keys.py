@@ -1,3 +1,21 @@
+class Key:
+    """Represents an index of the table."""
+    def __init__(self,
+                 columns: 'list[str]',
+                 primary: bool = False,
+                 unique: bool = False,
+                 type: str = 'BTREE',
+                 comment: str = None,
+                 ) -> None:
+        self.columns: 'list[str]' = columns
+        """Columns of the index in order, `name(length)` for prefixes."""
+        self.primary: bool = primary
+        self.unique: bool = unique
+        self.type: str = type
+        """BTREE, HASH, FULLTEXT or SPATIAL."""
+        self.comment: str = comment
+
+
 class Keys:
     """Represents a collection of the indexes in the table."""
     pass
@@ -1,3 +1,25 @@
+class Partition:
+    """Represents a partition of the table."""
+    def __init__(self,
+                 description: str = None,
+                 rows: int = None,
+                 comment: str = None,
+                 ) -> None:
+        self.description: str = description
+        """`VALUES LESS THAN`/`VALUES IN` bound."""
+        self.rows: int = rows
+        """Estimated rows."""
+        self.comment: str = comment
+
+
 class Partitions:
     """Represents the configuration of the table partitions."""
-    pass
+    method: str|None = None
+    """RANGE, LIST, HASH, KEY, ..."""
+
+    expression: str|None = None
+    """Partitioning expression or columns."""
+
+    subpartition_method: str|None = None
+
+    subpartition_expression: str|None = None
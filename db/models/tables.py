@@ -4,7 +4,8 @@ class Table():
     conn: str|None = None
     """Connection of the database."""
 
-    engine = None
+    engine: str|None = None
+    """Storage engine of the table."""
 
     name: str|None = None
     """Name of the table."""
@@ -12,6 +13,9 @@ class Table():
     label: str|None = None
     """Label of the table. If None, use the name."""
 
+    comment: str|None = None
+    """Comment of the table."""
+
     db: database.Db|None = None
     """Database schema of the table."""
 
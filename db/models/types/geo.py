@@ -7,7 +7,9 @@ See:
 """
 from . import main
 
-class Point(main.Type):
+class Geometry(main.Type):
+    __slots__ = ('length', 'max_length')
+
     def __init__(self,
                  length: int = 0,
                  not_null: bool = False,
@@ -27,24 +29,23 @@ class Point(main.Type):
         self.virtual: bool = virtual
         self.max_length: int = max_length
 
-class LineString(Point):
+class Point(Geometry):
     pass
 
-class Polygon:
+class LineString(Point):
     pass
 
-class MultiPoint:
+class Polygon(Geometry):
     pass
 
-class MultiLineString:
+class MultiPoint(Geometry):
     pass
 
-class MultiPolygon:
+class MultiLineString(Geometry):
     pass
 
-class Geometrycollection:
+class MultiPolygon(Geometry):
     pass
 
-class Geometry:
+class Geometrycollection(Geometry):
     pass
-
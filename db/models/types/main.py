@@ -5,7 +5,107 @@ See:
     - https://dev.mysql.com/doc/refman/8.0/en/data-types.html
     - https://mariadb.com/kb/en/data-types/
 """
+import weakref
+from typing import Any
 
 
-class Type:
-    pass
+class TypeMeta(type):
+    """
+    Metaclass of the column types.
+
+    A class without its own `__slots__` gets an empty one, so instances never
+    have a `__dict__`. Instances are frozen once built and interned: building
+    a definition equal to a living one returns the living one, so a catalog
+    with thousands of `VarChar(255)` columns holds a single object.
+    """
+
+    registry: 'weakref.WeakValueDictionary' = weakref.WeakValueDictionary()
+    """Living instances by `(class, values)`."""
+
+    def __new__(mcs, name: str, bases: tuple, ns: dict):
+        ns.setdefault('__slots__', ())
+        cls = super().__new__(mcs, name, bases, ns)
+        names = []
+        for c in reversed(cls.__mro__):
+            for k in c.__dict__.get('__slots__', ()):
+                if not k.startswith('__') and k not in names:
+                    names.append(k)
+        cls._attributes = tuple(names)
+        return cls
+
+    def __call__(cls, *args, **kwargs):
+        return TypeMeta.intern(cls, super().__call__(*args, **kwargs))
+
+    def intern(cls, obj: 'Type') -> 'Type':
+        """Freeze an instance and return the shared one with the same values."""
+        object.__setattr__(obj, '_Type__frozen', True)
+        try:
+            return TypeMeta.registry.setdefault((cls, obj._key()), obj)
+        except TypeError:
+            # unhashable value, kept as a private instance
+            return obj
+
+
+class Type(metaclass=TypeMeta):
+    """
+    Base of the column types: immutable, `__slots__` based and interned.
+
+    Use `replace()` to derive a definition.
+    """
+    __slots__ = ('not_null', 'default', 'on_update', 'comment', 'expression', 'virtual', '__frozen', '__weakref__')
+
+    _attributes: 'tuple[str, ...]' = ()
+    """Attribute names of the class, set by `TypeMeta`."""
+
+    def __setattr__(self, name: str, value: Any):
+        if getattr(self, '_Type__frozen', False):
+            raise AttributeError(f'{type(self).__name__} is immutable, use replace()')
+        object.__setattr__(self, name, value)
+
+    def __delattr__(self, name: str):
+        raise AttributeError(f'{type(self).__name__} is immutable')
+
+    def __reduce__(self):
+        return type(self).from_state, (self.state(),)
+
+    def __repr__(self) -> str:
+        args = ', '.join(f'{k}={v!r}' for k, v in self.state().items() if v is not None and v is not False)
+        return f'{type(self).__name__}({args})'
+
+    def _key(self) -> tuple:
+        """Values of every attribute with their types, in `_attributes` order."""
+        return tuple(self._typed(getattr(self, k, None)) for k in self._attributes)
+
+    @classmethod
+    def _typed(cls, value: Any) -> Any:
+        # `True == 1` and `1.0 == 1`, yet `default=True` must not intern as `default=1`
+        if isinstance(value, tuple):
+            return type(value), tuple(cls._typed(v) for v in value)
+        return type(value), value
+
+    def state(self) -> 'dict[str, Any]':
+        """Attributes that are set, by name."""
+        return {k: getattr(self, k) for k in self._attributes if hasattr(self, k)}
+
+    def replace(self, **changes) -> 'Type':
+        """
+        Same definition with some attributes changed.
+
+        Returns:
+            Type: The interned definition.
+        """
+        return type(self).from_state({**self.state(), **changes})
+
+    @classmethod
+    def from_state(cls, state: 'dict[str, Any]') -> 'Type':
+        """
+        Definition with the attributes of `state()`, without calling `__init__`.
+
+        Returns:
+            Type: The interned definition.
+        """
+        obj = cls.__new__(cls)
+        for k, v in state.items():
+            if k in cls._attributes:
+                object.__setattr__(obj, k, tuple(v) if isinstance(v, list) else v)
+        return TypeMeta.intern(cls, obj)
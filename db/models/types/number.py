@@ -9,6 +9,8 @@ from . import main
 
 
 class Int(main.Type):
+    __slots__ = ('length', 'unsigned', 'zero_fill', 'auto_increment', 'max_length', 'min', 'max')
+
     def __init__(self,
                  length: int = 10,
                  unsigned: bool = False,
@@ -85,6 +87,8 @@ class Boolean(Bool):
     pass
 
 class Decimal(Int):
+    __slots__ = ('decimals', 'collate')
+
     def __init__(self,
                  length: int = 10,
                  decimals: int = 0,
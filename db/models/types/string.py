@@ -9,6 +9,8 @@ from . import main
 
 
 class Char(main.Type):
+    __slots__ = ('length', 'auto_increment', 'collate', 'max_length', 'min', 'max')
+
     def __init__(self,
                  length: int = 10,
                  not_null: bool = False,
@@ -106,7 +108,30 @@ class LongBlob(Blob):
 
 
 class Enum(VarChar):
-    pass
+    __slots__ = ('values',)
+
+    def __init__(self,
+                 values: 'list[str]|tuple[str, ...]' = None,
+                 not_null: bool = False,
+                 default: str = None,
+                 on_update: str = None,
+                 comment: str = None,
+                 collate: str = None,
+                 expression: str = None,
+                 virtual: bool = False,
+                 ) -> None:
+        super().__init__(
+            length=max(map(len, values)) if values else 10,
+            not_null=not_null,
+            default=default,
+            on_update=on_update,
+            comment=comment,
+            collate=collate,
+            expression=expression,
+            virtual=virtual,
+        )
+        self.values: 'tuple[str, ...]' = tuple(values or ())
+        """Allowed values, in order."""
 
 
 class Set(Enum):
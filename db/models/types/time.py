@@ -25,6 +25,8 @@ class Date(main.Type):
         self.virtual: bool = virtual
 
 class Time(main.Type):
+    __slots__ = ('len',)
+
     def __init__(self,
                  len: int = 0,
                  not_null: bool = False,
@@ -43,6 +45,8 @@ class Time(main.Type):
         self.virtual: bool = virtual
 
 class DateTime(Time, Date):
+    __slots__ = ('length', 'min', 'max')
+
     def __init__(self,
                  length: int = 0,
                  not_null: bool = False,
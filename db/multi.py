@@ -0,0 +1,237 @@
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterator
+
+
+class Multi:
+    """
+    Fan-out of a query to many DSNs at once.
+
+    Every DSN runs on a bounded thread pool with its own connection and sends
+    its batches through one queue, so the rows of the fastest servers are
+    available first and memory stays bounded by the queue size. A DSN that
+    fails or exceeds `timeout` is reported in `errors` and the others go on.
+
+    Examples:
+        ```python
+        multi = Multi(['server1', 'server2', 'server3'], workers=8, timeout=30)
+        for row in multi.query('SELECT @@hostname AS host, @@version AS version'):
+            print(row['_dsn'], row['version'])
+        print(multi.errors)
+        ```
+    """
+
+    tag: str = '_dsn'
+    """Key added to every dictionary row with the name of its DSN."""
+
+    buffer: int = 4
+    """Batches queued per worker before the workers wait for the consumer."""
+
+    def __init__(self,
+                 dsns: 'list[str|dict]',
+                 workers: int = 8,
+                 timeout: float = None,
+                 db: str = None,
+                 pool: 'dict|bool' = None,
+                 ) -> None:
+        """
+        Initialize the fan-out.
+
+        Args:
+            dsns (list[str|dict]): DSN names of `dsn.json`, URIs or config dicts.
+            workers (int, optional): Maximum DSNs queried at the same time. Defaults to 8.
+            timeout (float, optional): Seconds each DSN has to connect and return
+                all of its rows. Defaults to None (no limit).
+            db (str, optional): Database to select on every DSN. Defaults to None.
+            pool (dict|bool, optional): Connection pool options, see `Main.pool`.
+                Defaults to None, which uses the class attribute of the driver.
+        """
+        self.dsns: 'dict[str, str|dict]' = {self.name(d): d for d in dsns}
+        """DSNs by name."""
+        self.workers: int = max(1, workers)
+        self.timeout: 'float|None' = timeout
+        self.db: 'str|None' = db
+        self.pool: 'dict|bool|None' = pool
+        self.errors: 'dict[str, BaseException]' = {}
+        """Errors of the last run by DSN name, `TimeoutError` for the expired ones."""
+        self.rows: 'dict[str, int]' = {}
+        """Rows received in the last run by DSN name."""
+        self.seconds: 'dict[str, float]' = {}
+        """Wall time of each DSN that finished in the last run."""
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({list(self.dsns)})'
+
+    @staticmethod
+    def name(dsn: 'str|dict') -> str:
+        """Name of a DSN: the name or URI itself, or the `dsn`/`host` of a config dict."""
+        if isinstance(dsn, str):
+            return dsn
+        return str(dsn.get('dsn') or dsn.get('host') or id(dsn))
+
+    @property
+    def ok(self) -> bool:
+        """Whether every DSN of the last run succeeded."""
+        return not self.errors
+
+    def open(self, dsn: 'str|dict') -> Any:
+        """
+        Open the connection handler of a DSN. Runs in the worker thread.
+
+        Args:
+            dsn (str|dict): DSN name, URI or config dict.
+
+        Returns:
+            Main: Driver instance, see `db.conn.connect`.
+        """
+        from .conn import connect
+        return connect(dsn, self.db, self.pool)
+
+    def batches(self,
+                sql: 'str|dict[str, str|tuple]',
+                param: 'tuple|list|dict' = [],
+                size: int = None,
+                ) -> 'Iterator[tuple[str, list]]':
+        """
+        Run a query on every DSN and yield the batches as they arrive.
+
+        Args:
+            sql (str|dict[str, str|tuple]): SQL for every DSN, or SQL (or a
+                `(sql, param)` tuple) by DSN name. DSNs missing from the dict are skipped.
+            param (tuple|list|dict, optional): Parameters of a shared SQL. Defaults to empty list.
+            size (int, optional): Rows per batch. Defaults to `Main.batch_size`.
+
+        Yields:
+            tuple[str, list]: DSN name and a batch of rows typed by the driver `row`.
+        """
+        jobs = self.__jobs(sql, param)
+        self.errors, self.rows, self.seconds = {}, {}, {}
+        if not jobs:
+            return
+        out: queue.Queue = queue.Queue(self.workers * self.buffer)
+        stop = threading.Event()
+        cancel = {name: threading.Event() for name in jobs}
+        started: 'dict[str, float]' = {}
+        pending = set(jobs)
+        executor = ThreadPoolExecutor(min(self.workers, len(jobs)), 'multi')
+        for name, job in jobs.items():
+            executor.submit(self.__run, name, job, size, out, cancel[name], stop, started)
+        try:
+            while pending:
+                try:
+                    name, batch, error = out.get(timeout=self.__wait(pending, started))
+                except queue.Empty:
+                    self.__expire(pending, started, cancel)
+                    continue
+                if name not in pending:
+                    # late message of an expired DSN
+                    continue
+                if batch is None:
+                    pending.discard(name)
+                    self.seconds[name] = time.monotonic() - started[name]
+                    if error is not None:
+                        self.errors[name] = error
+                    continue
+                self.rows[name] = self.rows.get(name, 0) + len(batch)
+                yield name, batch
+                self.__expire(pending, started, cancel)
+        finally:
+            stop.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def query(self,
+              sql: 'str|dict[str, str|tuple]',
+              param: 'tuple|list|dict' = [],
+              ) -> 'Iterator[dict]':
+        """
+        Run a query on every DSN and yield the merged rows tagged with their DSN.
+
+        Args:
+            sql (str|dict[str, str|tuple]): See `batches`.
+            param (tuple|list|dict, optional): Parameters of a shared SQL. Defaults to empty list.
+
+        Yields:
+            dict: Each row with the DSN name in the `tag` key. Rows of drivers
+                that do not return dictionaries are yielded unchanged, use
+                `batches` to know their source.
+        """
+        tag = self.tag
+        for name, batch in self.batches(sql, param):
+            for row in batch:
+                if isinstance(row, dict):
+                    row[tag] = name
+                yield row
+
+    def all(self, sql: 'str|dict[str, str|tuple]', param: 'tuple|list|dict' = []) -> 'list[dict]':
+        """
+        Run a query on every DSN and return all the merged rows.
+
+        See Also: query
+        """
+        return list(self.query(sql, param))
+
+    def __jobs(self, sql: 'str|dict', param: 'tuple|list|dict') -> 'dict[str, tuple]':
+        if not isinstance(sql, dict):
+            return {name: (sql, param) for name in self.dsns}
+        jobs = {}
+        for name in self.dsns:
+            job = sql.get(name)
+            if job is not None:
+                jobs[name] = job if isinstance(job, tuple) else (job, [])
+        return jobs
+
+    def __wait(self, pending: set, started: dict) -> 'float|None':
+        """Seconds until the next deadline, None to block without a timeout."""
+        if self.timeout is None:
+            return None
+        now = time.monotonic()
+        deadlines = [started[n] + self.timeout for n in pending if n in started]
+        if not deadlines:
+            return min(self.timeout, 0.1)
+        return max(0.01, min(deadlines) - now)
+
+    def __expire(self, pending: set, started: dict, cancel: dict):
+        if self.timeout is None:
+            return
+        now = time.monotonic()
+        for name in [n for n in pending if n in started and now - started[n] > self.timeout]:
+            pending.discard(name)
+            cancel[name].set()
+            self.seconds[name] = now - started[name]
+            self.errors[name] = TimeoutError(f'{name}: no result after {self.timeout}s')
+
+    def __run(self, name: str, job: tuple, size: 'int|None', out: queue.Queue,
+              cancel: threading.Event, stop: threading.Event, started: dict):
+        started[name] = time.monotonic()
+        error = None
+        db = None
+        try:
+            db = self.open(self.dsns[name])
+            if db.error is not None:
+                raise ConnectionError(f'{name}: {db.error}')
+            batches = db.query_batches(job[0], job[1], size)
+            try:
+                for batch in batches:
+                    if not self.__put(out, (name, batch, None), cancel, stop):
+                        return
+            finally:
+                batches.close()
+        except BaseException as e:
+            error = e
+        finally:
+            if db is not None:
+                db.close()
+        self.__put(out, (name, None, error), cancel, stop)
+
+    @staticmethod
+    def __put(out: queue.Queue, item: tuple, cancel: threading.Event, stop: threading.Event) -> bool:
+        """Queue an item, giving up when the DSN expired or the consumer stopped."""
+        while not (cancel.is_set() or stop.is_set()):
+            try:
+                out.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
@@ -1,7 +1,16 @@
+import inspect
 import mysql.connector
-from typing import Any, Iterator
+from contextlib import nullcontext
+from typing import Any, Iterable, Iterator
 from mysql.connector import Error, errorcode, MySQLConnection
+from mysql.connector.constants import FieldType, FieldFlag
 from .main import Main
+from .bulk import Bulk, BulkResult
+from .infile import Infile
+from .script import Script, ScriptResult
+from .statements import Statements
+from .decode import Decoder
+from .models.types import number as t_number, string as t_string, time as t_time, geo as t_geo
 
 
 class MySQL(Main):
@@ -21,14 +30,120 @@ class MySQL(Main):
         'collation': None,
         'buffered': False,
         'raise_on_warnings': True,
-        'use_pure': True,
+        'use_pure': None,
         'connection_timeout': None,
         'use_unicode': True,
         'ssl_ca': None,
         'ssl_cert': None,
         'ssl_key': None,
+        'allow_local_infile': None,
+        'allow_local_infile_in_path': None,
     }
 
+    dtypes = {
+        FieldType.TINY: 'int64',
+        FieldType.SHORT: 'int64',
+        FieldType.INT24: 'int64',
+        FieldType.LONG: 'int64',
+        FieldType.LONGLONG: 'int64',
+        FieldType.YEAR: 'int64',
+        FieldType.FLOAT: 'float64',
+        FieldType.DOUBLE: 'float64',
+        FieldType.DECIMAL: 'float64',
+        FieldType.NEWDECIMAL: 'float64',
+        FieldType.DATE: 'datetime64[D]',
+        FieldType.NEWDATE: 'datetime64[D]',
+        FieldType.DATETIME: 'datetime64[us]',
+        FieldType.TIMESTAMP: 'datetime64[us]',
+        FieldType.TIME: 'timedelta64[us]',
+    }
+    """NumPy dtypes by MySQL field type, used by `query_columns`"""
+
+    field_types = {
+        FieldType.TINY: t_number.TinyInt,
+        FieldType.SHORT: t_number.SmallInt,
+        FieldType.INT24: t_number.MediumInt,
+        FieldType.LONG: t_number.Int,
+        FieldType.LONGLONG: t_number.BigInt,
+        FieldType.YEAR: t_time.Year,
+        FieldType.BIT: t_number.Bit,
+        FieldType.FLOAT: t_number.Float,
+        FieldType.DOUBLE: t_number.Double,
+        FieldType.DECIMAL: t_number.Decimal,
+        FieldType.NEWDECIMAL: t_number.Decimal,
+        FieldType.DATE: t_time.Date,
+        FieldType.NEWDATE: t_time.Date,
+        FieldType.DATETIME: t_time.DateTime,
+        FieldType.TIMESTAMP: t_time.TimeStamp,
+        FieldType.TIME: t_time.Time,
+        FieldType.VARCHAR: t_string.VarChar,
+        FieldType.VAR_STRING: t_string.VarChar,
+        FieldType.STRING: t_string.Char,
+        FieldType.ENUM: t_string.Enum,
+        FieldType.JSON: t_string.LongText,
+        FieldType.TINY_BLOB: t_string.TinyText,
+        FieldType.MEDIUM_BLOB: t_string.MediumText,
+        FieldType.LONG_BLOB: t_string.LongText,
+        FieldType.BLOB: t_string.Text,
+        FieldType.GEOMETRY: t_geo.Geometry,
+    }
+    """`db.models.types` class by MySQL field type, used by the decode plans"""
+
+    decode: bool = True
+    """
+    Decode the text results of the pure Python connector with a plan compiled
+    per result (see `Decoder`) instead of its generic converter. The C extension,
+    used when it is installed, already converts in C.
+    """
+
+    decode_types: 'dict[str, type|Any]' = {}
+    """
+    Column name to `db.models.types` class or instance, for the values the
+    description does not tell apart, like `{'ip': string.INET6, 'doc': string.JSON}`.
+    Applied with the C extension too.
+    """
+
+    row_alias: bool = True
+    """Use the row alias (MySQL 8.0.19+) instead of `VALUES()` in `ON DUPLICATE KEY UPDATE`"""
+
+    prepared: int = 0
+    """Size of the LRU cache of server-side prepared statements per connection. `0` disables it."""
+
+    __max_packet: 'int|None' = None
+
+    charsets = {
+        'utf8mb4': 'utf-8',
+        'utf8mb3': 'utf-8',
+        'utf8': 'utf-8',
+        'latin1': 'cp1252',
+        'latin2': 'iso8859-2',
+        'ascii': 'ascii',
+        'cp1250': 'cp1250',
+        'cp1251': 'cp1251',
+        'cp1256': 'cp1256',
+        'cp1257': 'cp1257',
+        'greek': 'iso8859-7',
+        'hebrew': 'iso8859-8',
+        'latin5': 'iso8859-9',
+        'latin7': 'iso8859-13',
+        'koi8r': 'koi8-r',
+        'koi8u': 'koi8-u',
+        'sjis': 'shift_jis',
+        'cp932': 'cp932',
+        'ujis': 'euc_jp',
+        'gbk': 'gbk',
+        'gb18030': 'gb18030',
+        'big5': 'big5',
+        'euckr': 'euc_kr',
+    }
+    """Python codec of each character set `load_stream` accepts (`LOAD DATA` rejects the UTF-16/32 ones)."""
+
+    __database: 'str|None' = None
+    """Database of the DSN, restored before a pooled connection is reused."""
+
+    __infile: tuple = (None, None)
+    """`allow_local_infile` and `allow_local_infile_in_path` of the DSN, both unset by default."""
+
     def _check_config(self, cfg: dict) -> dict:
         if 'host' not in cfg:
             self.fatal_error('Host connection config required')
@@ -37,6 +152,8 @@ class MySQL(Main):
         for i in cfg:
             if i in self.default and cfg[i] is not None:
                 arr[i] = cfg[i]
+        self.__database = arr.get('database')
+        self.__infile = (arr.get('allow_local_infile'), arr.get('allow_local_infile_in_path'))
         return arr
 
     def connect(self, config: dict) -> 'MySQLConnection|None':
@@ -65,6 +182,35 @@ class MySQL(Main):
             else:
                 self.show(f"Erro: {e}")
 
+    def ping(self, conn: 'MySQLConnection') -> bool:
+        try:
+            conn.ping(reconnect=False)
+            return True
+        except Error:
+            return False
+
+    def reset(self, conn: 'MySQLConnection') -> bool:
+        # ends the open transaction, so the next user does not read an old snapshot
+        try:
+            conn.rollback()
+        except Error:
+            pass
+        # the pool is keyed by the DSN, so a `USE` of `select_db` must not outlive this user
+        if conn.database == self.__database:
+            return True
+        if not self.__database:
+            # a connection cannot leave a database, only be closed
+            return False
+        try:
+            conn.database = self.__database
+        except Error:
+            return False
+        # statements prepared after `select_db` still resolve their tables in that database
+        cache = Statements.caches.get(conn)
+        if cache is not None:
+            cache.clear()
+        return True
+
     def select_db(self, db: str) -> bool:
         out = False
         conn: 'MySQLConnection|None' = self.conn
@@ -74,6 +220,8 @@ class MySQL(Main):
                 cursor.execute(f"USE {db}")
                 conn.database = db
                 out = True
+                if self.prepared:
+                    self.statements.clear()
             except mysql.connector.Error as e:
                 self.error = e
                 self.show(f"Erro ao executar a inserção: {e}")
@@ -81,18 +229,100 @@ class MySQL(Main):
                 cursor.close()
         return out
 
-    def query(self, sql: str, param: 'tuple|list|dict' = []) -> Iterator[tuple]:
+    def _fetch(self, sql: str, param: 'tuple|list|dict' = [], size: int = None) -> 'Iterator[list[tuple]]':
         conn: 'MySQLConnection|None' = self.conn
-        if conn:
-            self.showSQL(sql, param)
-            cursor = conn.cursor(dictionary=True)
-            cursor.execute(sql, param)
-            # results = cursor.fetchall()
+        if not conn:
+            return
+        self.show_sql(sql, param)
+        # the plan needs the raw values of the text protocol, not the binary one of prepared statements
+        raw = self.decode and not self.prepared and isinstance(conn, MySQLConnection)
+        cursor, owned = self.__execute(conn, sql, param, self.stream, raw)
+        try:
+            self.description = cursor.description
+            if not self.description:
+                return
+            decode = self.decoder(conn, self.description, raw)
+            size = size or self.batch_size
+            while True:
+                rows = cursor.fetchmany(size)
+                if not rows:
+                    break
+                yield decode(rows) if decode else rows
+        finally:
+            # an abandoned unbuffered result must be drained before the connection is reused
+            if conn.unread_result:
+                if owned:
+                    conn.consume_results()
+                else:
+                    cursor.fetchall()
+            if owned:
+                cursor.close()
+
+    @property
+    def statements(self) -> 'Statements|None':
+        """Prepared statement cache of the connection, or None if `prepared` is disabled."""
+        conn = self.conn
+        if conn and self.prepared:
+            return Statements.of(conn, self.prepared)
+        return None
+
+    def decoder(self, conn: 'MySQLConnection', description: list, raw: bool = True) -> 'Decoder|None':
+        """
+        Decode plan of a result.
 
-            for row in cursor:  # type: ignore
-                yield row
+        Args:
+            conn (MySQLConnection): Connection of the result.
+            description (list): Cursor description.
+            raw (bool, optional): The rows hold the raw bytes of the text protocol. Defaults to True.
+
+        Returns:
+            Decoder|None: None if there is nothing to decode.
+        """
+        if not raw:
+            if not self.decode_types:
+                return None
+            types = [self.decode_types.get(d[0]) for d in description]
+            return Decoder(types) if any(types) else None
+        types = []
+        for d in description:
+            if d[0] in self.decode_types:
+                types.append(self.decode_types[d[0]])
+            elif d[7] & FieldFlag.SET:
+                types.append(t_string.Set)
+            else:
+                type_ = self.field_types.get(d[1])
+                if type_ and issubclass(type_, t_string.Char) and len(d) > 8 and d[8] == 63:
+                    # binary charset
+                    type_ = t_string.Bin
+                types.append(type_)
+        return Decoder(types, conn.python_charset, [lambda v, d=d: conn.converter.to_python(d, v) for d in description])
 
+    def __execute(self, conn: 'MySQLConnection', sql: str, param: 'tuple|list|dict' = [], stream: bool = False, raw: bool = False):
+        """
+        Execute a statement on a cached prepared cursor or on a new cursor.
+
+        Returns:
+            tuple: The cursor and whether the caller owns (must close) it.
+        """
+        if self.prepared:
+            return Statements.of(conn, self.prepared).execute(sql, param), False
+        cursor = conn.cursor(buffered=False, raw=raw or None) if stream else conn.cursor(raw=raw or None)
+        try:
+            cursor.execute(sql, param)
+        except BaseException:
             cursor.close()
+            raise
+        return cursor, True
+
+    def _dtype(self, column: tuple) -> str:
+        dtype = self.dtypes.get(column[1], 'O')
+        if dtype == 'int64' and len(column) > 7 and column[7] & FieldFlag.UNSIGNED:
+            return 'uint64'
+        return dtype
+
+    def query(self, sql: str, param: 'tuple|list|dict' = []) -> Iterator[dict]:
+        for batch in self.query_batches(sql, param):
+            yield from batch
 
     def exec(self, sql: 'str|list|tuple', param: 'tuple|list|dict' = []) -> 'bool|list':
         isok = False
@@ -100,52 +330,218 @@ class MySQL(Main):
         if not conn:
             return isok
         if type(sql) == str:
-            cursor = conn.cursor()
+            cursor, owned = None, False
+            event = self._before('exec', sql, param) if self.hooks else None
             try:
-                self.showSQL(sql, param)
-                cursor.execute(sql, param)
-                conn.commit()
+                self.show_sql(sql, param)
+                cursor, owned = self.__execute(conn, sql, param)
+                self._commit()
                 isok = True
+                self._written(sql)
             except Error as e:
                 self.error = e
                 self.show(f"Erro ao executar a inserção: {e}")
-            if cursor:
+            if event:
+                self._after(event, cursor.rowcount if isok else 0, error=None if isok else self.error)
+            if cursor and owned:
                 cursor.close()
         else:
-            isok = [self.queryExec(i, param) for i in sql]
+            result = self.script(sql, param)
+            isok = [True] * len(result) + ([False] if result.error else [])
         return isok
 
-    def many(self, tbl: str, data: 'list[dict]', config: dict = {}):
-        if not data or not self.conn:
+    def script(self, sql: 'str|list|tuple', param: 'tuple|list|dict' = [], atomic: bool = True) -> ScriptResult:
+        """
+        Execute a script or a list of statements in one round trip.
+
+        The statements are sent together as a multi-statement query and their
+        results are read in order, so the latency of the link is paid once
+        instead of once per statement. The server stops at the first failing
+        statement, reported in `index`.
+
+        See Also: Main.script
+        """
+        script = Script(sql, param)
+        result = ScriptResult(script.statements)
+        conn: 'MySQLConnection|None' = self.conn
+        if not conn or not script:
+            return result.stop()
+        with self.transaction() if atomic else nullcontext():
+            self.show_sql(script.text, script.params)
+            event = self._before('exec', script.text, script.params) if self.hooks else None
+            cursor = conn.cursor()
+            try:
+                # bound here: the connector would also fill the `%s` inside the literals
+                sql = script.bind(self.literals(conn, script.params), conn.python_charset) if script.params else script.text
+                for rowcount, rows in self.__results(cursor, sql):
+                    result.add(rowcount, rows)
+            except Error as e:
+                result.fail(e)
+                self.error = e
+                self.show(f"Erro ao executar a inserção: {e}")
+            finally:
+                if conn.unread_result:
+                    conn.consume_results()
+                cursor.close()
+            if result or not atomic:
+                self._commit()
+            if len(result):
+                self._written(script.text)
+            if event:
+                self._after(event, sum(max(r, 0) for r in result.rowcounts), error=result.error)
+        return result.stop()
+
+    @staticmethod
+    def literals(conn: 'MySQLConnection', values: 'tuple|list') -> 'list[bytes]':
+        """Values as the quoted and escaped SQL literals the connector substitutes for `%s`."""
+        if not values:
+            return []
+        if hasattr(conn, 'prepare_for_mysql'):
+            # C extension
+            return list(conn.prepare_for_mysql(tuple(values)))
+        converter = conn.converter
+        return [converter.quote(converter.escape(converter.to_mysql(v), conn.sql_mode)) for v in values]
+
+    @staticmethod
+    def __results(cursor: Any, sql: 'str|bytes') -> 'Iterator[tuple[int, list|None]]':
+        """Rows affected and rows read of each statement of a multi-statement query."""
+        if 'map_results' in inspect.signature(cursor.execute).parameters:
+            # Connector/Python 9.2+
+            cursor.execute(sql, None, map_results=True)
+            while True:
+                rows = cursor.fetchall() if cursor.description else None
+                yield cursor.rowcount, rows
+                if not cursor.nextset():
+                    break
+        else:
+            for result in cursor.execute(sql, None, multi=True):
+                yield result.rowcount, result.fetchall() if result.with_rows else None
+
+    def many(self, tbl: str, data: 'Iterable[dict]', config: dict = {}) -> 'BulkResult|None':
+        conn: 'MySQLConnection|None' = self.conn
+        if not data or not conn:
             return
-        self.show({'tbl': tbl, 'data': data, 'config': config})
-        isok = False
-        default = {
-            'command': 'INSERT',
+        config = {
+            'max_packet': self.max_allowed_packet,
+            'row_alias': self.row_alias,
+            'commit': 1,
+            # a prepared statement takes at most 65535 placeholders
+            'max_params': 65535 if self.prepared else None,
+            **config,
         }
-        config = {**default, **config}
-        # print(data[0])
-        keys = [k.replace(' ', '_') if k else '' for k in data[0].keys()]
-        columns = '`, `'.join(keys)
-        # print(keys)
-        # print(columns)
-        placeholders = ', '.join(['%s'] * len(data[0]))
-        sql = \
-            config['command']+' ' +\
-            tbl+' (`'+columns+'`) ' +\
-            'VALUES ('+placeholders+')'
-        # print(sql)
-
-        # Extraindo os valores dos dicionários
-        values = [tuple(d.values()) for d in data]
-        cursor = self.conn.cursor()
+        self.show({'tbl': tbl, 'config': config})
+        result = BulkResult()
+        commit_every = config['commit']
+        for sql, values, count in Bulk(tbl, data, config):
+            result.batches += 1
+            event = self._before('many', sql) if self.hooks else None
+            try:
+                cursor, owned = self.__execute(conn, sql, values)
+                if owned:
+                    cursor.close()
+                result.rows += count
+                if event:
+                    self._after(event, count)
+            except Error as e:
+                self.error = e
+                self.show(f"Erro ao executar a inserção: {e}")
+                result.errors.append({
+                    'batch': result.batches,
+                    'rows': count,
+                    'error': e,
+                })
+                if event:
+                    self._after(event, error=e)
+            if commit_every and result.batches % commit_every == 0:
+                result.commits += self._commit()
+        if not commit_every or result.batches % commit_every:
+            result.commits += self._commit()
+        self._written(tbl)
+        return result.stop()
+
+    def load_stream(self, table: str, rows: 'Iterable[Any]', columns: 'list[str]', config: dict = {}) -> 'int|bool':
+        """
+        Load rows with `LOAD DATA LOCAL INFILE` over the current connection.
+
+        The rows are serialized by `Infile` into a named pipe that the connector
+        sends to the server while they are produced. The server must have
+        `local_infile` enabled, and the client side is opt-in: the DSN must set
+        `allow_local_infile_in_path` to the directory of the pipes (preferred, it
+        only allows that directory) or `allow_local_infile`.
+
+        Args:
+            table (str): Target table name.
+            rows (Iterable): Rows as sequences in column order or dictionaries.
+            columns (list[str]): Column names of the table, in the order of the rows.
+            config (dict, optional):
+                - command (str): `IGNORE` or `REPLACE` for duplicated keys. Defaults to error.
+                - charset (str): Character set of the stream, one of `charsets`. Defaults to 'utf8mb4'.
+                - set (str): `SET` clause applied to the loaded row.
+
+        Returns:
+            int|bool: Rows loaded, or False if the load failed.
+        """
+        conn: 'MySQLConnection|None' = self.conn
+        if not conn:
+            return False
+        command = config.get('command', '').upper()
+        if command not in ('', 'IGNORE', 'REPLACE'):
+            self.fatal_error(f'Unsupported load command: {command}')
+        charset = config.get('charset', 'utf8mb4')
+        if charset.lower() not in self.charsets:
+            self.fatal_error(f'Unsupported load charset: {charset}')
+        allow, path = self.__infile
+        if not allow and not path:
+            self.error = ValueError('LOAD DATA LOCAL is disabled, set allow_local_infile_in_path in the DSN')
+            self.show(f"Erro ao executar a inserção: {self.error}")
+            return False
+        cols = '`, `'.join(c.replace(' ', '_') for c in columns)
+        # a failed load rolls back, which must not take the grouped writes with it
+        self.flush()
+        cursor = conn.cursor()
+        out = False
+        event = None
         try:
-            cursor.executemany(sql, values)
-            self.conn.commit()
-            isok = True
+            with Infile(rows, columns, dir=path, encoding=self.charsets[charset.lower()]) as f:
+                sql = \
+                    f"LOAD DATA LOCAL INFILE '{f.path}' {command} " +\
+                    f"INTO TABLE {table} " +\
+                    f"CHARACTER SET {charset} " +\
+                    "FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\' " +\
+                    "LINES TERMINATED BY '\\n' " +\
+                    f"(`{cols}`)" +\
+                    (f" SET {config['set']}" if config.get('set') else '')
+                self.show_sql(sql)
+                event = self._before('load', sql) if self.hooks else None
+                cursor.execute(sql)
+            if event:
+                self._after(event, cursor.rowcount, error=f.error)
+                event = None
+            if f.error:
+                # the pipe was closed early, so the server loaded a partial stream
+                if not self.in_transaction:
+                    conn.rollback()
+                self.error = f.error
+                self.show(f"Erro ao executar a inserção: {f.error}")
+            else:
+                self._commit()
+                out = cursor.rowcount
+                self._written(table)
         except Error as e:
+            # inside a transaction the failure (error) rolls back the block
+            if not self.in_transaction:
+                conn.rollback()
             self.error = e
             self.show(f"Erro ao executar a inserção: {e}")
-        if cursor:
+            if event:
+                self._after(event, error=e)
+        finally:
             cursor.close()
-        return isok
+        return out
+
+    @property
+    def max_allowed_packet(self) -> int:
+        """Server `max_allowed_packet`, read once per connection."""
+        if self.__max_packet is None:
+            self.__max_packet = int(self.value('SELECT @@max_allowed_packet') or Bulk.default['max_packet'])
+        return self.__max_packet
@@ -0,0 +1,241 @@
+import base64
+import datetime
+import json
+from decimal import Decimal
+from typing import Any, Iterator
+from .models import Table
+from .models.keys import Key
+from .record import Record
+
+
+class Page:
+    """Rows of a page and the cursors of its neighbours."""
+
+    def __init__(self, rows: list, next: 'str|None' = None, prev: 'str|None' = None) -> None:
+        self.rows: list = rows
+        self.next: 'str|None' = next
+        """Cursor of the next page, None on the last one."""
+        self.prev: 'str|None' = prev
+        """Cursor of the previous page, None on the first one."""
+
+    def __iter__(self) -> Iterator:
+        return iter(self.rows)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(rows={len(self.rows)}, next={self.next is not None}, prev={self.prev is not None})'
+
+
+class Pager:
+    """
+    Keyset (seek) pagination of a table, for grids over big tables.
+
+    A page is read with `WHERE key > last key of the page ORDER BY key LIMIT n`
+    on the primary key or a unique key, so the server seeks in the index
+    instead of reading and discarding `OFFSET` rows: page 10000 costs the same
+    as page 1. The cursors hold the key of the first and the last row of a
+    page, not a position, so inserts and deletes between two requests neither
+    repeat nor skip rows of the pages around them.
+
+    Examples:
+        ```python
+        pager = Pager(db, Orders, size=100)
+        page = pager.page()
+        page = pager.page(page.next)
+        page = pager.page(page.prev)
+        last = pager.last()
+        ```
+    """
+
+    def __init__(self,
+                 db,
+                 table: 'type[Table]|str',
+                 key: 'str|list[str]' = None,
+                 size: int = 50,
+                 columns: 'str|list[str]' = '*',
+                 where: str = None,
+                 param: 'tuple|list' = [],
+                 desc: bool = False,
+                 ) -> None:
+        """
+        Args:
+            db (Main): Open connection.
+            table (type[Table]|str): Table model, or table name with `key`.
+            key (str|list[str], optional): Key name of the model, or key columns. Defaults to the
+                primary key, else the first unique key of `NOT NULL` columns.
+            size (int, optional): Rows per page. Defaults to 50.
+            columns (str|list[str], optional): Select list, the key columns are added to a list. Defaults to '*'.
+            where (str, optional): Extra filter with `%s` placeholders. Defaults to None.
+            param (tuple|list, optional): Parameters of `where`. Defaults to empty list.
+            desc (bool, optional): Pages in descending key order. Defaults to False.
+
+        Raises:
+            LookupError: If there is no usable key.
+        """
+        self.db = db
+        self.size: int = max(1, size)
+        self.where: 'str|None' = where
+        self.param: list = list(param)
+        self.desc: bool = desc
+        if isinstance(table, str):
+            self.table: str = table
+            if not key:
+                raise LookupError(f'{table}: pass the key columns')
+            self.key: 'list[str]' = [key] if isinstance(key, str) else list(key)
+        else:
+            self.table = f'`{table.db.name}`.`{table.name}`' if table.db and table.db.name else f'`{table.name}`'
+            self.key = self.find_key(table, key)
+        if isinstance(columns, str):
+            self.columns: str = columns
+        else:
+            self.columns = ', '.join(f'`{c}`' for c in [*columns, *(k for k in self.key if k not in columns)])
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({self.table!r}, key={self.key!r}, size={self.size})'
+
+    @staticmethod
+    def find_key(table: 'type[Table]', name: str = None) -> 'list[str]':
+        """
+        Columns of a key of the model that identifies one row.
+
+        Args:
+            table (type[Table]): Table model.
+            name (str, optional): Key name. Defaults to the primary key, else the first
+                unique key whose columns are all `NOT NULL` and not prefixes.
+
+        Raises:
+            LookupError: If there is no such key.
+        """
+        keys = {k: v for k, v in vars(table.keys).items() if isinstance(v, Key)}
+        if name:
+            if name not in keys:
+                raise LookupError(f'{table.name}: no key {name}')
+            return list(keys[name].columns)
+        fields = vars(table.fields)
+        candidates = [k for k in keys.values() if k.primary] + [
+            k for k in keys.values()
+            if k.unique and not k.primary and all(
+                '(' not in c and getattr(fields.get(c), 'not_null', False) for c in k.columns
+            )
+        ]
+        if not candidates:
+            raise LookupError(f'{table.name}: no primary or unique key, pass key=')
+        return list(candidates[0].columns)
+
+    def page(self, cursor: str = None) -> Page:
+        """
+        Page after or before a cursor.
+
+        Args:
+            cursor (str, optional): `next` or `prev` of a page. Defaults to the first page.
+
+        Returns:
+            Page: Rows in key order.
+        """
+        if cursor is None:
+            return self.__read(None, True)
+        data = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return self.__read([self.__load(v) for v in data['k']], data['d'] == 'n')
+
+    def first(self) -> Page:
+        """First page."""
+        return self.__read(None, True)
+
+    def last(self) -> Page:
+        """Last page, with `size` rows if the table has as many."""
+        return self.__read(None, False)
+
+    def seek_sql(self, values: 'list|None', forward: bool = True) -> 'tuple[str, list]':
+        """
+        Statement that reads `size + 1` rows after (or before) a key.
+
+        The comparison of a composite key `(a, b) > (x, y)` is expanded as
+        `a >= x AND (a > x OR (a = x AND b > y))`, which every server turns
+        into an index range.
+
+        Args:
+            values (list|None): Key values to start from, None for an end of the table.
+            forward (bool, optional): Read in the order of the pages. Defaults to True.
+
+        Returns:
+            tuple[str, list]: SQL and parameters.
+        """
+        ascending = forward != self.desc
+        cond = []
+        param = []
+        if values is not None:
+            op = '>' if ascending else '<'
+            first = f'`{self.key[0]}` {op}= %s' if len(self.key) > 1 else None
+            terms = []
+            for i in range(len(self.key)):
+                eq = ' AND '.join(f'`{c}` = %s' for c in self.key[:i])
+                terms.append(f'({eq} AND `{self.key[i]}` {op} %s)' if eq else f'`{self.key[i]}` {op} %s')
+                param.extend(values[:i + 1])
+            if first:
+                cond.append(f"{first} AND ({' OR '.join(terms)})")
+                param.insert(0, values[0])
+            else:
+                cond.append(terms[0])
+        if self.where:
+            cond.append(f'({self.where})')
+            param.extend(self.param)
+        where = ' WHERE ' + ' AND '.join(cond) if cond else ''
+        order = ', '.join(f"`{c}` {'ASC' if ascending else 'DESC'}" for c in self.key)
+        return f'SELECT {self.columns} FROM {self.table}{where} ORDER BY {order} LIMIT {self.size + 1}', param
+
+    def __read(self, values: 'list|None', forward: bool) -> Page:
+        sql, param = self.seek_sql(values, forward)
+        rows = self.db.all(sql, param)
+        more = len(rows) > self.size
+        rows = rows[:self.size]
+        if not forward:
+            rows.reverse()
+        if not rows:
+            return Page([])
+        names = [d[0] for d in self.db.description or []]
+        first, last = self.__key(rows[0], names), self.__key(rows[-1], names)
+        # a page read from a cursor has a neighbour on the side it came from
+        after = more if forward else values is not None
+        before = values is not None if forward else more
+        return Page(
+            rows,
+            self.__cursor('n', last) if after else None,
+            self.__cursor('p', first) if before else None,
+        )
+
+    def __key(self, row: Any, names: 'list[str]') -> list:
+        if isinstance(row, (dict, Record)):
+            return [row[c] for c in self.key]
+        return [row[names.index(c)] for c in self.key]
+
+    @classmethod
+    def __cursor(cls, direction: str, values: list) -> str:
+        data = json.dumps({'d': direction, 'k': [cls.__dump(v) for v in values]}, separators=(',', ':'))
+        return base64.urlsafe_b64encode(data.encode()).decode()
+
+    @staticmethod
+    def __dump(value: Any) -> Any:
+        # keep the type of the key, a string would not compare the same way
+        if isinstance(value, datetime.datetime):
+            return {'dt': value.isoformat()}
+        if isinstance(value, datetime.date):
+            return {'d': value.isoformat()}
+        if isinstance(value, Decimal):
+            return {'dec': str(value)}
+        if isinstance(value, (bytes, bytearray)):
+            return {'b': base64.b64encode(value).decode()}
+        return value
+
+    @staticmethod
+    def __load(value: Any) -> Any:
+        if not isinstance(value, dict):
+            return value
+        if 'dt' in value:
+            return datetime.datetime.fromisoformat(value['dt'])
+        if 'd' in value:
+            return datetime.date.fromisoformat(value['d'])
+        if 'dec' in value:
+            return Decimal(value['dec'])
+        return base64.b64decode(value['b'])
@@ -0,0 +1,258 @@
+import time
+import hashlib
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator
+
+
+class Pool:
+    """
+    Connection pool keyed by the resolved DSN.
+
+    Keeps up to `max_size` open connections per DSN and reuses idle ones
+    instead of paying the TCP and authentication handshakes on every
+    `db.conn.connect()`. Idle connections are validated on checkout and
+    evicted after `idle_timeout` seconds, always keeping `min_size` open.
+
+    Examples:
+        ```python
+        pool = Pool.get(Pool.key(config), max_size=5)
+        with pool.connection(lambda: mysql.connector.connect(**config)) as conn:
+            ...
+        ```
+    """
+
+    pools: 'dict[str, Pool]' = {}
+    """Registry of pools by DSN key."""
+
+    __lock = threading.Lock()
+    """Lock that protects the registry."""
+
+    def __init__(self,
+                 min_size: int = 0,
+                 max_size: int = 10,
+                 idle_timeout: float = 300,
+                 timeout: float = 30,
+                 ) -> None:
+        """
+        Initialize a connection pool.
+
+        Args:
+            min_size (int, optional): Connections kept open even when idle. Defaults to 0.
+            max_size (int, optional): Maximum open connections (idle + in use). Defaults to 10.
+            idle_timeout (float, optional): Seconds before an idle connection is closed. Defaults to 300.
+            timeout (float, optional): Seconds to wait for a free connection. Defaults to 30.
+        """
+        self.min_size: int = min_size
+        self.max_size: int = max(max_size, 1)
+        self.idle_timeout: float = idle_timeout
+        self.timeout: float = timeout
+        self.__idle: deque = deque()
+        """Idle connections as `(conn, last_used)`, oldest first."""
+        self.__size: int = 0
+        """Open connections, idle and in use."""
+        self.__cond = threading.Condition()
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(size={self.size}, idle={self.idle}, max_size={self.max_size})'
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def size(self) -> int:
+        """Number of open connections, idle and in use."""
+        return self.__size
+
+    @property
+    def idle(self) -> int:
+        """Number of idle connections."""
+        return len(self.__idle)
+
+    @classmethod
+    def get(cls, key: str, **options) -> 'Pool':
+        """
+        Get the pool of a DSN key, creating it on first use.
+
+        Args:
+            key (str): DSN key, see `key()`.
+            **options: Options of a new pool (`min_size`, `max_size`, `idle_timeout`, `timeout`).
+
+        Returns:
+            Pool: The shared pool of the key.
+        """
+        with cls.__lock:
+            pool = cls.pools.get(key)
+            if pool is None:
+                pool = cls.pools[key] = cls(**options)
+        return pool
+
+    @staticmethod
+    def key(config: dict) -> str:
+        """
+        Build a stable key for a resolved connection configuration.
+
+        The key is a hash, so credentials are not kept in clear text in the registry.
+
+        Args:
+            config (dict): Connection configuration.
+
+        Returns:
+            str: Hexadecimal digest of the configuration.
+        """
+        items = sorted((str(k), repr(v)) for k, v in config.items())
+        return hashlib.sha256(repr(items).encode()).hexdigest()
+
+    @classmethod
+    def close_all(cls):
+        """Close the idle connections of every pool and empty the registry."""
+        with cls.__lock:
+            pools = list(cls.pools.values())
+            cls.pools.clear()
+        for pool in pools:
+            pool.clear()
+
+    def acquire(self,
+                connect: 'Callable[[], Any]',
+                ping: 'Callable[[Any], bool]' = None,
+                timeout: float = None,
+                ) -> Any:
+        """
+        Check out a connection, opening a new one if none is idle.
+
+        Args:
+            connect (Callable): Opens a new connection. May return None on failure.
+            ping (Callable, optional): Validates an idle connection before returning it.
+            timeout (float, optional): Seconds to wait for a free connection. Defaults to `self.timeout`.
+
+        Returns:
+            Any: A connection or None if `connect` failed.
+
+        Raises:
+            TimeoutError: If `max_size` connections are in use for longer than `timeout`.
+        """
+        if self.__size < self.min_size:
+            self.fill(connect)
+        deadline = time.monotonic() + (self.timeout if timeout is None else timeout)
+        while True:
+            conn = None
+            with self.__cond:
+                self.__evict()
+                if self.__idle:
+                    conn = self.__idle.pop()[0]
+                elif self.__size < self.max_size:
+                    self.__size += 1
+                else:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise TimeoutError(f'No free connection in {self!r}')
+                    self.__cond.wait(remaining)
+                    continue
+            if conn is None:
+                return self.__open(connect)
+            if not ping or ping(conn):
+                return conn
+            self.discard(conn)
+
+    def release(self, conn: Any):
+        """
+        Give a connection back to the pool.
+
+        Args:
+            conn (Any): Connection obtained by `acquire()`.
+        """
+        if conn is None:
+            return
+        with self.__cond:
+            self.__idle.append((conn, time.monotonic()))
+            self.__evict()
+            self.__cond.notify()
+
+    def discard(self, conn: Any):
+        """
+        Close a checked out connection and free its slot.
+
+        Args:
+            conn (Any): Connection obtained by `acquire()`.
+        """
+        self.__close(conn)
+        with self.__cond:
+            self.__size -= 1
+            self.__cond.notify()
+
+    @contextmanager
+    def connection(self,
+                   connect: 'Callable[[], Any]',
+                   ping: 'Callable[[Any], bool]' = None,
+                   ) -> 'Iterator[Any]':
+        """
+        Check out a connection for the `with` block and give it back at the end.
+
+        Args:
+            connect (Callable): Opens a new connection.
+            ping (Callable, optional): Validates an idle connection before returning it.
+
+        Yields:
+            Any: A connection or None if `connect` failed.
+        """
+        conn = self.acquire(connect, ping)
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def fill(self, connect: 'Callable[[], Any]'):
+        """
+        Open idle connections until `min_size` is reached.
+
+        Args:
+            connect (Callable): Opens a new connection.
+        """
+        while True:
+            with self.__cond:
+                if self.__size >= self.min_size:
+                    return
+                self.__size += 1
+            conn = self.__open(connect)
+            if conn is None:
+                return
+            self.release(conn)
+
+    def clear(self):
+        """Close every idle connection."""
+        with self.__cond:
+            idle = [conn for conn, _ in self.__idle]
+            self.__idle.clear()
+            self.__size -= len(idle)
+            self.__cond.notify_all()
+        for conn in idle:
+            self.__close(conn)
+
+    def __open(self, connect: 'Callable[[], Any]') -> Any:
+        """Open a connection on a slot already reserved in `__size`."""
+        try:
+            conn = connect()
+        except BaseException:
+            conn = None
+            raise
+        finally:
+            if conn is None:
+                with self.__cond:
+                    self.__size -= 1
+                    self.__cond.notify()
+        return conn
+
+    def __evict(self):
+        """Close idle connections past `idle_timeout`, keeping `min_size` open. Caller holds the lock."""
+        limit = time.monotonic() - self.idle_timeout
+        while self.__idle and self.__size > self.min_size and self.__idle[0][1] < limit:
+            self.__close(self.__idle.popleft()[0])
+            self.__size -= 1
+
+    @staticmethod
+    def __close(conn: Any):
+        try:
+            conn.close()
+        except Exception:
+            pass
@@ -0,0 +1,87 @@
+from functools import lru_cache
+from typing import Any, Iterator
+
+
+class Record(tuple):
+    """
+    Lightweight row: a tuple that also allows access by column name.
+
+    Every row of a result shares one class created by `schema()`, which holds
+    the column-index map, so a row costs the same memory as a plain tuple
+    instead of a dict that repeats every key.
+
+    Examples:
+        ```python
+        Row = Record.schema(['id', 'name'])
+        row = Row((1, 'Alice'))
+        print(row[0], row['name'], row.name)
+        ```
+
+    Notes:
+        - Attribute access is shadowed by tuple methods (`count`, `index`);
+          item access by name always works.
+    """
+    __slots__ = ()
+
+    _fields: 'tuple[str, ...]' = ()
+    """Column names, in order."""
+
+    _index: 'dict[str, int]' = {}
+    """Column name to position."""
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return tuple.__getitem__(self, self._index[key])
+        return tuple.__getitem__(self, key)
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return tuple.__getitem__(self, self._index[name])
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __repr__(self) -> str:
+        return f'Record({", ".join(f"{k}={v!r}" for k, v in zip(self._fields, self))})'
+
+    def keys(self) -> 'tuple[str, ...]':
+        """Column names, like `dict.keys()`."""
+        return self._fields
+
+    def values(self) -> tuple:
+        """Column values, like `dict.values()`."""
+        return tuple(self)
+
+    def items(self) -> 'Iterator[tuple[str, Any]]':
+        """Pairs of column name and value, like `dict.items()`."""
+        return zip(self._fields, self)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Value of a column or `default` if the column does not exist."""
+        i = self._index.get(key)
+        return default if i is None else tuple.__getitem__(self, i)
+
+    def as_dict(self) -> dict:
+        """Row converted to a dictionary."""
+        return dict(zip(self._fields, self))
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def __schema(fields: 'tuple[str, ...]') -> 'type[Record]':
+        return type('Record', (Record,), {
+            '__slots__': (),
+            '_fields': fields,
+            '_index': {k: i for i, k in enumerate(fields)},
+        })
+
+    @classmethod
+    def schema(cls, fields: 'list[str]|tuple[str, ...]') -> 'type[Record]':
+        """
+        Record class shared by every row with these columns.
+
+        Args:
+            fields (list[str]|tuple[str, ...]): Column names, in order.
+
+        Returns:
+            type[Record]: Cached subclass bound to the column-index map.
+        """
+        return cls.__schema(tuple(fields))
@@ -0,0 +1,367 @@
+import inspect
+import re
+from functools import lru_cache
+from typing import Any, Iterator
+from .models import Db, Table
+from .models.keys import Key
+from .models.foreignKey import Reference
+from .models.partitions import Partition
+from .models.types import main as t_main, number, string, time, geo
+
+
+class Reverse:
+    """
+    Reverse engineering of whole schemas from `information_schema`.
+
+    Every view is read once for all the tables of the schemas, ordered by
+    table, instead of one `SHOW CREATE TABLE` per table, so a schema with
+    thousands of tables costs a handful of round trips. The rows are mapped
+    onto `Table` subclasses whose `fields` hold `db.models.types` instances.
+
+    Examples:
+        ```python
+        rev = Reverse(connect('warehouse'), ['sales', 'stock'])
+        for schema, tables in rev.run().items():
+            for name, table in tables.items():
+                print(schema, name, vars(table.fields))
+        ```
+    """
+
+    views = ('SCHEMATA', 'TABLES', 'COLUMNS', 'STATISTICS', 'KEY_COLUMN_USAGE', 'PARTITIONS')
+    """Views read, one query each."""
+
+    types: 'dict[str, type[t_main.Type]]' = {
+        'tinyint': number.TinyInt,
+        'smallint': number.SmallInt,
+        'mediumint': number.MediumInt,
+        'int': number.Int,
+        'integer': number.Int,
+        'bigint': number.BigInt,
+        'bit': number.Bit,
+        'bool': number.Bool,
+        'boolean': number.Bool,
+        'decimal': number.Decimal,
+        'numeric': number.Decimal,
+        'float': number.Float,
+        'double': number.Double,
+        'real': number.Double,
+        'char': string.Char,
+        'varchar': string.VarChar,
+        'tinytext': string.TinyText,
+        'text': string.Text,
+        'mediumtext': string.MediumText,
+        'longtext': string.LongText,
+        'binary': string.Binary,
+        'varbinary': string.VarBinary,
+        'tinyblob': string.TinyBlob,
+        'blob': string.Blob,
+        'mediumblob': string.MediumBlob,
+        'longblob': string.LongBlob,
+        'enum': string.Enum,
+        'set': string.Set,
+        'json': string.JSON,
+        'uuid': string.UUID,
+        'inet4': string.INET4,
+        'inet6': string.INET6,
+        'date': time.Date,
+        'time': time.Time,
+        'datetime': time.DateTime,
+        'timestamp': time.TimeStamp,
+        'year': time.Year,
+        'point': geo.Point,
+        'linestring': geo.LineString,
+        'polygon': geo.Polygon,
+        'multipoint': geo.MultiPoint,
+        'multilinestring': geo.MultiLineString,
+        'multipolygon': geo.MultiPolygon,
+        'geometrycollection': geo.Geometrycollection,
+        'geomcollection': geo.Geometrycollection,
+        'geometry': geo.Geometry,
+    }
+    """`DATA_TYPE` to type class. Unknown types become `LongText`."""
+
+    re_values = re.compile(r"'((?:[^']|'')*)'")
+    """Quoted values of `enum(...)`/`set(...)`."""
+
+    re_on_update = re.compile(r'on update (\w+(?:\(\d*\))?)', re.I)
+
+    def __init__(self, db, schemas: 'str|list[str]' = None) -> None:
+        """
+        Args:
+            db (Main): Open connection.
+            schemas (str|list[str], optional): Schemas to read. Defaults to the current database.
+        """
+        self.db = db
+        self.schemas: 'list[str]' = [schemas] if isinstance(schemas, str) else list(schemas or [])
+        self.queries: int = 0
+        """Queries executed by `run()`."""
+        self.tables: 'dict[str, dict[str, type[Table]]]' = {}
+        """Schema name to table name to `Table` subclass."""
+        self.__only: 'list[tuple[str, str]]' = []
+
+    def run(self, only: 'list[tuple[str, str]]' = None) -> 'dict[str, dict[str, type[Table]]]':
+        """
+        Read the schemas and build their tables.
+
+        Args:
+            only (list[tuple[str, str]], optional): `(schema, table)` pairs to read
+                instead of every table of the schemas. Defaults to None.
+
+        Returns:
+            dict[str, dict[str, type[Table]]]: Schema name to table name to `Table` subclass.
+        """
+        self.queries = 0
+        self.__only = list(only or [])
+        dbs = self.__schemata()
+        found: 'dict[tuple[str, str], dict]' = {}
+        for row in self.__select('TABLES', '''
+            TABLE_SCHEMA, TABLE_NAME, ENGINE, TABLE_COLLATION, ROW_FORMAT, AVG_ROW_LENGTH,
+            CHECKSUM, CREATE_OPTIONS, TABLE_COMMENT
+        ''', "TABLE_TYPE IN ('BASE TABLE', 'SYSTEM VERSIONED')", 'TABLE_SCHEMA, TABLE_NAME'):
+            schema, name, engine, collate, row_format, avg, checksum, options, comment = row
+            options = (options or '').lower()
+            max_rows = re.search(r'max_rows=(\d+)', options)
+            found[(schema, name)] = {
+                'name': name,
+                'db': dbs.get(schema),
+                'engine': engine,
+                'collate': collate or '',
+                'row_format': row_format,
+                'avg_row_length': avg,
+                'checksum': bool(checksum) or 'checksum=1' in options,
+                'max_rows': int(max_rows[1]) if max_rows else None,
+                'comment': comment or None,
+                'fields': {},
+                'keys': {},
+                'foreignKey': {},
+                'partitions': {},
+            }
+        self.__columns(found)
+        self.__keys(found)
+        self.__references(found)
+        self.__partitions(found)
+
+        self.tables = {}
+        for (schema, name), arr in found.items():
+            self.tables.setdefault(schema, {})[name] = self.build(arr)
+        return self.tables
+
+    def __schemata(self) -> 'dict[str, Db]':
+        out = {}
+        for name, collate in self.__select('SCHEMATA', 'SCHEMA_NAME, DEFAULT_COLLATION_NAME', schema='SCHEMA_NAME', table=None):
+            db = Db()
+            db.name = name
+            db.collate = collate
+            out[name] = db
+        return out
+
+    def __columns(self, found: dict):
+        # GENERATION_EXPRESSION exists since MySQL 5.7 and MariaDB 10.2
+        for row in self.__select('COLUMNS', '''
+            TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, DATA_TYPE, COLUMN_TYPE, IS_NULLABLE, COLUMN_DEFAULT,
+            CHARACTER_MAXIMUM_LENGTH, NUMERIC_PRECISION, NUMERIC_SCALE, DATETIME_PRECISION,
+            COLLATION_NAME, EXTRA, COLUMN_COMMENT, GENERATION_EXPRESSION
+        ''', order='TABLE_SCHEMA, TABLE_NAME, ORDINAL_POSITION'):
+            table = found.get((row[0], row[1]))
+            if table is not None:
+                table['fields'][row[2]] = self.column(*row[3:])
+
+    def __keys(self, found: dict):
+        for schema, name, index, non_unique, column, sub_part, type_, comment in self.__select('STATISTICS', '''
+            TABLE_SCHEMA, TABLE_NAME, INDEX_NAME, NON_UNIQUE, COLUMN_NAME, SUB_PART, INDEX_TYPE, INDEX_COMMENT
+        ''', order='TABLE_SCHEMA, TABLE_NAME, INDEX_NAME, SEQ_IN_INDEX'):
+            table = found.get((schema, name))
+            if table is None or column is None:
+                continue
+            key = table['keys'].get(index)
+            if key is None:
+                key = table['keys'][index] = Key(
+                    [],
+                    primary=index == 'PRIMARY',
+                    unique=not int(non_unique),
+                    type=type_,
+                    comment=comment or None,
+                )
+            key.columns.append(f'{column}({sub_part})' if sub_part else column)
+
+    def __references(self, found: dict):
+        sql = f'''
+            SELECT k.TABLE_SCHEMA, k.TABLE_NAME, k.CONSTRAINT_NAME, k.COLUMN_NAME,
+                k.REFERENCED_TABLE_SCHEMA, k.REFERENCED_TABLE_NAME, k.REFERENCED_COLUMN_NAME,
+                r.UPDATE_RULE, r.DELETE_RULE
+            FROM information_schema.KEY_COLUMN_USAGE k
+            LEFT JOIN information_schema.REFERENTIAL_CONSTRAINTS r
+                ON r.CONSTRAINT_SCHEMA = k.CONSTRAINT_SCHEMA
+                AND r.CONSTRAINT_NAME = k.CONSTRAINT_NAME
+                AND r.TABLE_NAME = k.TABLE_NAME
+            WHERE k.REFERENCED_TABLE_NAME IS NOT NULL AND {{where}}
+            ORDER BY k.TABLE_SCHEMA, k.TABLE_NAME, k.CONSTRAINT_NAME, k.ORDINAL_POSITION
+        '''
+        where, param = self.where('k.TABLE_SCHEMA', 'k.TABLE_NAME')
+        for schema, name, constraint, column, ref_schema, ref_table, ref_column, on_update, on_delete in self.__rows(sql.replace('{where}', where), param):
+            table = found.get((schema, name))
+            if table is None:
+                continue
+            ref = table['foreignKey'].get(constraint)
+            if ref is None:
+                ref = table['foreignKey'][constraint] = Reference(
+                    [], ref_table, [],
+                    schema=ref_schema,
+                    on_update=on_update,
+                    on_delete=on_delete,
+                )
+            ref.columns.append(column)
+            ref.references.append(ref_column)
+
+    def __partitions(self, found: dict):
+        for row in self.__select('PARTITIONS', '''
+            TABLE_SCHEMA, TABLE_NAME, PARTITION_NAME, PARTITION_METHOD, PARTITION_EXPRESSION,
+            SUBPARTITION_METHOD, SUBPARTITION_EXPRESSION, PARTITION_DESCRIPTION, TABLE_ROWS, PARTITION_COMMENT
+        ''', 'PARTITION_NAME IS NOT NULL', 'TABLE_SCHEMA, TABLE_NAME, PARTITION_ORDINAL_POSITION, SUBPARTITION_ORDINAL_POSITION'):
+            schema, name, partition, method, expression, sub_method, sub_expression, description, rows, comment = row
+            table = found.get((schema, name))
+            if table is None:
+                continue
+            arr = table['partitions']
+            arr.update(method=method, expression=expression, subpartition_method=sub_method, subpartition_expression=sub_expression)
+            # subpartitions repeat the partition, their rows add up
+            part = arr.get(partition)
+            if isinstance(part, Partition):
+                part.rows = (part.rows or 0) + (rows or 0)
+            else:
+                arr[partition] = Partition(description, rows, comment or None)
+
+    @classmethod
+    def column(cls,
+               data_type: str,
+               column_type: str,
+               nullable: str,
+               default: Any,
+               char_length: int,
+               precision: int,
+               scale: int,
+               datetime_precision: int,
+               collate: str,
+               extra: str,
+               comment: str,
+               expression: str = None,
+               ) -> 't_main.Type':
+        """
+        Type instance of a row of `information_schema.COLUMNS`.
+
+        Returns:
+            Type: Instance of the class of `DATA_TYPE` in `types`.
+        """
+        data_type = (data_type or '').lower()
+        column_type = (column_type or '').lower()
+        extra = extra or ''
+        type_ = cls.types.get(data_type, string.LongText)
+        if data_type == 'tinyint' and column_type == 'tinyint(1)':
+            type_ = number.Bool
+        if isinstance(default, str):
+            if default == 'NULL':
+                default = None
+            elif len(default) > 1 and default[0] == default[-1] == "'":
+                # MariaDB quotes literal defaults
+                default = default[1:-1].replace("''", "'")
+        on_update = cls.re_on_update.search(extra)
+        arr = {
+            'not_null': nullable == 'NO',
+            'default': default,
+            'on_update': on_update[1] if on_update else None,
+            'comment': comment or None,
+            'collate': collate,
+            'expression': expression or None,
+            'virtual': 'VIRTUAL' in extra.upper(),
+            'auto_increment': 'auto_increment' in extra.lower(),
+            'unsigned': 'unsigned' in column_type,
+            'zero_fill': 'zerofill' in column_type,
+        }
+        if type_ in (string.Enum, string.Set):
+            arr['values'] = [v.replace("''", "'") for v in cls.re_values.findall(column_type)]
+        elif issubclass(type_, number.Decimal):
+            arr['length'] = precision
+            arr['decimals'] = scale or 0
+        elif issubclass(type_, number.Int):
+            display = re.search(r'\((\d+)\)', column_type)
+            arr['length'] = int(display[1]) if display else precision
+        elif issubclass(type_, string.Char):
+            arr['length'] = char_length
+        elif issubclass(type_, time.Time):
+            arr['length'] = arr['len'] = datetime_precision or 0
+        return type_(**{k: v for k, v in arr.items() if k in cls.__accepts(type_) and v is not None})
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def __accepts(type_: type) -> 'frozenset[str]':
+        """Keyword arguments of the constructor of a type class."""
+        if type_.__init__ is object.__init__:
+            return frozenset()
+        return frozenset(inspect.signature(type_.__init__).parameters) - {'self'}
+
+    @staticmethod
+    def build(arr: dict) -> 'type[Table]':
+        """
+        `Table` subclass of a table description.
+
+        Args:
+            arr (dict): Table attributes, and `fields`, `keys`, `foreignKey` and
+                `partitions` as name to object dicts.
+
+        Returns:
+            type[Table]: The table.
+        """
+        arr = dict(arr)
+        fields = arr.pop('fields')
+        keys = arr.pop('keys')
+        references = arr.pop('foreignKey')
+        partitions = arr.pop('partitions')
+        attrs = {
+            **arr,
+            'fields': type('fields', (Table.fields,), fields),
+            'keys': type('keys', (Table.keys,), keys),
+            'foreignKey': type('foreignKey', (Table.foreignKey,), references),
+            'partitions': type('partitions', (Table.partitions,), partitions),
+        }
+        return type(arr['name'], (Table,), attrs)
+
+    def where(self, schema: str = 'TABLE_SCHEMA', table: 'str|None' = 'TABLE_NAME') -> 'tuple[str, list]':
+        """
+        Filter of the schemas, and of the `only` tables of the current `run()`.
+
+        Args:
+            schema (str, optional): Schema column. Defaults to 'TABLE_SCHEMA'.
+            table (str|None, optional): Table column, None to filter the schemas only. Defaults to 'TABLE_NAME'.
+
+        Returns:
+            tuple[str, list]: SQL condition and its parameters.
+        """
+        if not self.schemas:
+            sql, param = f'{schema} = DATABASE()', []
+        else:
+            sql, param = f"{schema} IN ({', '.join(['%s'] * len(self.schemas))})", list(self.schemas)
+        if table and self.__only:
+            sql += f" AND ({schema}, {table}) IN ({', '.join(['(%s, %s)'] * len(self.__only))})"
+            param += [v for pair in self.__only for v in pair]
+        return sql, param
+
+    def __select(self,
+                 view: str,
+                 columns: str,
+                 where: str = None,
+                 order: str = None,
+                 schema: str = 'TABLE_SCHEMA',
+                 table: 'str|None' = 'TABLE_NAME',
+                 ) -> 'Iterator[tuple]':
+        condition, param = self.where(schema, table)
+        sql = \
+            f'SELECT {columns.strip()} FROM information_schema.{view} ' +\
+            f'WHERE {condition}' + (f' AND {where}' if where else '') +\
+            (f' ORDER BY {order}' if order else '')
+        return self.__rows(sql, param)
+
+    def __rows(self, sql: str, param: list) -> 'Iterator[tuple]':
+        self.queries += 1
+        for batch in self.db.query_batches(sql, param):
+            for row in batch:
+                yield tuple(row.values()) if isinstance(row, dict) else tuple(row)
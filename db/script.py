@@ -0,0 +1,197 @@
+import re
+import time
+from typing import Iterator
+
+
+class ScriptResult:
+    """Outcome of a script: rows affected and rows read by statement, and the failing statement."""
+
+    def __init__(self, statements: 'list[str]') -> None:
+        self.statements: 'list[str]' = statements
+        """Statements of the script, in order."""
+        self.results: 'list[dict]' = []
+        """Executed statements as `{'sql': str, 'rowcount': int, 'rows': list|None}`."""
+        self.error: 'BaseException|None' = None
+        """Error of the failing statement."""
+        self.index: 'int|None' = None
+        """Index of the failing statement in `statements`."""
+        self.seconds: float = 0.0
+        """Wall time of the script."""
+        self.__start: float = time.perf_counter()
+
+    def __bool__(self) -> bool:
+        return self.error is None
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+    def __iter__(self) -> 'Iterator[dict]':
+        return iter(self.results)
+
+    def __repr__(self) -> str:
+        return \
+            f'{self.__class__.__name__}(' +\
+            f'statements={len(self.statements)}, ' +\
+            f'executed={len(self.results)}, ' +\
+            f'error={self.index if self.error else None})'
+
+    @property
+    def rowcounts(self) -> 'list[int]':
+        """Rows affected (or read) by each executed statement."""
+        return [r['rowcount'] for r in self.results]
+
+    def add(self, rowcount: int, rows: 'list|None' = None):
+        """Record the result of the next statement."""
+        i = len(self.results)
+        self.results.append({
+            'sql': self.statements[i] if i < len(self.statements) else None,
+            'rowcount': rowcount,
+            'rows': rows,
+        })
+
+    def fail(self, error: BaseException):
+        """Record the error of the next statement."""
+        self.error = error
+        self.index = len(self.results)
+
+    def stop(self) -> 'ScriptResult':
+        """Record the elapsed time."""
+        self.seconds = time.perf_counter() - self.__start
+        return self
+
+
+class Script:
+    """
+    Statements joined into one script with one flat list of parameters.
+
+    A script string is split on the `;` outside of literals and comments.
+    Named placeholders are turned into positional ones, so statements with
+    their own parameters can share a single round trip; `bind()` fills them
+    with the literals of the driver.
+
+    Examples:
+        ```python
+        script = Script([
+            ('INSERT INTO t (a) VALUES (%s)', (1,)),
+            ('UPDATE t SET a = %(a)s WHERE id = %(id)s', {'a': 2, 'id': 1}),
+            'DELETE FROM t WHERE a IS NULL',
+        ])
+        cursor.execute(script.bind(literals), map_results=True)
+        ```
+    """
+
+    re_token = re.compile(r"""'(?:[^'\\]|\\.|'')*'|"(?:[^"\\]|\\.|"")*"|`[^`]*`|--(?=\s|$)[^\n]*|#[^\n]*|/\*.*?\*/|;""", re.S)
+    """Literals, comments and statement separators."""
+
+    re_param = re.compile(r"""'(?:[^'\\]|\\.|'')*'|"(?:[^"\\]|\\.|"")*"|`[^`]*`|--(?=\s|$)[^\n]*|#[^\n]*|/\*.*?\*/|%%|%s|%\((\w+)\)s""", re.S)
+    """Placeholders and the escaped `%%`, outside of literals and comments."""
+
+    def __init__(self, sql: 'str|list|tuple', param: 'tuple|list|dict' = []) -> None:
+        """
+        Build a script.
+
+        Args:
+            sql (str|list|tuple): Script with `;` separated statements, or a list of
+                statements and `(sql, param)` tuples.
+            param (tuple|list|dict, optional): Parameters of the statements without
+                their own. Each statement takes the ones its placeholders need. Defaults to empty list.
+        """
+        items = self.split(sql) if isinstance(sql, str) else sql
+        self.statements: 'list[str]' = []
+        self.params: list = []
+        self.counts: 'list[int]' = []
+        """Parameters of each statement, in order."""
+        for item in items:
+            if isinstance(item, (tuple, list)):
+                statement, values = item[0], item[1] if len(item) > 1 else []
+            else:
+                statement, values = item, param
+            self.statements.append(self.__positional(statement.strip().rstrip(';'), values))
+        self.text: str = ';\n'.join(self.statements)
+        """Statements joined by `;`."""
+
+    def __len__(self) -> int:
+        return len(self.statements)
+
+    def bind(self, literals: 'list[bytes|str]', encoding: str = 'utf-8') -> bytes:
+        """
+        Script with the placeholders replaced by SQL literals, to send without parameters.
+
+        A driver substitutes every `%s` of the text it is given, even inside a
+        literal of a statement without parameters such as `LIKE '%sales%'`, so
+        a script that has parameters is bound here, where the literals are known.
+
+        Args:
+            literals (list[bytes|str]): `params` quoted and escaped by the driver, in order.
+            encoding (str, optional): Codec of the connection. Defaults to 'utf-8'.
+        """
+        values = iter(literals)
+        out = []
+        for statement, count in zip(self.statements, self.counts):
+            if not count:
+                out.append(statement.encode(encoding))
+                continue
+            parts = []
+            pos = 0
+            for m in self.re_param.finditer(statement):
+                token = m.group()
+                if token[0] != '%':
+                    continue
+                value = b'%' if token == '%%' else next(values)
+                parts.append(statement[pos:m.start()].encode(encoding))
+                parts.append(value.encode(encoding) if isinstance(value, str) else bytes(value))
+                pos = m.end()
+            parts.append(statement[pos:].encode(encoding))
+            out.append(b''.join(parts))
+        return b';\n'.join(out)
+
+    @classmethod
+    def split(cls, sql: str) -> 'list[str]':
+        """
+        Statements of a script, without the empty ones.
+
+        Client commands such as `DELIMITER` are not supported.
+        """
+        out = []
+        start = pos = 0
+        code = False
+        for m in cls.re_token.finditer(sql):
+            if sql[pos:m.start()].strip():
+                code = True
+            token = m.group()
+            if token == ';':
+                if code:
+                    out.append(sql[start:m.start()].strip())
+                start = m.end()
+                code = False
+            elif token[0] in '\'"`':
+                code = True
+            pos = m.end()
+        if code or sql[pos:].strip():
+            out.append(sql[start:].strip())
+        return out
+
+    def __positional(self, sql: str, values: 'tuple|list|dict') -> str:
+        """Append the values of a statement to `params`, converting named placeholders."""
+        start = len(self.params)
+        if not values:
+            # without parameters a `%` is plain text, as in `LIKE '%sales%'`
+            self.counts.append(0)
+            return sql
+        index = 0
+
+        def repl(m: 're.Match') -> str:
+            nonlocal index
+            token = m.group()
+            if token == '%%' or token[0] != '%':
+                return token
+            if m.group(1):
+                self.params.append(values[m.group(1)])
+            else:
+                self.params.append(values[index])
+                index += 1
+            return '%s'
+
+        sql = self.re_param.sub(repl, sql)
+        self.counts.append(len(self.params) - start)
+        return sql
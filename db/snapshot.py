@@ -0,0 +1,211 @@
+import hashlib
+import json
+import os
+from typing import Any
+from .models import Db, Table
+from .models.keys import Key
+from .models.foreignKey import Reference
+from .models.partitions import Partition
+from .models.types import main as t_main, string
+from .reverse import Reverse
+from .catalog import Catalog, CatalogTables
+
+
+class Snapshot:
+    """
+    Reverse engineered schemas kept between runs, with a fingerprint per table.
+
+    A fingerprint hashes what defines a table but not its data: `CREATE_TIME`,
+    engine, collation, options, comment, and checksums of its columns,
+    indexes, foreign keys and partitions, all computed by the server in one
+    set-based query. `refresh()` compares them with the stored ones and only
+    reverse engineers the tables that were added or changed. Snapshots are
+    saved as JSON or, for big schemas, as a binary `Catalog` read lazily.
+
+    Examples:
+        ```python
+        snap = Snapshot(connect('warehouse'), ['sales'], file='conf/snapshot/warehouse.json')
+        changes = snap.refresh()
+        print(changes['changed'], snap.tables['sales']['orders'].fields)
+        ```
+    """
+
+    def __init__(self, db, schemas: 'str|list[str]' = None, file: str = None) -> None:
+        """
+        Args:
+            db (Main): Open connection.
+            schemas (str|list[str], optional): Schemas to follow. Defaults to the current database.
+            file (str, optional): JSON file of the snapshot, loaded if it exists. Defaults to None.
+        """
+        self.reverse: Reverse = Reverse(db, schemas)
+        self.file: 'str|None' = file
+        self.fingerprints: 'dict[str, str]' = {}
+        """`schema.table` to fingerprint of the stored tables."""
+        self.tables: 'dict[str, dict[str, type[Table]]]' = {}
+        """Schema name to table name to `Table` subclass."""
+        if file and os.path.isfile(file):
+            self.load(file)
+
+    def fingerprint(self) -> 'dict[str, str]':
+        """
+        Current fingerprint of every table of the schemas.
+
+        Returns:
+            dict[str, str]: `schema.table` to fingerprint.
+        """
+        where, param = self.reverse.where(table=None)
+        parts = {
+            'COLUMNS': "ORDINAL_POSITION, COLUMN_NAME, COLUMN_TYPE, IS_NULLABLE, COLUMN_DEFAULT, EXTRA, COLLATION_NAME, COLUMN_COMMENT",
+            'STATISTICS': "INDEX_NAME, SEQ_IN_INDEX, NON_UNIQUE, COLUMN_NAME, SUB_PART, INDEX_TYPE, INDEX_COMMENT",
+            'KEY_COLUMN_USAGE': "CONSTRAINT_NAME, ORDINAL_POSITION, COLUMN_NAME, REFERENCED_TABLE_SCHEMA, REFERENCED_TABLE_NAME, REFERENCED_COLUMN_NAME",
+            'PARTITIONS': "PARTITION_NAME, SUBPARTITION_NAME, PARTITION_METHOD, PARTITION_EXPRESSION, PARTITION_DESCRIPTION",
+        }
+        # sums of row checksums do not depend on the order nor on group_concat_max_len
+        joins = ''.join(
+            f"LEFT JOIN (SELECT TABLE_SCHEMA, TABLE_NAME, COUNT(*) AS n, SUM(CRC32(CONCAT_WS('|', {columns}))) AS h " +
+            f"FROM information_schema.{view} WHERE {where} GROUP BY TABLE_SCHEMA, TABLE_NAME) v{i} " +
+            f"ON v{i}.TABLE_SCHEMA = t.TABLE_SCHEMA AND v{i}.TABLE_NAME = t.TABLE_NAME "
+            for i, (view, columns) in enumerate(parts.items())
+        )
+        sql = \
+            'SELECT t.TABLE_SCHEMA, t.TABLE_NAME, t.CREATE_TIME, t.ENGINE, t.TABLE_COLLATION, t.CREATE_OPTIONS, t.TABLE_COMMENT, ' +\
+            ', '.join(f'v{i}.n, v{i}.h' for i in range(len(parts))) +\
+            f' FROM information_schema.TABLES t {joins}' +\
+            f"WHERE {self.reverse.where('t.TABLE_SCHEMA', None)[0]} AND t.TABLE_TYPE IN ('BASE TABLE', 'SYSTEM VERSIONED')"
+        out = {}
+        for batch in self.reverse.db.query_batches(sql, param * (len(parts) + 1)):
+            for row in batch:
+                row = tuple(row.values()) if isinstance(row, dict) else tuple(row)
+                out[f'{row[0]}.{row[1]}'] = hashlib.sha1(repr(tuple(map(str, row[2:]))).encode()).hexdigest()
+        return out
+
+    def refresh(self) -> 'dict[str, list[str]]':
+        """
+        Reverse engineer the tables whose fingerprint changed and forget the dropped ones.
+
+        Returns:
+            dict[str, list[str]]: `added`, `changed` and `removed` tables as `schema.table`.
+        """
+        current = self.fingerprint()
+        changes = {
+            'added': [k for k in current if k not in self.fingerprints],
+            'changed': [k for k, v in current.items() if k in self.fingerprints and self.fingerprints[k] != v],
+            'removed': [k for k in self.fingerprints if k not in current],
+        }
+        for key in changes['removed']:
+            schema, name = key.split('.', 1)
+            self.tables.get(schema, {}).pop(name, None)
+        todo = changes['added'] + changes['changed']
+        if todo:
+            only = None if len(todo) == len(current) else [tuple(k.split('.', 1)) for k in todo]
+            for schema, tables in self.reverse.run(only).items():
+                self.tables.setdefault(schema, {}).update(tables)
+        self.fingerprints = current
+        if self.file and (todo or changes['removed']):
+            self.save()
+        return changes
+
+    def save(self, file: str = None):
+        """
+        Write the snapshot to `file` or the file of the snapshot.
+
+        Files ending in `.json` are written as JSON, any other as a binary `Catalog`.
+        """
+        file = file or self.file
+        records, schemata = {}, {}
+        for schema, tables in self.tables.items():
+            if isinstance(tables, CatalogTables):
+                schemata.setdefault(schema, tables.catalog.schemata.get(schema))
+            for name in tables:
+                if isinstance(tables, CatalogTables):
+                    records[f'{schema}.{name}'] = tables.record(name)
+                    continue
+                table = tables[name]
+                if table.db:
+                    schemata[schema] = table.db.collate
+                records[f'{schema}.{name}'] = self.dump(table)
+        if not file.endswith('.json'):
+            Catalog.write(file, records, self.fingerprints, schemata)
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(file)), exist_ok=True)
+        tmp = f'{file}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'fingerprints': self.fingerprints, 'schemata': schemata, 'tables': records}, f, default=str)
+        os.replace(tmp, file)
+
+    def load(self, file: str = None):
+        """
+        Read a snapshot written by `save()`.
+
+        The tables of a binary `Catalog` are only decoded when they are used.
+        """
+        file = file or self.file
+        if not file.endswith('.json'):
+            catalog = Catalog(file)
+            self.tables = catalog.schemas()
+            self.fingerprints = catalog.fingerprints
+            return
+        with open(file, encoding='utf-8') as f:
+            data = json.load(f)
+        dbs = {}
+        for schema, collate in data.get('schemata', {}).items():
+            dbs[schema] = Db()
+            dbs[schema].name = schema
+            dbs[schema].collate = collate
+        self.tables = {}
+        for key, arr in data.get('tables', {}).items():
+            schema = key.split('.', 1)[0]
+            self.tables.setdefault(schema, {})[arr['name']] = self.restore(arr, dbs.get(schema))
+        self.fingerprints = data.get('fingerprints', {})
+
+    attributes = ('name', 'engine', 'collate', 'row_format', 'avg_row_length', 'checksum', 'max_rows', 'comment')
+    """Table attributes kept in the snapshot."""
+
+    @classmethod
+    def dump(cls, table: 'type[Table]') -> dict:
+        """JSON-able description of a table."""
+        return {
+            **{k: getattr(table, k) for k in cls.attributes},
+            'fields': {k: [type(v).__name__, cls.__state(v)] for k, v in cls.__members(table.fields)},
+            'keys': {k: cls.__state(v) for k, v in cls.__members(table.keys)},
+            'foreignKey': {k: cls.__state(v) for k, v in cls.__members(table.foreignKey)},
+            'partitions': {
+                k: {'partition': cls.__state(v)} if isinstance(v, Partition) else v
+                for k, v in cls.__members(table.partitions)
+            },
+        }
+
+    @classmethod
+    def restore(cls, arr: dict, db: 'Db|None' = None) -> 'type[Table]':
+        """Table of a description made by `dump()`."""
+        types = {c.__name__: c for c in (*Reverse.types.values(), string.LongText)}
+        return Reverse.build({
+            **{k: arr.get(k) for k in cls.attributes},
+            'db': db,
+            'fields': {k: cls.__new(types.get(t, string.LongText), v) for k, (t, v) in arr['fields'].items()},
+            'keys': {k: cls.__new(Key, v) for k, v in arr['keys'].items()},
+            'foreignKey': {k: cls.__new(Reference, v) for k, v in arr['foreignKey'].items()},
+            'partitions': {
+                k: cls.__new(Partition, v['partition']) if isinstance(v, dict) else v
+                for k, v in arr['partitions'].items()
+            },
+        })
+
+    @staticmethod
+    def __members(cls: type) -> 'list[tuple[str, Any]]':
+        return [(k, v) for k, v in vars(cls).items() if not k.startswith('_')]
+
+    @staticmethod
+    def __state(obj: Any) -> dict:
+        if isinstance(obj, t_main.Type):
+            return {k: list(v) if isinstance(v, tuple) else v for k, v in obj.state().items()}
+        return dict(vars(obj))
+
+    @staticmethod
+    def __new(cls: type, state: dict) -> Any:
+        if issubclass(cls, t_main.Type):
+            return cls.from_state(state)
+        obj = cls.__new__(cls)
+        for k, v in state.items():
+            setattr(obj, k, v)
+        return obj
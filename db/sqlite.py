@@ -0,0 +1,257 @@
+import re
+import sqlite3
+from functools import lru_cache
+from itertools import islice
+from typing import Iterable, Iterator
+from .main import Main
+from .bulk import Bulk, BulkResult
+
+
+class SQLite(Main):
+    """
+    Embedded SQLite database connection and query handler class.
+    Extends the Main class to provide a local staging store and cache tier
+    that needs no server.
+
+    The SQL uses the same `%s`/`%(name)s` placeholders as the other drivers.
+    Files are opened in WAL mode with memory-mapped reads, so readers do not
+    block the writer and hot pages are read without copies.
+    """
+    default = {
+        'path': ':memory:',
+        'timeout': 30.0,
+        'pragmas': {
+            'journal_mode': 'WAL',
+            'synchronous': 'NORMAL',
+            'temp_store': 'MEMORY',
+            'mmap_size': 256 * 1024 * 1024,
+            'cache_size': -64 * 1024,
+            'foreign_keys': 'ON',
+        },
+    }
+    """
+    Default configuration:
+    - path (str): Database file, `:memory:` for a private in-memory database
+    - timeout (float): Seconds to wait for a lock held by another connection
+    - pragmas (dict): `PRAGMA` applied to every new connection. `synchronous=NORMAL`
+      in WAL mode may lose the last commits on power loss, never corrupts the file
+    """
+
+    commands = {
+        'INSERT': 'INSERT',
+        'INSERT IGNORE': 'INSERT OR IGNORE',
+        'REPLACE': 'REPLACE',
+    }
+    """Bulk commands of `many` in SQLite syntax."""
+
+    re_param = re.compile(r"""('(?:[^']|'')*')|%\((\w+)\)s|%s|%%""")
+    """Placeholders outside of string literals."""
+
+    def _check_config(self, cfg: dict) -> dict:
+        arr = {**self.default, 'pragmas': dict(self.default['pragmas'])}
+        path = cfg.get('path') or cfg.get('database')
+        if path:
+            arr['path'] = path
+        if cfg.get('timeout') is not None:
+            arr['timeout'] = float(cfg['timeout'])
+        if isinstance(cfg.get('pragmas'), dict):
+            arr['pragmas'].update(cfg['pragmas'])
+        return arr
+
+    def connect(self, config: dict) -> 'sqlite3.Connection|None':
+        """
+        Opens the database file and applies the pragmas.
+
+        Args:
+            config (dict): SQLite configuration, see `default`
+
+        Returns:
+            sqlite3.Connection|None: A connection if successful, None otherwise
+        """
+        try:
+            # pooled connections may be used by other threads, one at a time
+            conn = sqlite3.connect(config['path'], timeout=config['timeout'], check_same_thread=False)
+            for k, v in config['pragmas'].items():
+                conn.execute(f'PRAGMA {k} = {v}')
+            return conn
+        except sqlite3.Error as e:
+            self.error = e
+            self.show(f"Erro: {e}")
+
+    def ping(self, conn: 'sqlite3.Connection') -> bool:
+        try:
+            conn.execute('SELECT 1')
+            return True
+        except sqlite3.Error:
+            return False
+
+    def reset(self, conn: 'sqlite3.Connection'):
+        try:
+            conn.rollback()
+        except sqlite3.Error:
+            pass
+
+    def select_db(self, db: str) -> bool:
+        # a file is a single database, attached ones are used as `schema.table`
+        return False
+
+    def _begin(self, conn: 'sqlite3.Connection'):
+        # explicit, so a first SAVEPOINT does not open (and RELEASE commit) its own transaction
+        if not conn.in_transaction:
+            conn.execute('BEGIN')
+
+    @classmethod
+    @lru_cache(maxsize=256)
+    def placeholders(cls, sql: str) -> str:
+        """
+        SQL with the `%s`/`%(name)s` placeholders of the other drivers as `?`/`:name`.
+
+        Args:
+            sql (str): SQL statement.
+
+        Returns:
+            str: SQL in SQLite paramstyle.
+        """
+        def repl(m: 're.Match') -> str:
+            if m.group(1):
+                return m.group(1)
+            if m.group(2):
+                return ':' + m.group(2)
+            return '?' if m.group() == '%s' else '%'
+        return cls.re_param.sub(repl, sql)
+
+    def _fetch(self, sql: str, param: 'tuple|list|dict' = [], size: int = None) -> 'Iterator[list[tuple]]':
+        conn: 'sqlite3.Connection|None' = self.conn
+        if not conn:
+            return
+        self.show_sql(sql, param)
+        cursor = conn.execute(self.placeholders(sql), param or ())
+        try:
+            self.description = cursor.description
+            if not self.description:
+                return
+            size = size or self.batch_size
+            while True:
+                rows = cursor.fetchmany(size)
+                if not rows:
+                    break
+                yield rows
+        finally:
+            cursor.close()
+
+    def query(self, sql: str, param: 'tuple|list|dict' = []) -> Iterator[dict]:
+        for batch in self.query_batches(sql, param):
+            yield from batch
+
+    def exec(self, sql: 'str|list|tuple', param: 'tuple|list|dict' = []) -> 'bool|list':
+        isok = False
+        conn: 'sqlite3.Connection|None' = self.conn
+        if not conn:
+            return isok
+        if type(sql) == str:
+            event = self._before('exec', sql, param) if self.hooks else None
+            rowcount = 0
+            try:
+                self.show_sql(sql, param)
+                rowcount = conn.execute(self.placeholders(sql), param or ()).rowcount
+                self._commit()
+                isok = True
+                self._written(sql)
+            except sqlite3.Error as e:
+                self.error = e
+                self.show(f"Erro ao executar a inserção: {e}")
+            if event:
+                self._after(event, rowcount if isok else 0, error=None if isok else self.error)
+        else:
+            result = self.script(sql, param)
+            isok = [True] * len(result) + ([False] if result.error else [])
+        return isok
+
+    def many(self, tbl: str, data: 'Iterable[dict]', config: dict = {}) -> 'BulkResult|None':
+        """
+        Insert rows with `executemany` in batches, each one in its own savepoint.
+
+        Args:
+            tbl (str): Target table name
+            data (Iterable[dict]): List or generator of dictionaries
+            config (dict, optional):
+                - command (str): `INSERT`, `INSERT IGNORE` or `REPLACE`
+                - columns (list[str]): Keys of the rows. Defaults to the keys of the first row
+                - update (bool|list|dict): Upsert of all, some (`list`) or with
+                  expressions (`dict` column to SQL, `excluded.col` is the new value)
+                - max_rows (int): Rows per batch. Defaults to `Bulk.default['max_rows']`
+                - commit (int): Commit every N batches. Defaults to 1
+
+        Returns:
+            BulkResult|None: Result of the load, falsy if any batch failed
+        """
+        conn: 'sqlite3.Connection|None' = self.conn
+        if not data or not conn:
+            return
+        config = {**Bulk.default, 'commit': 1, **{k: v for k, v in config.items() if v is not None}}
+        command = self.commands.get(config['command'].upper())
+        if not command:
+            self.fatal_error(f"Unsupported bulk command: {config['command']}")
+        self.show({'tbl': tbl, 'config': config})
+        rows = iter(data)
+        first = next(rows, None)
+        if first is None:
+            return BulkResult().stop()
+        keys = list(config['columns'] or first.keys())
+        columns = [k.replace(' ', '_') for k in keys]
+        sql = \
+            f'{command} INTO {tbl} ("' + '", "'.join(columns) + '") ' +\
+            'VALUES (' + ', '.join(['?'] * len(keys)) + ')' +\
+            self.__upsert(columns, config['update'] if command == 'INSERT' else None)
+        values = (tuple(row.get(k) for k in keys) for row in self.__chain(first, rows))
+        result = BulkResult()
+        commit_every = config['commit']
+        while True:
+            batch = list(islice(values, config['max_rows']))
+            if not batch:
+                break
+            result.batches += 1
+            self._begin(conn)
+            event = self._before('many', sql) if self.hooks else None
+            conn.execute('SAVEPOINT liger_many')
+            try:
+                conn.executemany(sql, batch)
+                conn.execute('RELEASE SAVEPOINT liger_many')
+                result.rows += len(batch)
+                if event:
+                    self._after(event, len(batch))
+            except sqlite3.Error as e:
+                conn.execute('ROLLBACK TO SAVEPOINT liger_many')
+                conn.execute('RELEASE SAVEPOINT liger_many')
+                self.error = e
+                self.show(f"Erro ao executar a inserção: {e}")
+                result.errors.append({
+                    'batch': result.batches,
+                    'rows': len(batch),
+                    'error': e,
+                })
+                if event:
+                    self._after(event, error=e)
+            if commit_every and result.batches % commit_every == 0:
+                result.commits += self._commit()
+        if not commit_every or result.batches % commit_every:
+            result.commits += self._commit()
+        self._written(tbl)
+        return result.stop()
+
+    @staticmethod
+    def __chain(first: dict, rows: 'Iterator[dict]') -> 'Iterator[dict]':
+        yield first
+        yield from rows
+
+    @staticmethod
+    def __upsert(columns: 'list[str]', update: 'bool|list|dict|None') -> str:
+        if not update:
+            return ''
+        if isinstance(update, dict):
+            arr = [f'"{k}" = {v}' for k, v in update.items()]
+        else:
+            cols = columns if update is True else [c.replace(' ', '_') for c in update]
+            arr = [f'"{c}" = excluded."{c}"' for c in cols]
+        # SQLite 3.35+: the conflict target may be omitted
+        return ' ON CONFLICT DO UPDATE SET ' + ', '.join(arr)
@@ -0,0 +1,134 @@
+import re
+import weakref
+from collections import OrderedDict
+from typing import Any
+
+
+class Statements:
+    """
+    LRU cache of server-side prepared statements of one connection.
+
+    Each SQL text keeps its own prepared cursor, so running the same statement
+    again only sends the parameters instead of re-sending and re-parsing the SQL.
+    The cache is cleared when the connection reconnects (new connection id) or
+    changes the default database.
+
+    Examples:
+        ```python
+        cache = Statements.of(conn, 64)
+        cursor = cache.execute('SELECT * FROM users WHERE id = %s', (1,))
+        print(cursor.fetchall(), cache.stats)
+        ```
+    """
+
+    caches: 'weakref.WeakKeyDictionary[Any, Statements]' = weakref.WeakKeyDictionary()
+    """Caches by connection."""
+
+    named = re.compile(r'%\((\w+)\)s')
+    """Named placeholder `%(name)s`."""
+
+    def __init__(self, conn: Any, size: int = 64) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            conn (Any): Connection with `cursor(prepared=True)`.
+            size (int, optional): Maximum prepared statements kept open. Defaults to 64.
+        """
+        self.size: int = size
+        self.hits: int = 0
+        """Executions that reused a prepared statement."""
+        self.misses: int = 0
+        """Executions that had to prepare the statement."""
+        self.__conn = weakref.ref(conn)
+        self.__id = getattr(conn, 'connection_id', None)
+        self.__items: 'OrderedDict[str, list]' = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.__items)
+
+    def __contains__(self, sql: str) -> bool:
+        return sql in self.__items
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({self.stats})'
+
+    @classmethod
+    def of(cls, conn: Any, size: int = 64) -> 'Statements':
+        """
+        Cache of a connection, created on first use and cleared after a reconnect.
+
+        Args:
+            conn (Any): Connection with `cursor(prepared=True)`.
+            size (int, optional): Maximum prepared statements kept open. Defaults to 64.
+
+        Returns:
+            Statements: The cache of the connection.
+        """
+        cache = cls.caches.get(conn)
+        if cache is None:
+            cache = cls.caches[conn] = cls(conn, size)
+        elif cache.__id != getattr(conn, 'connection_id', None):
+            cache.clear(False)
+            cache.__id = getattr(conn, 'connection_id', None)
+        return cache
+
+    @property
+    def stats(self) -> dict:
+        """Counters of the cache."""
+        return {
+            'size': len(self.__items),
+            'hits': self.hits,
+            'misses': self.misses,
+        }
+
+    def execute(self, sql: str, param: 'tuple|list|dict' = []) -> Any:
+        """
+        Execute a statement on its prepared cursor, preparing it on a miss.
+
+        Args:
+            sql (str): SQL with `%s` or `%(name)s` placeholders.
+            param (tuple|list|dict, optional): Parameters. Defaults to empty list.
+
+        Returns:
+            Any: The prepared cursor, owned by the cache. Do not close it.
+        """
+        entry = self.__items.get(sql)
+        if entry is None:
+            self.misses += 1
+            names = self.named.findall(sql)
+            # the connector reuses a statement only for the same operation object
+            operation = self.named.sub('%s', sql) if names else sql
+            entry = [operation, names, self.__conn().cursor(prepared=True)]
+            self.__items[sql] = entry
+            if len(self.__items) > self.size:
+                self.__close(self.__items.popitem(last=False)[1][2])
+        else:
+            self.hits += 1
+            self.__items.move_to_end(sql)
+        operation, names, cursor = entry
+        if isinstance(param, dict):
+            param = tuple(param[k] for k in names)
+        cursor.execute(operation, param or ())
+        return cursor
+
+    def clear(self, close: bool = True):
+        """
+        Drop every prepared statement.
+
+        Args:
+            close (bool, optional): Deallocate the statements on the server.
+                Pass False when the session is already gone. Defaults to True.
+        """
+        items = list(self.__items.values())
+        self.__items.clear()
+        if close:
+            for entry in items:
+                self.__close(entry[2])
+
+    @staticmethod
+    def __close(cursor: Any):
+        try:
+            cursor.close()
+        except Exception:
+            pass
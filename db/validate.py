@@ -0,0 +1,344 @@
+from itertools import islice, repeat
+from typing import Any, Iterable, Iterator
+from .models.types import main as t_main, number as t_number, string as t_string, time as t_time
+
+
+class Validation:
+    """Outcome of a batch validation: one error mask per column and rule."""
+
+    def __init__(self, rows: int) -> None:
+        import numpy as np
+        self.rows: int = rows
+        """Rows checked."""
+        self.masks: 'dict[str, dict[str, Any]]' = {}
+        """Column to rule to boolean array, `True` where the row breaks the rule."""
+        self.invalid: Any = np.zeros(rows, dtype=bool)
+        """Boolean array, `True` where the row breaks any rule."""
+
+    def __bool__(self) -> bool:
+        return not self.invalid.any()
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(rows={self.rows}, invalid={int(self.invalid.sum())})'
+
+    def add(self, column: str, rule: str, mask: Any):
+        if mask.any():
+            self.masks.setdefault(column, {})[rule] = mask
+            self.invalid |= mask
+
+    def errors(self, limit: int = None) -> 'list[dict]':
+        """
+        Errors of the invalid rows, in row order.
+
+        Args:
+            limit (int, optional): Invalid rows to report. Defaults to all.
+
+        Returns:
+            list[dict]: `{'row': int, 'column': str, 'rule': str}`
+        """
+        import numpy as np
+        index = np.flatnonzero(self.invalid)[:limit]
+        out = []
+        for column, rules in self.masks.items():
+            for rule, mask in rules.items():
+                out.extend({'row': int(i), 'column': column, 'rule': rule} for i in index[mask[index]])
+        return sorted(out, key=lambda e: e['row'])
+
+    def select(self, rows: 'list', valid: bool = True) -> 'list':
+        """
+        Rows of the batch that are valid, or invalid with `valid=False`.
+
+        Args:
+            rows (list): The rows given to `Validator.check()`.
+            valid (bool, optional): Defaults to True.
+        """
+        import numpy as np
+        return [rows[i] for i in np.flatnonzero(~self.invalid if valid else self.invalid)]
+
+
+class Validator:
+    """
+    Batch validation of rows against the column types of a table.
+
+    The constraints the types carry (`not_null`, `unsigned`, `length`,
+    `max_length`, `min`, `max`, integer width, decimal precision and enum
+    values) are compiled once into a plan of rules per column. `check()` then
+    turns each column of a batch into a NumPy array and runs every rule as an
+    array operation, so there is no Python loop per cell, and returns one
+    error mask per column and rule.
+
+    Rules:
+    - null: `NULL` in a `NOT NULL` column without default
+    - type: value that is not a number in a number column, or a fraction in an integer one
+    - min, max: out of the integer width, sign, precision or `min`/`max` of the type
+    - length: longer than `length`/`max_length`, or the capacity of a text or blob type
+    - values: not a member of an `ENUM`/`SET`
+
+    Examples:
+        ```python
+        check = Validator(Orders)
+        result = check.check(rows)
+        if not result:
+            print(result.errors(10))
+        db.many('orders', result.select(rows))
+        ```
+    """
+
+    bits: 'dict[type, int]' = {
+        t_number.TinyInt: 8,
+        t_number.Bool: 8,
+        t_number.SmallInt: 16,
+        t_number.MediumInt: 24,
+        t_number.BigInt: 64,
+    }
+    """Width of the integer types, 32 for the others."""
+
+    capacity: 'dict[type, int]' = {
+        t_string.TinyText: (1 << 8) - 1,
+        t_string.MediumText: (1 << 24) - 1,
+        t_string.Long: (1 << 32) - 1,
+        t_string.Text: (1 << 16) - 1,
+        t_string.TinyBlob: (1 << 8) - 1,
+        t_string.MediumBlob: (1 << 24) - 1,
+        t_string.LongBlob: (1 << 32) - 1,
+        t_string.Blob: (1 << 16) - 1,
+    }
+    """Maximum length of the text and blob types, whatever their `length`."""
+
+    def __init__(self, fields: 'type|dict[str, t_main.Type]') -> None:
+        """
+        Args:
+            fields (type|dict[str, Type]): `Table` subclass, its `fields` class, or column name to type.
+        """
+        if isinstance(fields, type):
+            fields = vars(getattr(fields, 'fields', fields))
+        self.types: 'dict[str, t_main.Type]' = {
+            k: v for k, v in fields.items() if isinstance(v, t_main.Type) and not k.startswith('_')
+        }
+        """Column name to type."""
+        self.plan: 'list[tuple[str, str, Any]]' = [rule for k, v in self.types.items() for rule in self.compile(k, v)]
+        """Rules as `(column, rule, argument)`."""
+
+    @classmethod
+    def compile(cls, column: str, type_: 't_main.Type') -> 'list[tuple[str, str, Any]]':
+        """Rules of a column."""
+        rules = []
+        if type_.not_null and type_.default is None and not type_.expression and not getattr(type_, 'auto_increment', False):
+            rules.append((column, 'null', None))
+        if type_.expression:
+            return rules
+        lo = getattr(type_, 'min', None)
+        hi = getattr(type_, 'max', None)
+        if isinstance(type_, t_number.Decimal):
+            rules.append((column, 'type', float))
+            if not isinstance(type_, t_number.Float):
+                # DECIMAL(5,2) holds -999.99 to 999.99
+                limit = 10 ** max(type_.length - type_.decimals, 0) - 10 ** -type_.decimals
+                lo = -limit if lo is None else max(lo, -limit)
+                hi = limit if hi is None else min(hi, limit)
+            if type_.unsigned:
+                lo = 0 if lo is None else max(lo, 0)
+        elif isinstance(type_, t_number.Int):
+            rules.append((column, 'type', int))
+            if isinstance(type_, t_number.Bit):
+                bits, unsigned = type_.length or 1, True
+            else:
+                bits = next((b for c, b in cls.bits.items() if isinstance(type_, c)), 32)
+                unsigned = type_.unsigned
+            low, high = (0, (1 << bits) - 1) if unsigned else (-(1 << (bits - 1)), (1 << (bits - 1)) - 1)
+            lo = low if lo is None else max(lo, low)
+            hi = high if hi is None else min(hi, high)
+        elif isinstance(type_, t_time.Year):
+            rules.append((column, 'type', int))
+            lo = 1901 if lo is None else lo
+            hi = 2155 if hi is None else hi
+        elif isinstance(type_, t_string.Char):
+            lo = hi = None
+            if isinstance(type_, t_string.Set) and type_.values:
+                rules.append((column, 'values', (frozenset(type_.values), True)))
+            elif isinstance(type_, t_string.Enum) and not isinstance(type_, t_string.JSON) and type_.values:
+                rules.append((column, 'values', (frozenset(type_.values), False)))
+            else:
+                length = next((n for c, n in cls.capacity.items() if isinstance(type_, c)), type_.length)
+                if type_.max_length:
+                    length = min(length, type_.max_length) if length else type_.max_length
+                if length:
+                    rules.append((column, 'length', length))
+        else:
+            return rules
+        if lo is not None:
+            rules.append((column, 'min', lo))
+        if hi is not None:
+            rules.append((column, 'max', hi))
+        return rules
+
+    def check(self, rows: 'list[dict]|dict[str, Any]') -> Validation:
+        """
+        Validate a batch.
+
+        Args:
+            rows (list[dict]|dict[str, Any]): Rows as dicts, or columns as sequences or arrays,
+                                              like the result of `query_columns()`.
+
+        Returns:
+            Validation: Error masks of the batch, truthy if every row is valid.
+        """
+        import numpy as np
+        if isinstance(rows, dict):
+            n = len(next(iter(rows.values()), ()))
+            column = lambda k: rows.get(k)
+        else:
+            n = len(rows)
+            column = lambda k: np.fromiter(map(dict.get, rows, repeat(k)), dtype=object, count=n)
+        result = Validation(n)
+        cache: 'dict[str, dict[str, Any]]' = {}
+        kinds: 'dict[str, type]' = {}
+        for name, rule, arg in self.plan:
+            if name not in cache:
+                values = column(name)
+                cache[name] = self.__prepare(np.full(n, None, dtype=object) if values is None else np.asarray(values))
+            col = cache[name]
+            if rule == 'null':
+                result.add(name, rule, col['null'])
+            elif rule == 'type':
+                kinds[name] = arg
+                number, bad = self.__number(col, arg)
+                result.add(name, rule, bad)
+            elif rule in ('min', 'max'):
+                number, bad = self.__number(col, None)
+                if kinds.get(name) is int:
+                    number = self.__integer(col)
+                with np.errstate(invalid='ignore'):
+                    mask = number < arg if rule == 'min' else number > arg
+                result.add(name, rule, np.asarray(mask, dtype=bool) & ~bad & ~col['null'])
+            elif rule == 'length':
+                result.add(name, rule, (self.__length(col) > arg) & ~col['null'])
+            elif rule == 'values':
+                allowed, multiple = arg
+                result.add(name, rule, self.__member(col, allowed, multiple) & ~col['null'])
+        return result
+
+    def stream(self, rows: 'Iterable[dict]', size: int = 5000, rejected: 'list|None' = None) -> 'Iterator[dict]':
+        """
+        Valid rows of a stream, checked in batches of `size`, to feed `many()`.
+
+        Args:
+            rows (Iterable[dict]): Rows of any length.
+            size (int, optional): Rows per batch. Defaults to 5000.
+            rejected (list, optional): Receives `(row, [errors])` of the invalid rows. Defaults to None.
+
+        Examples:
+            ```python
+            bad = []
+            db.many('orders', Validator(Orders).stream(read_csv(), rejected=bad))
+            ```
+        """
+        it = iter(rows)
+        while batch := list(islice(it, size)):
+            result = self.check(batch)
+            if result:
+                yield from batch
+                continue
+            if rejected is not None:
+                errors: 'dict[int, list]' = {}
+                for e in result.errors():
+                    errors.setdefault(e.pop('row'), []).append(e)
+                rejected.extend((batch[i], errors[i]) for i in sorted(errors))
+            yield from result.select(batch)
+
+    @staticmethod
+    def __prepare(values: Any) -> dict:
+        import numpy as np
+        if values.dtype.kind == 'f':
+            null = np.isnan(values)
+        elif values.dtype.kind == 'O':
+            null = np.equal(values, None)
+            with np.errstate(invalid='ignore'):
+                null |= np.not_equal(values, values)
+        else:
+            null = np.zeros(len(values), dtype=bool)
+        return {'values': values, 'null': null}
+
+    @staticmethod
+    def __number(col: dict, kind: 'type|None') -> 'tuple[Any, Any]':
+        """Values as float64, non numbers as NaN, and the mask of the values of the wrong kind."""
+        import numpy as np
+        if 'number' not in col:
+            values, null = col['values'], col['null']
+            bad = np.zeros(len(values), dtype=bool)
+            if values.dtype.kind in 'iufb':
+                number = values.astype(np.float64)
+            else:
+                filled = np.where(null, 0, values) if null.any() else values
+                try:
+                    number = np.asarray(filled, dtype=np.float64)
+                except (TypeError, ValueError, OverflowError):
+                    # not every value is a number, find them one by one
+                    number = np.full(len(values), np.nan)
+                    for i, v in enumerate(filled):
+                        try:
+                            number[i] = float(v)
+                        except (TypeError, ValueError, OverflowError):
+                            bad[i] = True
+            number[null] = np.nan
+            col['number'], col['bad'] = number, bad
+        number, bad = col['number'], col['bad']
+        if kind is int and 'fraction' not in col:
+            with np.errstate(invalid='ignore'):
+                col['fraction'] = bad | (np.mod(number, 1) != 0) & ~np.isnan(number)
+        return number, col['fraction'] if kind is int else bad
+
+    @staticmethod
+    def __integer(col: dict) -> Any:
+        """
+        Values of an integer column that compare exactly with the limits of `BIGINT`.
+
+        float64 rounds above 2**53, so integer arrays are compared as they are and
+        the big values of the others as Python ints.
+        """
+        import numpy as np
+        if 'integer' not in col:
+            values, number = col['values'], col['number']
+            if values.dtype.kind in 'iu':
+                col['integer'] = values
+            else:
+                with np.errstate(invalid='ignore'):
+                    big = np.flatnonzero(np.abs(number) >= 2.0 ** 53)
+                exact = number
+                if len(big):
+                    exact = number.astype(object)
+                    for i in big:
+                        try:
+                            exact[i] = int(values[i])
+                        except (TypeError, ValueError, OverflowError):
+                            pass
+                col['integer'] = exact
+        return col['integer']
+
+    @staticmethod
+    def __length(col: dict) -> Any:
+        import numpy as np
+        if 'length' not in col:
+            values, null = col['values'], col['null']
+            if values.dtype.kind in 'US':
+                col['length'] = np.strings.str_len(values) if hasattr(np, 'strings') else np.char.str_len(values)
+            else:
+                filled = np.where(null, '', values) if null.any() else values
+                try:
+                    col['length'] = np.fromiter(map(len, filled), dtype=np.int64, count=len(filled))
+                except TypeError:
+                    col['length'] = np.fromiter(map(len, map(str, filled)), dtype=np.int64, count=len(filled))
+        return col['length']
+
+    @staticmethod
+    def __member(col: dict, allowed: frozenset, multiple: bool) -> Any:
+        import numpy as np
+        values = col['values']
+        if multiple:
+            # SET: check each distinct value once
+            ok = {v: isinstance(v, str) and (v == '' or allowed.issuperset(v.split(','))) for v in dict.fromkeys(values.tolist())}
+            return ~np.fromiter(map(ok.__getitem__, values.tolist()), dtype=bool, count=len(values))
+        try:
+            return ~np.fromiter(map(allowed.__contains__, values.tolist()), dtype=bool, count=len(values))
+        except TypeError:
+            return ~np.fromiter((v in allowed for v in map(str, values.tolist())), dtype=bool, count=len(values))
@@ -0,0 +1,25 @@
+import pytest
+from ...db.bench import Bench
+
+pytestmark = pytest.mark.db
+
+
+class TestBench:
+    def test_run(self, tmp_path):
+        bench = Bench(f'sqlite:///{tmp_path}/bench.db', rows=500, repeat=1, connects=2, lookups=10, batch_sizes=(50, 500))
+        result = bench.run()
+        assert result['meta']['driver'] == 'SQLite'
+        assert set(result['connect']) == {'direct', 'pool'}
+        assert result['many']['50']['batches'] == 10
+        assert set(result['read']) == {'query', 'all', 'line', 'value'}
+        assert all(v['rows_per_sec'] > 0 for v in result['read'].values())
+
+        path = str(tmp_path / 'bench.json')
+        Bench.save(result, path)
+        assert Bench.load(path) == result
+
+    def test_compare(self):
+        baseline = {'meta': {'rows': 1}, 'read': {'all': {'rows_per_sec': 1000.0}}, 'connect': {'direct': {'p50_ms': 1.0}}}
+        result = {'meta': {'rows': 1}, 'read': {'all': {'rows_per_sec': 950.0}}, 'connect': {'direct': {'p50_ms': 1.5}}}
+        assert [r['metric'] for r in Bench.compare(baseline, result)] == ['connect.direct.p50_ms']
+        assert [r['metric'] for r in Bench.compare(baseline, result, 0.01)] == ['read.all.rows_per_sec', 'connect.direct.p50_ms']
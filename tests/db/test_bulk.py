@@ -0,0 +1,82 @@
+import pytest
+from ...db.bulk import Bulk, BulkResult
+
+pytestmark = pytest.mark.db
+
+
+def rows(n):
+    for i in range(n):
+        yield {'id': i, 'first name': f'name {i}'}
+
+
+class TestBulk:
+    def test_statement(self):
+        sql, values, count = next(iter(Bulk('tbl', rows(2))))
+        assert sql == 'INSERT tbl (`id`, `first_name`) VALUES (%s, %s), (%s, %s)'
+        assert values == [0, 'name 0', 1, 'name 1']
+        assert count == 2
+
+    def test_generator_in_batches(self):
+        """Generators are consumed lazily in batches of max_rows"""
+        counts = [c for _, _, c in Bulk('tbl', rows(25), {'max_rows': 10})]
+        assert counts == [10, 10, 5]
+
+    def test_max_packet(self):
+        """Batches stay under the packet size"""
+        bulk = Bulk('tbl', rows(100), {'max_packet': 1000})
+        batches = list(bulk)
+        assert sum(c for _, _, c in batches) == 100
+        assert len(batches) > 1
+        assert all(len(sql) < 1000 for sql, _, _ in batches)
+
+    def test_missing_keys(self):
+        """Keys of a list are the union of its rows; missing values are NULL"""
+        data = [{'a': 1, 'b': 2}, {'a': 3, 'c': 4}]
+        sql, values, _ = next(iter(Bulk('tbl', data)))
+        assert sql == 'INSERT tbl (`a`, `b`, `c`) VALUES (%s, %s, %s), (%s, %s, %s)'
+        assert values == [1, 2, None, 3, None, 4]
+
+    def test_stream_keys(self):
+        """A stream without columns must keep the keys of its first row"""
+        data = iter([{'a': 1, 'b': 2}, {'b': 3, 'a': 4}, {'a': 5}])
+        with pytest.raises(ValueError, match="Row 2 of tbl has keys \\['b'\\]"):
+            list(Bulk('tbl', data))
+        _, values, _ = next(iter(Bulk('tbl', iter([{'a': 1, 'b': 2}, {'a': 3}]), {'columns': ['a', 'b']})))
+        assert values == [1, 2, 3, None]
+
+    def test_columns(self):
+        data = [{'a': 1, 'b': 2}]
+        sql, values, _ = next(iter(Bulk('tbl', data, {'columns': ['b']})))
+        assert sql == 'INSERT tbl (`b`) VALUES (%s)'
+        assert values == [2]
+
+    def test_commands(self):
+        sql, _, _ = next(iter(Bulk('tbl', rows(1), {'command': 'insert ignore'})))
+        assert sql.startswith('INSERT IGNORE tbl')
+        sql, _, _ = next(iter(Bulk('tbl', rows(1), {'command': 'REPLACE'})))
+        assert sql.startswith('REPLACE tbl')
+        with pytest.raises(ValueError):
+            Bulk('tbl', rows(1), {'command': 'DELETE'})
+
+    def test_update(self):
+        sql, _, _ = next(iter(Bulk('tbl', rows(1), {'update': ['first name']})))
+        assert sql.endswith(' ON DUPLICATE KEY UPDATE `first_name` = VALUES(`first_name`)')
+        sql, _, _ = next(iter(Bulk('tbl', rows(1), {'update': True, 'row_alias': True})))
+        assert sql.endswith(
+            ' AS new ON DUPLICATE KEY UPDATE `id` = new.`id`, `first_name` = new.`first_name`')
+        sql, _, _ = next(iter(Bulk('tbl', rows(1), {'update': {'id': '`id` + 1'}})))
+        assert sql.endswith(' ON DUPLICATE KEY UPDATE `id` = `id` + 1')
+
+    def test_empty(self):
+        assert list(Bulk('tbl', [])) == []
+
+
+class TestBulkResult:
+    def test_result(self):
+        result = BulkResult()
+        result.rows = 10
+        result.stop()
+        assert result
+        assert result.rows_per_sec > 0
+        result.errors.append({'batch': 1, 'rows': 1, 'error': Exception()})
+        assert not result
@@ -0,0 +1,144 @@
+import time
+import pytest
+from ...db.cache import Cache
+from ...db.main import Main
+
+pytestmark = pytest.mark.db
+
+
+class CountingDb(Main):
+    """Driver that counts the queries that reach the database"""
+    cache = {'ttl': 60}
+
+    def _check_config(self, cfg: dict) -> dict:
+        return cfg
+
+    def connect(self, config):
+        self.calls = 0
+        return None
+
+    def select_db(self, db) -> bool:
+        return True
+
+    def exec(self, sql, param=[]):
+        self._written(sql)
+        return True
+
+    def many(self, tbl, data, config={}):
+        self._written(tbl)
+        return True
+
+    def query(self, sql, param=[]):
+        self.calls += 1
+        return iter([{'id': 1, 'name': 'a'}, {'id': 2, 'name': 'b'}])
+
+
+@pytest.fixture(autouse=True)
+def reset_caches():
+    Cache.clear_all()
+    yield
+    Cache.clear_all()
+
+
+class TestCache:
+    def test_key_normalized(self):
+        """Whitespace is collapsed outside of literals only"""
+        assert Cache.key('SELECT  *\n FROM t', [1]) == Cache.key('SELECT * FROM t', [1])
+        assert Cache.key("SELECT 'a  b'") != Cache.key("SELECT 'a b'")
+
+    def test_tables(self):
+        assert Cache.tables('SELECT * FROM `db`.`Users` u JOIN roles r ON 1') == {'users', 'roles'}
+        assert Cache.tables('SELECT * FROM a, b AS x, c WHERE 1') == {'a', 'b', 'c'}
+        assert Cache.tables('INSERT IGNORE users (`id`) VALUES (%s)') == {'users'}
+        assert Cache.tables('UPDATE users SET a = 1') == {'users'}
+        assert Cache.tables('TRUNCATE TABLE users') == {'users'}
+        assert Cache.tables('users') == {'users'}
+
+    def test_cacheable(self):
+        assert Cache.cacheable('  select 1')
+        assert Cache.cacheable('WITH x AS (SELECT 1) SELECT * FROM x')
+        assert not Cache.cacheable('SELECT * FROM t FOR UPDATE')
+        assert not Cache.cacheable('DELETE FROM t')
+
+    def test_ttl(self):
+        cache = Cache(ttl=0)
+        cache.set('k', 1, {'t'})
+        time.sleep(0.001)
+        assert cache.get('k') is None
+
+    def test_lru_entries_and_bytes(self):
+        cache = Cache(size=2, max_bytes=100)
+        cache.set('a', 1, {'t'}, 10)
+        cache.set('b', 2, {'t'}, 10)
+        cache.get('a')
+        cache.set('c', 3, {'t'}, 10)
+        assert 'b' not in cache and 'a' in cache
+        cache.set('d', 4, {'t'}, 95)
+        assert len(cache) == 1 and cache.bytes == 95
+        cache.set('e', 5, {'t'}, 101)
+        assert 'e' not in cache
+
+    def test_invalidate(self):
+        cache = Cache()
+        cache.set('a', 1, {'users'})
+        cache.set('b', 2, {'roles'})
+        cache.invalidate({'users'})
+        assert 'a' not in cache and 'b' in cache
+        cache.invalidate(set())
+        assert len(cache) == 0
+
+
+class TestMainCache:
+    def test_hit(self):
+        """Identical reads hit the cache across instances of the DSN"""
+        db = CountingDb({'host': 'cache'})
+        assert db.all('SELECT * FROM users') == db.all('SELECT *  FROM users')
+        assert db.calls == 1
+        other = CountingDb({'host': 'cache'})
+        other.all('SELECT * FROM users')
+        assert other.calls == 0
+        assert db.result_cache.stats['hits'] == 2
+
+    def test_rows_are_copies(self):
+        """Changing a returned row does not change the cache"""
+        db = CountingDb({'host': 'cache'})
+        db.all('SELECT * FROM users')[0]['id'] = 99
+        assert db.line('SELECT * FROM users')['id'] == 1
+
+    def test_row_mode(self):
+        db = CountingDb({'host': 'cache'})
+        db.all('SELECT * FROM users')
+        db.row = 'tuple'
+        assert db.all('SELECT * FROM users') == [(1, 'a'), (2, 'b')]
+        assert db.calls == 1
+
+    def test_line_then_all(self):
+        """A line entry serves lines but not a full read"""
+        db = CountingDb({'host': 'cache'})
+        assert db.value('SELECT id FROM users') == 1
+        assert db.value('SELECT id FROM users') == 1
+        assert db.calls == 1
+        assert len(db.all('SELECT id FROM users')) == 2
+        assert db.calls == 2
+
+    def test_write_invalidates(self):
+        db = CountingDb({'host': 'cache'})
+        db.all('SELECT * FROM users')
+        db.all('SELECT * FROM roles')
+        db.exec('UPDATE users SET name = %s', ['x'])
+        db.all('SELECT * FROM users')
+        db.all('SELECT * FROM roles')
+        assert db.calls == 3
+        db.many('roles', [])
+        db.all('SELECT * FROM roles')
+        assert db.calls == 4
+
+    def test_disabled(self):
+        class PlainDb(CountingDb):
+            cache = False
+
+        db = PlainDb({'host': 'plain'})
+        db.all('SELECT 1')
+        db.all('SELECT 1')
+        assert db.calls == 2
+        assert db.result_cache is None
@@ -0,0 +1,65 @@
+import pytest
+from ...db.catalog import Catalog, CatalogTables
+from ...db.reverse import Reverse
+from ...db.snapshot import Snapshot
+from ...db.models.types import number, string
+from .test_snapshot import FingerprintDb
+from .test_reverse import SchemaDb
+
+pytestmark = pytest.mark.db
+
+
+@pytest.fixture
+def tables():
+    return Reverse(SchemaDb({'host': 'memory'}), 'shop').run()['shop']
+
+
+class TestCatalog:
+    def test_roundtrip(self, tables, tmp_path):
+        file = str(tmp_path / 'shop.cat')
+        Catalog.write(file, {f'shop.{k}': Snapshot.dump(v) for k, v in tables.items()}, {'shop.users': 'abc'}, {'shop': 'utf8mb4_general_ci'})
+        with Catalog(file) as cat:
+            assert len(cat) == 2 and list(cat) == ['shop.orders', 'shop.users']
+            assert 'shop.users' in cat and 'shop.nope' not in cat
+            assert cat.fingerprints == {'shop.orders': '', 'shop.users': 'abc'}
+            assert cat.record('shop.nope') is None and cat.table('shop.nope') is None
+            users = cat.table('shop.users')
+            assert cat.table('shop.users') is users
+            assert users.db.collate == 'utf8mb4_general_ci'
+            assert type(users.fields.email) is string.VarChar and users.fields.email.length == 120
+            assert users.keys.email.columns == ['email(20)']
+            assert cat.record('shop.orders') == Snapshot.dump(tables['orders'])
+
+    def test_values(self, tmp_path):
+        file = str(tmp_path / 'v.cat')
+        value = {'a': [None, True, False, 0, -1, 2 ** 40, -2 ** 40, 1.5, 'ç', {'b': []}]}
+        Catalog.write(file, {'s.t': value})
+        with Catalog(file) as cat:
+            assert cat.record('s.t') == value
+
+    def test_interned(self, tmp_path):
+        """Repeated strings are stored once"""
+        file = str(tmp_path / 'i.cat')
+        Catalog.write(file, {f's.t{i}': {'collate': 'utf8mb4_general_ci' * 10} for i in range(100)})
+        # 100 copies of the 180 characters would take 18000 bytes alone
+        assert (tmp_path / 'i.cat').stat().st_size < 4500
+
+    def test_not_catalog(self, tmp_path):
+        (tmp_path / 'x.cat').write_bytes(b'{"a": 1}')
+        with pytest.raises(ValueError):
+            Catalog(str(tmp_path / 'x.cat'))
+
+    def test_snapshot(self, tmp_path):
+        db = FingerprintDb({'host': 'memory'})
+        file = str(tmp_path / 'shop.cat')
+        Snapshot(db, 'shop', file).refresh()
+
+        snap = Snapshot(db, 'shop', file)
+        assert isinstance(snap.tables['shop'], CatalogTables)
+        db.created['users'] = '2024-02-01'
+        assert snap.refresh()['changed'] == ['shop.users']
+        assert type(snap.tables['shop']['orders'].fields.id) is number.BigInt
+
+        snap = Snapshot(db, 'shop', file)
+        assert sorted(snap.tables['shop']) == ['orders', 'users']
+        assert snap.refresh() == {'added': [], 'changed': [], 'removed': []}
@@ -0,0 +1,133 @@
+import time
+import pytest
+from ...db.conn import connect
+from ...db.main import Main
+from ...db.dummy import DummyConn
+from ...db.count import Counter
+
+pytestmark = pytest.mark.db
+
+
+class CountDb(Main):
+    """Driver that answers TABLE_ROWS, EXPLAIN and COUNT(*)"""
+
+    table_rows = {'big': 5_000_000, 'small': 120}
+    counts = {'big': 4_987_123, 'small': 118}
+
+    def _check_config(self, cfg: dict) -> dict:
+        self.log = []
+        return cfg
+
+    def connect(self, config):
+        return DummyConn()
+
+    def select_db(self, db) -> bool:
+        return True
+
+    def exec(self, sql, param=[]):
+        return True
+
+    def many(self, tbl, data, config={}):
+        return True
+
+    def query(self, sql, param=[]):
+        self.log.append(sql.split()[0] if not sql.startswith('SELECT TABLE_ROWS') else 'STATS')
+        if 'information_schema.TABLES' in sql:
+            yield {'TABLE_ROWS': self.table_rows[param[1]]}
+        elif sql.startswith('EXPLAIN'):
+            table = sql.split('`')[-2]
+            yield {'id': 1, 'rows': self.table_rows[table], 'filtered': 10.0}
+        else:
+            table = sql.split('`')[-2]
+            yield {'COUNT(*)': self.counts[table] // (10 if 'WHERE' in sql else 1)}
+
+
+@pytest.fixture
+def db():
+    return CountDb({'host': 'memory'})
+
+
+class TestCounter:
+    def test_strategies(self, db):
+        counter = Counter(db)
+        assert counter.count('big', strategy='stats').rows == 5_000_000
+        assert counter.count('big', 'status = %s', ['new'], strategy='explain').rows == 500_000
+        exact = counter.count('big', strategy='exact')
+        assert exact.rows == 4_987_123 and exact.exact and str(exact) == '4,987,123'
+        with pytest.raises(ValueError):
+            counter.count('big', strategy='guess')
+
+    def test_auto_small(self, db):
+        """A small table is counted exactly, then served from the cache"""
+        counter = Counter(db)
+        first = counter.count('small')
+        assert (first.rows, first.exact, first.source) == (118, True, 'exact')
+        second = counter.count('small')
+        assert (second.rows, second.exact, second.source) == (118, True, 'cache')
+        assert db.log == ['STATS', 'SELECT']
+
+    def test_auto_big(self, db):
+        """A big table shows the estimate until refresh() counts it"""
+        counter = Counter(db)
+        estimate = counter.count('shop.big')
+        assert (estimate.rows, estimate.exact, estimate.source) == (5_000_000, False, 'stats')
+        assert str(estimate) == '~5,000,000'
+        filtered = counter.count('big', 'status = %s', ['new'])
+        assert (filtered.rows, filtered.source) == (500_000, 'explain')
+        assert 'SELECT' not in db.log
+        assert counter.refresh() == 2
+        assert counter.count('shop.big').exact
+        assert counter.count('big', 'status = %s', ['new']).rows == 498_712
+        assert counter.refresh() == 0
+
+    def test_stale(self, db, monkeypatch):
+        clock = [1000.0]
+        monkeypatch.setattr(time, 'monotonic', lambda: clock[0])
+        counter = Counter(db, ttl=60)
+        counter.count('big', strategy='exact')
+        clock[0] += 61
+        stale = counter.count('big', strategy='cache')
+        assert stale.rows == 4_987_123 and not stale.exact
+        assert counter.refresh() == 1
+
+    def test_start(self, db, tmp_path):
+        with pytest.raises(ValueError):
+            Counter(db).start()
+        dsn = f'sqlite:///{tmp_path}/count.db'
+        sqlite = connect(dsn)
+        sqlite.exec('CREATE TABLE t (id INTEGER PRIMARY KEY)')
+        sqlite.many('t', [{'id': i} for i in range(1, 31)])
+        counter = Counter(sqlite, ttl=60, dsn=dsn)
+        assert counter.count('t', strategy='cache').rows is None
+        counter.start(0.01)
+        for _ in range(500):
+            if counter.count('t', strategy='cache').rows:
+                break
+            time.sleep(0.01)
+        counter.stop()
+        assert counter.count('t', strategy='cache').rows == 30
+        sqlite.close()
+
+    def test_bounded(self, db):
+        """The cache keeps the `size` most recently asked counts"""
+        counter = Counter(db, size=3)
+        for status in 'abcde':
+            counter.count('big', 'status = %s', [status])
+        assert [k[2] for k in counter.cache] == [('c',), ('d',), ('e',)]
+        counter.count('big', 'status = %s', ['c'])
+        counter.count('big', 'status = %s', ['f'])
+        assert [k[2] for k in counter.cache] == [('e',), ('c',), ('f',)]
+
+    def test_unused_dropped(self, db, monkeypatch):
+        """refresh() only counts again what was asked for within ttl"""
+        clock = [1000.0]
+        monkeypatch.setattr(time, 'monotonic', lambda: clock[0])
+        counter = Counter(db, ttl=60)
+        counter.count('big')
+        counter.count('big', 'status = %s', ['new'])
+        assert counter.refresh() == 2
+        clock[0] += 61
+        counter.count('big')
+        del db.log[:]
+        assert counter.refresh() == 1
+        assert db.log == ['SELECT'] and len(counter.cache) == 1
@@ -0,0 +1,109 @@
+import datetime
+import ipaddress
+import uuid
+from decimal import Decimal
+import pytest
+from ...db.decode import Decoder
+from ...db.models.types import number as n, string as s, time as t
+
+pytestmark = pytest.mark.db
+
+
+class TestDecoder:
+    def test_plan(self):
+        decode = Decoder([n.Int, n.Decimal, s.VarChar, t.DateTime, t.Time, s.INET6, s.UUID, s.JSON(), None])
+        rows = decode([
+            (b'1', b'10.50', b'\xc3\xa9t\xc3\xa9', b'2024-01-02 03:04:05.5', b'-01:02:03', b'::1', b'12345678-1234-5678-1234-567812345678', b'{"a": 1}', b'x'),
+            (None, None, None, None, b'838:59:59', b'10.0.0.1', None, None, None),
+        ])
+        assert rows[0] == (
+            1, Decimal('10.50'), 'été', datetime.datetime(2024, 1, 2, 3, 4, 5, 500000),
+            -datetime.timedelta(hours=1, minutes=2, seconds=3), ipaddress.ip_address('::1'),
+            uuid.UUID('12345678-1234-5678-1234-567812345678'), {'a': 1}, b'x',
+        )
+        assert rows[1][:4] == (None,) * 4 and rows[1][4] == datetime.timedelta(hours=838, minutes=59, seconds=59)
+        assert rows[1][5] == ipaddress.ip_address('10.0.0.1')
+
+    def test_fallback(self):
+        """Rejected values go through the fallback of their column"""
+        decode = Decoder([t.Date], fallback=[lambda v: None])
+        assert decode([(b'2024-02-03',), (b'0000-00-00',)]) == [(datetime.date(2024, 2, 3),), (None,)]
+
+    def test_subclass(self):
+        """A type uses the converter of its nearest class"""
+        assert Decoder.converter(n.TinyInt)(b'7') == 7
+        assert Decoder.converter(s.Set)(b'a,b') == {'a', 'b'}
+        assert Decoder.converter(n.Bit)(b'\x01\x00') == 256
+        assert Decoder.converter(s.Blob)(bytearray(b'ab')) == b'ab'
+
+
+@pytest.fixture
+def connector():
+    return pytest.importorskip('mysql.connector')
+
+
+class TestMySQLDecode:
+    def test_same_as_connector(self, connector):
+        """The plan decodes like the generic converter of the pure connector"""
+        from mysql.connector.constants import FieldType, FieldFlag
+        from mysql.connector.conversion import MySQLConverter
+        from ...db.mysql import MySQL
+        description = [
+            ('id', FieldType.LONGLONG, None, None, None, None, 0, FieldFlag.UNSIGNED, 63),
+            ('price', FieldType.NEWDECIMAL, None, None, None, None, 1, 0, 63),
+            ('ratio', FieldType.DOUBLE, None, None, None, None, 1, 0, 63),
+            ('name', FieldType.VAR_STRING, None, None, None, None, 1, 0, 45),
+            ('tags', FieldType.STRING, None, None, None, None, 1, FieldFlag.SET, 45),
+            ('raw', FieldType.BLOB, None, None, None, None, 1, FieldFlag.BLOB | FieldFlag.BINARY, 63),
+            ('day', FieldType.DATE, None, None, None, None, 1, 0, 63),
+            ('at', FieldType.DATETIME, None, None, None, None, 1, 0, 63),
+            ('span', FieldType.TIME, None, None, None, None, 1, 0, 63),
+            ('year', FieldType.YEAR, None, None, None, None, 1, 0, 63),
+            ('doc', FieldType.JSON, None, None, None, None, 1, 0, 45),
+        ]
+        rows = [
+            (b'1', b'3.14', b'1.5', b'ana', b'a,b', b'\x00\x01', b'2024-01-02', b'2024-01-02 03:04:05', b'12:00:01.25', b'2024', b'{"a": 1}'),
+            (b'2', None, b'-2e10', b'\xc3\xa7', b'a', b'', b'2024-12-31', b'2024-01-02 03:04:05.000001', b'-00:00:01', b'1999', None),
+        ]
+
+        class Cursor:
+            def __init__(self, raw):
+                self.raw = raw
+                self.description = None
+
+            def execute(self, sql, param=None):
+                self.description, self.rows = description, list(rows)
+
+            def fetchmany(self, size):
+                out, self.rows = self.rows[:size], self.rows[size:]
+                return out
+
+            def close(self):
+                pass
+
+        class Conn(connector.MySQLConnection):
+            python_charset = 'utf-8'
+            unread_result = False
+
+            def __init__(self):
+                self.converter = MySQLConverter('utf8mb4', True)
+                self.cursors = []
+
+            def cursor(self, buffered=None, raw=None):
+                self.cursors.append(Cursor(raw))
+                return self.cursors[-1]
+
+            def close(self):
+                pass
+
+        class FakeMySQL(MySQL):
+            def connect(self, config):
+                return Conn()
+
+        db = FakeMySQL({'host': 'fake'})
+        decode = db.decoder(db.conn, description)
+        expected = [MySQLConverter('utf8mb4', True).row_to_python(r, description) for r in rows]
+        assert decode(rows) == [tuple(r) for r in expected]
+        db.row = 'tuple'
+        assert db.all('SELECT * FROM t') == [tuple(r) for r in expected]
+        assert db.conn.cursors[-1].raw
@@ -0,0 +1,64 @@
+import os
+import sys
+import json
+import pytest
+from ...core import fn
+from ...core.conf import Conf
+from ...db.dsn import Dsn
+
+pytestmark = pytest.mark.db
+
+CONTENT = {
+    'base': {'scheme': 'mysql', 'host': 'db1', 'port': 3306, 'user': 'app', 'password': 'secret'},
+    'reports': {'inherit': 'base', 'DB': 'reports'},
+    'replica': {'inherit': 'reports', 'host': 'db2'},
+    'loop': {'inherit': 'loop', 'host': 'db3'},
+}
+
+
+@pytest.fixture(autouse=True)
+def dsn_file(tmp_path, monkeypatch):
+    conf_dir = tmp_path / 'conf'
+    conf_dir.mkdir()
+    file = conf_dir / 'dsn.json'
+    file.write_text(json.dumps(CONTENT), encoding='utf-8')
+    monkeypatch.setattr(sys, 'path', [str(tmp_path)] + sys.path[1:])
+    monkeypatch.setattr(Conf, 'cache', {})
+    monkeypatch.setattr(Conf, 'path', {})
+    Dsn.clear()
+    yield file
+    Dsn.clear()
+
+
+class TestDsn:
+    def test_inherit(self):
+        """Contexts are merged with their parents, the nearest one winning"""
+        cfg = fn.dsn('replica')
+        assert cfg['host'] == 'db2'
+        assert cfg['database'] == 'reports'
+        assert cfg['user'] == 'app'
+        assert cfg['dsn'] == 'replica'
+        assert fn.dsn('loop')['host'] == 'db3'
+
+    def test_cached_copies(self):
+        """Callers get copies, so the cache and dsn.json stay untouched"""
+        cfg, anonymized = Dsn.resolve('base')
+        cfg['host'] = 'changed'
+        assert Dsn.resolve('base')[0]['host'] == 'db1'
+        assert anonymized['password'] != 'secret'
+        assert 'dsn' not in Conf('dsn.json')()['base']
+
+    def test_mtime(self, dsn_file):
+        """A change of dsn.json is seen by the next resolution"""
+        assert fn.dsn('base')['host'] == 'db1'
+        content = {**CONTENT, 'base': {**CONTENT['base'], 'host': 'db9'}}
+        dsn_file.write_text(json.dumps(content), encoding='utf-8')
+        stat = os.stat(dsn_file)
+        os.utime(dsn_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        assert fn.dsn('base')['host'] == 'db9'
+        assert fn.dsn('replica')['user'] == 'app'
+
+    def test_uri(self):
+        cfg = fn.dsn('mysql://user:pw@host:3307/db')
+        assert (cfg['host'], cfg['port'], cfg['database']) == ('host', 3307, 'db')
+        assert cfg['dsn'] == 'mysql://user@host:3307/db'
@@ -0,0 +1,67 @@
+import pytest
+from ...db.conn import connect
+from ...db.dummy import Dummy
+from ...db.models.types import number as n, string as s, time as t
+
+pytestmark = pytest.mark.db
+
+TABLES = {
+    'users': {
+        'id': n.Int(auto_increment=True),
+        'name': s.VarChar(20, not_null=True),
+        'city': {'type': s.VarChar(20), 'cardinality': 3},
+        'age': n.TinyInt(unsigned=True, min=18, max=90),
+        'created': t.DateTime(),
+    },
+    'small': {'rows': 10, 'columns': {'flag': n.Bool()}},
+}
+
+
+@pytest.fixture
+def db():
+    return connect({'scheme': 'dummy', 'rows': 2500, 'seed': 7, 'tables': TABLES})
+
+
+class TestDummy:
+    def test_scheme(self, db):
+        assert isinstance(db, Dummy)
+
+    def test_rows(self, db):
+        rows = db.all('SELECT * FROM users')
+        assert len(rows) == 2500
+        assert [r['id'] for r in rows[:3]] == [1, 2, 3]
+        assert all(18 <= r['age'] <= 90 for r in rows)
+        assert len({r['city'] for r in rows}) == 3
+        assert len(db.all('SELECT flag FROM small')) == 10
+
+    def test_deterministic(self, db):
+        """The same seed yields the same rows, whatever the window"""
+        other = connect({'scheme': 'dummy', 'rows': 2500, 'seed': 7, 'tables': TABLES})
+        assert db.all('SELECT * FROM users') == other.all('SELECT * FROM users')
+        assert db.all('SELECT name, age FROM users LIMIT 1200, 3') == \
+            [{'name': r['name'], 'age': r['age']} for r in other.all('SELECT * FROM users')[1200:1203]]
+        seeded = connect({'scheme': 'dummy', 'rows': 2500, 'seed': 8, 'tables': TABLES})
+        assert db.all('SELECT name FROM users') != seeded.all('SELECT name FROM users')
+
+    def test_batches(self, db):
+        sizes = [len(b) for b in db.query_batches('SELECT id FROM users LIMIT 2100 OFFSET 100', size=1000)]
+        assert sizes == [1000, 1000, 100]
+
+    def test_count(self, db):
+        assert db.value('SELECT COUNT(*) FROM users') == 2500
+
+    def test_nulls(self, db):
+        db.table('t', {'a': {'type': s.VarChar(), 'null': 0.5}, 'b': {'type': s.VarChar(not_null=True), 'null': 0.5}}, 100)
+        rows = db.all('SELECT * FROM t')
+        assert any(r['a'] is None for r in rows)
+        assert all(r['b'] is not None for r in rows)
+
+    def test_unknown(self, db):
+        assert db.all('SELECT * FROM nope') == []
+        assert db.all('SELECT nope FROM users') == []
+        assert db.error is not None
+
+    def test_writes(self, db):
+        assert db.exec('UPDATE users SET a = 1')
+        result = db.many('users', ({'id': i} for i in range(12)), {'max_rows': 5})
+        assert (result.rows, result.batches) == (12, 3)
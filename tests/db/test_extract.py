@@ -0,0 +1,116 @@
+import re
+import pytest
+from ...db.main import Main
+from ...db.extract import Extractor
+
+pytestmark = pytest.mark.db
+
+IDS = list(range(1, 101)) + [500, 900]
+
+
+class RangeDb(Main):
+    """Driver that answers the statements of Extractor over the ids in IDS"""
+
+    def _check_config(self, cfg: dict) -> dict:
+        return cfg
+
+    def connect(self, config):
+        return None
+
+    def select_db(self, db) -> bool:
+        return True
+
+    def exec(self, sql, param=[]):
+        return True
+
+    def many(self, tbl, data, config={}):
+        return True
+
+    def query(self, sql, param=[]):
+        if 'KEY_COLUMN_USAGE' in sql:
+            yield {'COLUMN_NAME': 'id'}
+        elif 'TABLE_ROWS' in sql:
+            yield {'TABLE_ROWS': len(IDS)}
+        elif 'MIN(' in sql:
+            yield {'lo': min(IDS), 'hi': max(IDS)}
+        elif 'OFFSET' in sql:
+            yield {'id': IDS[param[-1]]}
+        elif sql == 'BROKEN':
+            raise LookupError('lost')
+        else:
+            param = list(param)
+            lower = param.pop(0) if '>=' in sql else None
+            upper = param.pop(0) if re.search(r'< %s', sql) else None
+            for i in IDS:
+                if (lower is None or i >= lower) and (upper is None or i < upper):
+                    yield {'id': i}
+
+
+class RangeExtractor(Extractor):
+    def open(self):
+        return RangeDb({'host': 'memory'})
+
+
+class TestExtractor:
+    def test_ranges(self):
+        """Min/max splits an integer key into open ended ranges"""
+        ext = RangeExtractor('memory', 't', parts=3)
+        ranges = ext.plan()
+        assert ext.key == 'id'
+        assert ranges[0][0] is None and ranges[-1][1] is None
+        assert len(ranges) == 3
+
+    def test_range_sql(self):
+        ext = RangeExtractor('memory', 't', key='id', where='active = %s', param=[1])
+        sql, param = ext.range_sql(10, 20)
+        assert sql == 'SELECT * FROM t WHERE `id` >= %s AND `id` < %s AND (active = %s) ORDER BY `id`'
+        assert param == [10, 20, 1]
+
+    @pytest.mark.parametrize('split', ['minmax', 'offset'])
+    def test_ordered(self, split):
+        """Every row comes once, in key order"""
+        ext = RangeExtractor('memory', 't', parts=4, split=split, size=7)
+        assert [r['id'] for r in ext.rows()] == IDS
+        assert ext.ok and sum(ext.counts.values()) == len(IDS)
+
+    def test_unordered(self):
+        ext = RangeExtractor('memory', 't', parts=4)
+        batches = []
+        assert ext.run(batches.append, ordered=False) == len(IDS)
+        assert sorted(r['id'] for b in batches for r in b) == IDS
+
+    def test_offset_balanced(self):
+        """Sampled offsets split a skewed key into ranges of the same size"""
+        ext = RangeExtractor('memory', 't', parts=2, split='offset')
+        list(ext.rows())
+        assert ext.counts == {0: 51, 1: 51}
+
+    def test_existing_pool(self):
+        """Workers are capped at the size of a pool that already exists"""
+        from ...db.pool import Pool
+
+        class PooledExtractor(Extractor):
+            def open(self):
+                return RangeDb({'host': 'memory-pool'}, pool=self.pool)
+
+        try:
+            RangeDb({'host': 'memory-pool'}, pool={'max_size': 2}).close()
+            ext = PooledExtractor('memory', 't', parts=4)
+            rows = list(ext.rows())
+            assert ext.workers == 2 and len(ext.ranges) == 4
+            assert [r['id'] for r in rows] == IDS
+        finally:
+            Pool.close_all()
+
+    def test_error(self):
+        """A failed range is reported and the others are still read"""
+        class Broken(RangeExtractor):
+            def range_sql(self, lower, upper):
+                sql, param = super().range_sql(lower, upper)
+                return ('BROKEN', param) if lower is not None else (sql, param)
+
+        ext = Broken('memory', 't', parts=2)
+        rows = list(ext.rows())
+        assert list(ext.errors) == [1]
+        assert isinstance(ext.errors[1], LookupError)
+        assert [r['id'] for r in rows] == IDS[:ext.counts[0]]
@@ -0,0 +1,115 @@
+import pytest
+from datetime import datetime, timedelta
+from ...db.infile import Infile
+
+pytestmark = pytest.mark.db
+
+
+class TestInfile:
+    def test_values(self):
+        """Values follow the LOAD DATA text format"""
+        assert Infile.value(None) == '\\N'
+        assert Infile.value('a\tb\\c\nd') == 'a\\tb\\\\c\\nd'
+        assert Infile.value(True) == '1'
+        assert Infile.value(1.5) == '1.5'
+        assert Infile.value(datetime(2024, 1, 2, 3, 4, 5)) == '2024-01-02 03:04:05'
+        assert Infile.value(timedelta(hours=-1, minutes=-2)) == '-01:02:00'
+
+    def test_stream(self):
+        """The pipe delivers every row, sequences and dictionaries alike"""
+        rows = iter([(1, 'a', None), {'id': 2, 'name': 'b', 'skip': 0}])
+        with Infile(rows, ['id', 'name', 'note']) as f:
+            with open(f.path, 'rb') as reader:
+                data = reader.read()
+        assert data == b'1\ta\t\\N\n2\tb\t\\N\n'
+        assert f.count == 2
+        assert f.error is None
+
+    def test_binary(self):
+        with Infile([(b'\xff\x00',)], ['data']) as f:
+            with open(f.path, 'rb') as reader:
+                assert reader.read() == b'\xff\\0\n'
+
+    def test_binary_charset(self):
+        """Binary values are written unchanged whatever the encoding of the text"""
+        with Infile([('é', b'\xc3\xa9\t', b'\x81')], ['a', 'b', 'c'], encoding='cp1252') as f:
+            with open(f.path, 'rb') as reader:
+                assert reader.read() == b'\xe9\t\xc3\xa9\\t\t\x81\n'
+        assert f.error is None
+
+    def test_unread(self):
+        """Leaving without reading the pipe does not hang the writer"""
+        with Infile(iter([(1,)]), ['id']):
+            pass
+
+    def test_error(self):
+        """Serialization errors are kept for the caller"""
+        with Infile((1 / 0 for _ in range(1)), ['id']) as f:
+            with open(f.path, 'rb') as reader:
+                assert reader.read() == b''
+        assert isinstance(f.error, ZeroDivisionError)
+
+
+class FakeLoadCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.rowcount = -1
+
+    def execute(self, sql, param=None):
+        # reads the pipe like the connector sends it to the server
+        with open(sql.split("'")[1], 'rb') as reader:
+            self.conn.data = reader.read()
+        self.conn.sql = sql
+        self.rowcount = self.conn.data.count(b'\n')
+
+    def close(self):
+        pass
+
+
+class FakeLoadConn:
+    def __init__(self):
+        self.data = None
+        self.sql = None
+
+    def cursor(self):
+        return FakeLoadCursor(self)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def mysql_db():
+    pytest.importorskip('mysql.connector')
+    from ...db.mysql import MySQL
+
+    class FakeMySQL(MySQL):
+        def connect(self, config):
+            return FakeLoadConn()
+
+    return FakeMySQL
+
+
+class TestLoadStream:
+    def test_charset(self, mysql_db, tmp_path):
+        """The stream is encoded in the character set the statement declares"""
+        with mysql_db({'host': 'h', 'allow_local_infile_in_path': str(tmp_path)}) as db:
+            assert db.load_stream('t', [(1, 'café')], ['id', 'name'], {'charset': 'latin1'}) == 1
+            assert 'CHARACTER SET latin1' in db.conn.sql
+            assert db.conn.data == b'1\tcaf\xe9\n'
+            assert db.load_stream('t', [(2, 'café')], ['id', 'name']) == 1
+            assert db.conn.data == '2\tcafé\n'.encode('utf-8')
+
+    def test_opt_in(self, mysql_db):
+        """Local infile stays disabled unless the DSN enables it"""
+        with mysql_db({'host': 'h'}) as db:
+            assert 'allow_local_infile_in_path' not in db._check_config({'host': 'h'})
+            assert db.load_stream('t', [(1, 'a')], ['id', 'name']) is False
+            assert isinstance(db.error, ValueError)
+            assert db.conn.data is None
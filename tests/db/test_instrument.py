@@ -0,0 +1,107 @@
+import pytest
+from ...db.main import Main
+from ...db.instrument import Event, Instrument, SlowLog, Stats
+
+pytestmark = pytest.mark.db
+
+
+class ListDb(Main):
+    """Driver that answers every query with 5 rows"""
+
+    def _check_config(self, cfg: dict) -> dict:
+        return cfg
+
+    def connect(self, config):
+        return None
+
+    def select_db(self, db) -> bool:
+        return True
+
+    def exec(self, sql, param=[]):
+        return True
+
+    def many(self, tbl, data, config={}):
+        return True
+
+    def query(self, sql, param=[]):
+        if 'FAIL' in sql:
+            raise RuntimeError('fail')
+        for i in range(5):
+            yield {'id': i}
+
+
+class Recorder(Instrument):
+    def __init__(self):
+        self.events = []
+
+    def before(self, event):
+        self.events.append(('before', event.kind, event.fingerprint))
+
+    def after(self, event):
+        self.events.append(('after', event.rows, event.error))
+
+
+@pytest.fixture
+def db():
+    return ListDb({'host': 'memory', 'dsn': 'memory'})
+
+
+class TestEvent:
+    @pytest.mark.parametrize('sql, fingerprint', [
+        ("SELECT * FROM t WHERE id IN (1, 2, 3) AND name = 'a'", 'SELECT * FROM t WHERE id IN (?+) AND name = ?'),
+        ('SELECT  *\n FROM t1 WHERE x = %s', 'SELECT * FROM t1 WHERE x = ?'),
+        ('INSERT t (`a`, `b`) VALUES (%s, %s), (%s, %s), (%s, %s)', 'INSERT t (`a`, `b`) VALUES (?+), ...'),
+        ("SELECT 'it''s', 1.5e3", 'SELECT ?, ?'),
+    ])
+    def test_normalize(self, sql, fingerprint):
+        assert Event.normalize(sql) == fingerprint
+
+
+class TestHooks:
+    def test_disabled(self, db):
+        """Without hooks the batches come straight from the driver"""
+        assert db.hooks == []
+        assert len(db.all('SELECT 1')) == 5
+
+    def test_before_after(self, db):
+        recorder = Recorder()
+        db.hooks = [recorder]
+        db.all('SELECT * FROM t WHERE id = 5')
+        assert recorder.events == [
+            ('before', 'query', 'SELECT * FROM t WHERE id = ?'),
+            ('after', 5, None),
+        ]
+
+    def test_abandoned(self, db):
+        """A result left unread still ends its event"""
+        recorder = Recorder()
+        db.hooks = [recorder]
+        assert db.line('SELECT 1') == {'id': 0}
+        assert recorder.events[-1] == ('after', 1, None)
+
+    def test_error(self, db):
+        recorder = Recorder()
+        db.hooks = [recorder]
+        with pytest.raises(RuntimeError):
+            db.all('SELECT FAIL')
+        assert isinstance(recorder.events[-1][2], RuntimeError)
+
+    def test_slow_log(self, db):
+        slow = SlowLog(0, log=False)
+        db.hooks = [slow, SlowLog(3600, log=False)]
+        db.all('SELECT 1')
+        assert [e['fingerprint'] for e in slow.entries] == ['SELECT ?']
+        assert slow.entries[0]['dsn'] == 'memory'
+        assert not db.hooks[1].entries
+
+    def test_stats(self, db):
+        stats = Stats()
+        db.hooks = [stats]
+        for i in range(3):
+            db.all(f'SELECT * FROM t WHERE id = {i}')
+        db.all('SELECT 2')
+        top = stats.top(1, by='count')
+        assert len(stats) == 2
+        assert top[0]['fingerprint'] == 'SELECT * FROM t WHERE id = ?'
+        assert (top[0]['count'], top[0]['rows']) == (3, 15)
+        assert 'SELECT ?' in stats.report()
@@ -0,0 +1,206 @@
+import pytest
+from ...db.main import Main
+
+pytestmark = pytest.mark.db
+
+ROWS = [
+    {'id': 1, 'name': 'a', 'amount': 1.5},
+    {'id': 2, 'name': 'b', 'amount': None},
+    {'id': 3, 'name': 'c', 'amount': 4.0},
+]
+
+
+class MemoryDb(Main):
+    """Driver that answers every query with ROWS"""
+
+    def _check_config(self, cfg: dict) -> dict:
+        return cfg
+
+    def connect(self, config):
+        return None
+
+    def select_db(self, db) -> bool:
+        return True
+
+    def exec(self, sql, param=[]):
+        return True
+
+    def many(self, tbl, data, config={}):
+        return True
+
+    def query(self, sql, param=[]):
+        return iter([dict(r) for r in ROWS])
+
+
+@pytest.fixture
+def db():
+    return MemoryDb({'host': 'memory'})
+
+
+class TestBatches:
+    def test_sizes(self, db):
+        """Rows are regrouped into batches of the requested size"""
+        sizes = [len(b) for b in db.query_batches('SELECT', size=2)]
+        assert sizes == [2, 1]
+
+    def test_all(self, db):
+        """all() keeps the rows as dictionaries"""
+        assert db.all('SELECT') == ROWS
+        assert [d[0] for d in db.description] == ['id', 'name', 'amount']
+
+    def test_line_value(self, db):
+        assert db.line('SELECT') == ROWS[0]
+        assert db.value('SELECT') == 1
+
+
+class FakeStreamCursor:
+    """Unbuffered cursor over `rows`, leaving the unread rows on the connection"""
+
+    def __init__(self, conn, buffered):
+        self.conn = conn
+        self.buffered = buffered
+        self.description = None
+
+    def execute(self, sql, param=None):
+        self.description = [(k, 253, None, None, None, None, 1, 0, 45) for k in ('id', 'name')]
+        self.conn.pending = list(self.conn.rows)
+        self.conn.unread_result = True
+
+    def fetchmany(self, size):
+        self.conn.sizes.append(size)
+        out, self.conn.pending = self.conn.pending[:size], self.conn.pending[size:]
+        if not out:
+            self.conn.unread_result = False
+        return out
+
+    def fetchall(self):
+        return self.fetchmany(len(self.conn.pending))
+
+    def close(self):
+        self.conn.closed += 1
+
+
+class FakeStreamConn:
+    def __init__(self, rows):
+        self.rows = rows
+        self.pending = []
+        self.sizes = []
+        self.cursors = []
+        self.unread_result = False
+        self.consumed = 0
+        self.closed = 0
+
+    def cursor(self, buffered=None, raw=None):
+        cursor = FakeStreamCursor(self, buffered)
+        self.cursors.append(cursor)
+        return cursor
+
+    def consume_results(self):
+        self.consumed += 1
+        self.pending = []
+        self.unread_result = False
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def stream_db():
+    pytest.importorskip('mysql.connector')
+    from ...db.mysql import MySQL
+
+    class FakeMySQL(MySQL):
+        stream = True
+
+        def connect(self, config):
+            return FakeStreamConn([(i, f'n{i}') for i in range(5)])
+
+    return FakeMySQL({'host': 'h'})
+
+
+class TestStream:
+    def test_unbuffered(self, stream_db):
+        """A stream is read from an unbuffered cursor in batches of `size`"""
+        batches = list(stream_db.query_batches('SELECT id, name FROM t', size=2))
+        assert [len(b) for b in batches] == [2, 2, 1]
+        assert batches[0][0] == {'id': 0, 'name': 'n0'}
+        conn = stream_db.conn
+        assert conn.cursors[0].buffered is False
+        assert conn.sizes == [2, 2, 2, 2]
+        assert conn.consumed == 0 and conn.closed == 1
+
+    def test_batch_size(self, stream_db):
+        """Without `size` the batches follow `batch_size`"""
+        stream_db.batch_size = 3
+        assert [len(b) for b in stream_db.query_batches('SELECT id, name FROM t')] == [3, 2]
+        assert len(stream_db.all('SELECT id, name FROM t')) == 5
+
+    def test_abandoned(self, stream_db):
+        """Rows left by a generator closed early are drained before the connection is reused"""
+        conn = stream_db.conn
+        for row in stream_db.query('SELECT id, name FROM t'):
+            break
+        assert conn.unread_result is False
+        assert conn.consumed == 1 and conn.closed == 1
+        assert stream_db.value('SELECT id, name FROM t') == 0
+        assert conn.consumed == 2
+
+    def test_buffered(self, stream_db):
+        stream_db.stream = False
+        assert len(stream_db.all('SELECT id, name FROM t')) == 5
+        assert stream_db.conn.cursors[0].buffered is None
+
+
+class TestColumns:
+    def test_arrays(self, db):
+        """One array per column with NULLs as NaN on numeric columns"""
+        np = pytest.importorskip('numpy')
+        db._dtype = lambda column: 'float64' if column[0] == 'amount' else 'O'
+        cols = db.query_columns('SELECT')
+        assert list(cols) == ['id', 'name', 'amount']
+        assert cols['amount'].dtype == np.float64
+        assert np.nansum(cols['amount']) == 5.5
+        assert list(cols['name']) == ['a', 'b', 'c']
+
+    def test_int_with_null(self, db):
+        """Integer columns holding NULL fall back to float64"""
+        np = pytest.importorskip('numpy')
+        db._dtype = lambda column: 'int64'
+        cols = db.query_columns('SELECT')
+        assert cols['id'].dtype == np.int64
+        assert cols['amount'].dtype == np.float64
+        assert cols['name'].dtype == object
+
+    def test_frame(self, db):
+        pytest.importorskip('numpy')
+        frame = db.frame('SELECT')
+        assert list(frame.name) == ['a', 'b', 'c']
+        assert list(frame['id']) == [1, 2, 3]
+
+
+class TestRowModes:
+    def test_tuple(self, db):
+        db.row = 'tuple'
+        assert db.all('SELECT')[0] == (1, 'a', 1.5)
+        assert db.value('SELECT') == 1
+
+    def test_record(self, db):
+        """Records allow positional, key and attribute access"""
+        db.row = 'record'
+        rows = db.all('SELECT')
+        assert rows[1] == (2, 'b', None)
+        assert rows[1]['name'] == 'b'
+        assert rows[1].name == 'b'
+        assert rows[1].get('missing', 0) == 0
+        assert rows[1].as_dict() == ROWS[1]
+        assert type(rows[0]) is type(rows[2])
+        assert db.line('SELECT').id == 1
+        assert db.value('SELECT') == 1
+
+    def test_record_no_dict(self, db):
+        """Records carry no per-instance dictionary"""
+        db.row = 'record'
+        row = db.line('SELECT')
+        assert not hasattr(row, '__dict__')
+        with pytest.raises(AttributeError):
+            row.missing
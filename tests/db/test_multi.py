@@ -0,0 +1,92 @@
+import time
+import pytest
+from ...db.main import Main
+from ...db.multi import Multi
+
+pytestmark = pytest.mark.db
+
+
+class HostDb(Main):
+    """Driver that answers with the host of its config, after `delay` seconds"""
+
+    def _check_config(self, cfg: dict) -> dict:
+        return cfg
+
+    def connect(self, config):
+        self.host = config['host']
+        if config.get('fail'):
+            self.error = ConnectionRefusedError(self.host)
+        return None
+
+    def select_db(self, db) -> bool:
+        return True
+
+    def exec(self, sql, param=[]):
+        return True
+
+    def many(self, tbl, data, config={}):
+        return True
+
+    def query(self, sql, param=[]):
+        time.sleep(self.dsn.get('delay', 0))
+        for i in range(3):
+            yield {'host': self.host, 'sql': sql, 'i': i}
+
+
+class HostMulti(Multi):
+    def open(self, dsn):
+        return HostDb(dsn, self.db, self.pool)
+
+
+def hosts(*names, **options):
+    return [{'host': n, **options.get(n, {})} for n in names]
+
+
+class TestMulti:
+    def test_merged(self):
+        """Rows of every DSN are merged and tagged with their source"""
+        multi = HostMulti(hosts('a', 'b', 'c'), workers=2)
+        rows = multi.all('SELECT 1')
+        assert len(rows) == 9
+        assert {r['_dsn'] for r in rows} == {'a', 'b', 'c'}
+        assert all(r['_dsn'] == r['host'] for r in rows)
+        assert multi.ok and multi.rows == {'a': 3, 'b': 3, 'c': 3}
+
+    def test_concurrent(self):
+        """Slow DSNs run at the same time, not one after another"""
+        multi = HostMulti(hosts('a', 'b', 'c', 'd', **{n: {'delay': 0.2} for n in 'abcd'}), workers=4)
+        start = time.monotonic()
+        assert len(multi.all('SELECT 1')) == 12
+        assert time.monotonic() - start < 0.6
+
+    def test_per_dsn_sql(self):
+        """A dict of SQL runs a statement per DSN and skips the missing ones"""
+        multi = HostMulti(hosts('a', 'b', 'c'))
+        rows = multi.all({'a': 'SELECT a', 'b': ('SELECT b', [1])})
+        assert {(r['_dsn'], r['sql']) for r in rows} == {('a', 'SELECT a'), ('b', 'SELECT b')}
+
+    def test_partial_failure(self):
+        """A failing DSN is reported and the others still return rows"""
+        multi = HostMulti(hosts('a', 'b', b={'fail': True}))
+        rows = multi.all('SELECT 1')
+        assert {r['_dsn'] for r in rows} == {'a'}
+        assert list(multi.errors) == ['b']
+        assert isinstance(multi.errors['b'], ConnectionError)
+        assert not multi.ok
+
+    def test_timeout(self):
+        """A DSN slower than the timeout is cut without waiting for it"""
+        multi = HostMulti(hosts('a', 'b', b={'delay': 1}), timeout=0.2)
+        start = time.monotonic()
+        rows = multi.all('SELECT 1')
+        assert time.monotonic() - start < 0.8
+        assert {r['_dsn'] for r in rows} == {'a'}
+        assert isinstance(multi.errors['b'], TimeoutError)
+
+    def test_early_stop(self):
+        """Closing the generator releases the workers"""
+        multi = HostMulti(hosts(*'abcdef'), workers=2)
+        gen = multi.batches('SELECT 1', size=1)
+        name, batch = next(gen)
+        assert len(batch) == 1
+        gen.close()
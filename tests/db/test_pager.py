@@ -0,0 +1,72 @@
+import pytest
+from ...db.conn import connect
+from ...db.pager import Pager
+from ...db.reverse import Reverse
+from ...db.models.keys import Key
+from ...db.models.types import number as n, string as s
+
+pytestmark = pytest.mark.db
+
+ORDERS = Reverse.build({
+    'name': 'orders',
+    'fields': {'region': s.VarChar(2, not_null=True), 'id': n.Int(not_null=True), 'code': s.VarChar(8, not_null=True)},
+    'keys': {'code': Key(['code'], unique=True), 'PRIMARY': Key(['region', 'id'], primary=True)},
+    'foreignKey': {},
+    'partitions': {},
+})
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = connect(f'sqlite:///{tmp_path}/pager.db')
+    db.exec('CREATE TABLE orders (region TEXT NOT NULL, id INTEGER NOT NULL, code TEXT NOT NULL UNIQUE, PRIMARY KEY (region, id))')
+    db.many('orders', [{'region': r, 'id': i, 'code': f'{r}{i:04}'} for r in ('eu', 'us') for i in range(1, 26)])
+    yield db
+    db.close()
+
+
+def keys(page):
+    return [(r['region'], r['id']) for r in page]
+
+
+class TestPager:
+    def test_key(self):
+        assert Pager.find_key(ORDERS) == ['region', 'id']
+        assert Pager.find_key(ORDERS, 'code') == ['code']
+        with pytest.raises(LookupError):
+            Pager(None, 'orders')
+
+    def test_forward_backward(self, db):
+        pager = Pager(db, ORDERS, size=20)
+        pages = [pager.page()]
+        while pages[-1].next:
+            pages.append(pager.page(pages[-1].next))
+        assert [len(p) for p in pages] == [20, 20, 10]
+        assert sum((keys(p) for p in pages), []) == [(r, i) for r in ('eu', 'us') for i in range(1, 26)]
+        assert pages[0].prev is None and pages[-1].next is None
+        assert keys(pager.page(pages[2].prev)) == keys(pages[1])
+        assert keys(pager.page(pages[1].prev)) == keys(pages[0])
+        assert pager.page(pages[1].prev).prev is None
+        last = pager.last()
+        assert keys(last) == [('us', i) for i in range(6, 26)]
+        assert last.next is None and keys(pager.page(last.prev))[-1] == ('us', 5)
+
+    def test_concurrent_insert(self, db):
+        """Rows inserted before the cursor do not shift the next page"""
+        pager = Pager(db, ORDERS, key='code', size=10, columns=['region', 'id'])
+        first = pager.page()
+        db.exec("INSERT INTO orders VALUES ('eu', 0, 'eu0000')")
+        second = pager.page(first.next)
+        assert [r['code'] for r in second] == [f'eu{i:04}' for i in range(11, 21)]
+
+    def test_desc_where(self, db):
+        pager = Pager(db, 'orders', key='code', size=5, where='region = %s', param=['us'], desc=True)
+        page = pager.page()
+        assert [r['code'] for r in page] == [f'us{i:04}' for i in range(25, 20, -1)]
+        assert [r['code'] for r in pager.page(page.next)] == [f'us{i:04}' for i in range(20, 15, -1)]
+
+    def test_seek_sql(self):
+        sql, param = Pager(None, ORDERS, size=5).seek_sql(['eu', 7])
+        assert 'OFFSET' not in sql and sql.endswith('ORDER BY `region` ASC, `id` ASC LIMIT 6')
+        assert '`region` >= %s AND (`region` > %s OR (`region` = %s AND `id` > %s))' in sql
+        assert param == ['eu', 'eu', 'eu', 7]
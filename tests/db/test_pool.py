@@ -0,0 +1,225 @@
+import pytest
+from ...db.main import Main
+from ...db.pool import Pool
+
+pytestmark = pytest.mark.db
+
+
+class FakeConn:
+    def __init__(self):
+        self.closed = False
+        self.alive = True
+
+    def close(self):
+        self.closed = True
+
+
+class FakeDb(Main):
+    def _check_config(self, cfg: dict) -> dict:
+        return {'host': cfg['host']}
+
+    def connect(self, config):
+        return FakeConn()
+
+    def ping(self, conn) -> bool:
+        return conn.alive
+
+    def select_db(self, db) -> bool:
+        return True
+
+    def exec(self, sql, param=[]):
+        return True
+
+    def many(self, tbl, data, config={}):
+        return True
+
+    def query(self, sql, param=[]):
+        return iter([])
+
+
+@pytest.fixture(autouse=True)
+def reset_pools():
+    """Start every test with an empty pool registry"""
+    Pool.close_all()
+    yield
+    Pool.close_all()
+
+
+class TestPool:
+    def test_reuse(self):
+        """A released connection is handed out again"""
+        pool = Pool(max_size=2)
+        conn = pool.acquire(FakeConn)
+        pool.release(conn)
+        assert pool.acquire(FakeConn) is conn
+        assert pool.size == 1
+
+    def test_max_size_timeout(self):
+        """Checkout blocks up to the timeout when every connection is in use"""
+        pool = Pool(max_size=1)
+        pool.acquire(FakeConn)
+        with pytest.raises(TimeoutError):
+            pool.acquire(FakeConn, timeout=0.01)
+
+    def test_validate_on_checkout(self):
+        """A connection that fails the ping is closed and replaced"""
+        pool = Pool(max_size=1)
+        conn = pool.acquire(FakeConn)
+        pool.release(conn)
+        conn.alive = False
+        other = pool.acquire(FakeConn, lambda c: c.alive)
+        assert other is not conn
+        assert conn.closed
+        assert pool.size == 1
+
+    def test_min_size_and_idle_eviction(self):
+        """Idle connections past the timeout are closed down to min_size"""
+        pool = Pool(min_size=1, max_size=3, idle_timeout=0)
+        conns = [pool.acquire(FakeConn) for _ in range(3)]
+        for conn in conns:
+            pool.release(conn)
+        assert pool.size == 1
+        assert pool.idle == 1
+        assert sum(c.closed for c in conns) == 2
+
+    def test_failed_connect_frees_slot(self):
+        """A connect returning None does not leak a slot"""
+        pool = Pool(max_size=1)
+        assert pool.acquire(lambda: None) is None
+        assert pool.size == 0
+
+    def test_connection_context(self):
+        """The context manager gives the connection back"""
+        pool = Pool()
+        with pool.connection(FakeConn) as conn:
+            assert pool.idle == 0
+        assert pool.idle == 1
+        assert not conn.closed
+
+    def test_key_hides_password(self):
+        """The key is stable and does not expose credentials"""
+        key = Pool.key({'host': 'h', 'password': 'secret'})
+        assert key == Pool.key({'password': 'secret', 'host': 'h'})
+        assert 'secret' not in key
+
+
+class TestMainPool:
+    def test_dedicated(self):
+        """Without pool every instance opens and closes its own connection"""
+        db = FakeDb({'host': 'dedicated'})
+        conn = db.conn
+        db.close()
+        assert conn.closed
+        assert db.conn is None
+
+    def test_pooled(self):
+        """With pool the connection is reused across instances"""
+        with FakeDb({'host': 'pooled'}, pool=True) as db:
+            conn = db.conn
+        assert not conn.closed
+        with FakeDb({'host': 'pooled'}, pool=True) as db:
+            assert db.conn is conn
+
+    def test_class_opt_in(self):
+        """Subclasses opt in through the pool class attribute"""
+        class PooledDb(FakeDb):
+            pool = {'max_size': 1, 'timeout': 0.01}
+
+        db = PooledDb({'host': 'class'})
+        other = PooledDb({'host': 'class'})
+        assert other.conn is None
+        assert isinstance(other.error, TimeoutError)
+        db.close()
+
+    def test_reset_discards(self):
+        """A connection whose state reset() cannot restore is closed, not reused"""
+        class DirtyDb(FakeDb):
+            def reset(self, conn):
+                return False
+
+        with DirtyDb({'host': 'dirty'}, pool=True) as db:
+            conn = db.conn
+        assert conn.closed
+        with DirtyDb({'host': 'dirty'}, pool=True) as db:
+            assert db.conn is not conn
+            assert Pool.pools[Pool.key({'host': 'dirty'})].size == 1
+
+
+class FakeMyCursor:
+    def __init__(self, conn, prepared=False):
+        self.conn = conn
+        self.prepared = prepared
+
+    def execute(self, sql, param=None):
+        if self.prepared:
+            self.conn.prepared.append(sql)
+        else:
+            self.conn.database = sql.split()[1]
+
+    def close(self):
+        if self.prepared:
+            self.conn.deallocated += 1
+
+
+class FakeMyConn(FakeConn):
+    def __init__(self, database):
+        super().__init__()
+        self.database = database
+        self.prepared = []
+        self.deallocated = 0
+
+    def cursor(self, prepared=False):
+        return FakeMyCursor(self, prepared)
+
+    def rollback(self):
+        pass
+
+    def ping(self, reconnect=False):
+        pass
+
+
+@pytest.fixture
+def mysql_db():
+    pytest.importorskip('mysql.connector')
+    from ...db.mysql import MySQL
+
+    class FakeMySQL(MySQL):
+        def connect(self, config):
+            return FakeMyConn(config.get('database'))
+
+    return FakeMySQL
+
+
+class TestMySQLPool:
+    def test_select_db_restored(self, mysql_db):
+        """The database of the DSN is selected again before the connection is reused"""
+        with mysql_db({'host': 'h', 'database': 'shop'}, pool=True) as db:
+            conn = db.conn
+            db.db = 'other'
+            assert conn.database == 'other'
+        with mysql_db({'host': 'h', 'database': 'shop'}, pool=True) as db:
+            assert db.conn is conn
+            assert db.conn.database == 'shop'
+
+    def test_select_db_statements_cleared(self, mysql_db):
+        """Statements prepared in the database of `select_db` are not reused by the next user"""
+        from ...db.statements import Statements
+        with mysql_db({'host': 'h', 'database': 'shop'}, pool=True) as db:
+            conn = db.conn
+            db.db = 'other'
+            cache = Statements.of(conn)
+            cache.execute('SELECT * FROM t')
+            assert 'SELECT * FROM t' in cache
+        with mysql_db({'host': 'h', 'database': 'shop'}, pool=True) as db:
+            assert db.conn is conn
+            assert 'SELECT * FROM t' not in Statements.of(conn)
+            assert conn.prepared == ['SELECT * FROM t'] and conn.deallocated == 1
+
+    def test_select_db_without_dsn_database(self, mysql_db):
+        """Without a database in the DSN the connection is closed"""
+        with mysql_db({'host': 'h'}, pool=True, db='other') as db:
+            conn = db.conn
+            assert conn.database == 'other'
+        assert conn.closed
+        with mysql_db({'host': 'h'}, pool=True) as db:
+            assert db.conn is not conn and db.conn.database is None
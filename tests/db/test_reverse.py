@@ -0,0 +1,123 @@
+import pytest
+from ...db.main import Main
+from ...db.dummy import DummyConn
+from ...db.reverse import Reverse
+from ...db.models.types import number, string, time
+
+pytestmark = pytest.mark.db
+
+VIEWS = {
+    'SCHEMATA': [('shop', 'utf8mb4_general_ci')],
+    'TABLES': [
+        ('shop', 'orders', 'InnoDB', 'utf8mb4_general_ci', 'Dynamic', 120, None, 'partitioned', 'Orders'),
+        ('shop', 'users', 'InnoDB', 'utf8mb4_general_ci', 'Dynamic', 80, None, 'max_rows=1000', ''),
+    ],
+    'COLUMNS': [
+        ('shop', 'orders', 'id', 'bigint', 'bigint(20) unsigned', 'NO', None, None, 20, 0, None, None, 'auto_increment', '', None),
+        ('shop', 'orders', 'user_id', 'int', 'int(11)', 'NO', None, None, 10, 0, None, None, '', '', None),
+        ('shop', 'orders', 'total', 'decimal', 'decimal(12,2)', 'YES', 'NULL', None, 12, 2, None, None, '', 'Sum', None),
+        ('shop', 'orders', 'status', 'enum', "enum('new','it''s paid')", 'NO', "'new'", 3, None, None, None, 'utf8mb4_general_ci', '', '', None),
+        ('shop', 'orders', 'updated', 'timestamp', 'timestamp(3)', 'NO', 'current_timestamp(3)', None, None, None, 3, None,
+         'on update current_timestamp(3)', '', None),
+        ('shop', 'orders', 'year', 'smallint', 'smallint(6)', 'YES', None, None, 5, 0, None, None, 'VIRTUAL GENERATED', '', 'year(`updated`)'),
+        ('shop', 'users', 'id', 'int', 'int', 'NO', None, None, 10, 0, None, None, 'auto_increment', '', None),
+        ('shop', 'users', 'email', 'varchar', 'varchar(120)', 'NO', None, 120, None, None, None, 'utf8mb4_bin', '', '', None),
+        ('shop', 'users', 'active', 'tinyint', 'tinyint(1)', 'NO', '1', None, 3, 0, None, None, '', '', None),
+        ('shop', 'users', 'shape', 'polygon', 'polygon', 'YES', None, None, None, None, None, None, '', '', None),
+        ('shop', 'views_only', 'x', 'int', 'int', 'YES', None, None, 10, 0, None, None, '', '', None),
+    ],
+    'STATISTICS': [
+        ('shop', 'orders', 'PRIMARY', 0, 'id', None, 'BTREE', ''),
+        ('shop', 'orders', 'user', 1, 'user_id', None, 'BTREE', ''),
+        ('shop', 'orders', 'user', 1, 'status', None, 'BTREE', ''),
+        ('shop', 'users', 'email', 0, 'email', 20, 'BTREE', 'login'),
+    ],
+    'KEY_COLUMN_USAGE': [
+        ('shop', 'orders', 'fk_user', 'user_id', 'shop', 'users', 'id', 'CASCADE', 'RESTRICT'),
+    ],
+    'PARTITIONS': [
+        ('shop', 'orders', 'p0', 'RANGE', 'id', 'HASH', 'id', '1000', 10, ''),
+        ('shop', 'orders', 'p0', 'RANGE', 'id', 'HASH', 'id', '1000', 5, ''),
+        ('shop', 'orders', 'pmax', 'RANGE', 'id', 'HASH', 'id', 'MAXVALUE', 1, ''),
+    ],
+}
+
+
+class SchemaDb(Main):
+    """Driver that answers the information_schema views"""
+
+    def _check_config(self, cfg: dict) -> dict:
+        self.log = []
+        return cfg
+
+    def connect(self, config):
+        return DummyConn()
+
+    def select_db(self, db) -> bool:
+        return True
+
+    def exec(self, sql, param=[]):
+        return True
+
+    def many(self, tbl, data, config={}):
+        return True
+
+    def query(self, sql, param=[]):
+        self.log.append((sql, param))
+        view = sql.split('information_schema.')[1].split()[0]
+        for row in VIEWS[view]:
+            yield {str(i): v for i, v in enumerate(row)}
+
+
+@pytest.fixture
+def db():
+    return SchemaDb({'host': 'memory'})
+
+
+class TestReverse:
+    def test_set_based(self, db):
+        rev = Reverse(db, 'shop')
+        tables = rev.run()
+        assert rev.queries == len(Reverse.views) == len(db.log)
+        assert all(param == ['shop'] for _, param in db.log)
+        assert list(tables['shop']) == ['orders', 'users']
+
+    def test_table(self, db):
+        orders = Reverse(db, ['shop']).run()['shop']['orders']
+        assert (orders.name, orders.engine, orders.comment, orders.db.name) == ('orders', 'InnoDB', 'Orders', 'shop')
+        users = Reverse(db, ['shop']).run()['shop']['users']
+        assert users.max_rows == 1000 and users.comment is None
+
+    def test_columns(self, db):
+        f = Reverse(db, 'shop').run()['shop']['orders'].fields
+        assert list(k for k in vars(f) if not k.startswith('_')) == ['id', 'user_id', 'total', 'status', 'updated', 'year']
+        assert type(f.id) is number.BigInt and f.id.unsigned and f.id.auto_increment and f.id.not_null
+        assert type(f.total) is number.Decimal and (f.total.length, f.total.decimals, f.total.default) == (12, 2, None)
+        assert type(f.status) is string.Enum and f.status.values == ('new', "it's paid") and f.status.default == 'new'
+        assert type(f.updated) is time.TimeStamp and f.updated.on_update == 'current_timestamp(3)' and f.updated.len == 3
+        assert f.year.virtual and f.year.expression == 'year(`updated`)'
+
+    def test_types(self, db):
+        f = Reverse(db, 'shop').run()['shop']['users'].fields
+        assert type(f.email) is string.VarChar and f.email.length == 120 and f.email.collate == 'utf8mb4_bin'
+        assert type(f.active) is number.Bool and f.active.default == '1'
+        assert Reverse.column('geometry_x', 'x', 'YES', None, None, None, None, None, None, '', '').__class__ is string.LongText
+
+    def test_keys(self, db):
+        t = Reverse(db, 'shop').run()['shop']
+        keys = t['orders'].keys
+        assert keys.PRIMARY.primary and keys.PRIMARY.columns == ['id']
+        assert keys.user.columns == ['user_id', 'status'] and not keys.user.unique
+        assert t['users'].keys.email.columns == ['email(20)'] and t['users'].keys.email.comment == 'login'
+        fk = t['orders'].foreignKey.fk_user
+        assert (fk.columns, fk.table, fk.references, fk.on_update) == (['user_id'], 'users', ['id'], 'CASCADE')
+
+    def test_partitions(self, db):
+        p = Reverse(db, 'shop').run()['shop']['orders'].partitions
+        assert (p.method, p.expression, p.subpartition_method) == ('RANGE', 'id', 'HASH')
+        assert (p.p0.rows, p.pmax.description) == (15, 'MAXVALUE')
+        assert Reverse(db, 'shop').run()['shop']['users'].partitions.method is None
+
+    def test_current_database(self, db):
+        Reverse(db).run()
+        assert all('DATABASE()' in sql and param == [] for sql, param in db.log)
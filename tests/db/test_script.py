@@ -0,0 +1,152 @@
+import pytest
+from ...db.script import Script
+
+pytestmark = pytest.mark.db
+
+
+class FakeCursor:
+    """Cursor of Connector/Python 9.2+ that runs a multi-statement query"""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.description = None
+        self.rowcount = -1
+
+    def execute(self, operation, params=None, map_results=False):
+        from mysql.connector.cursor import RE_PY_PARAM, _ParamSubstitutor
+        from ...db.mysql import MySQL
+        assert map_results
+        if isinstance(operation, str):
+            operation = operation.encode()
+        if params:
+            # the substitution of the connector
+            operation = RE_PY_PARAM.sub(_ParamSubstitutor(MySQL.literals(self.conn, params)), operation)
+        self.conn.calls.append((operation, params))
+        self.results = operation.decode().split(';\n')
+        self.__load()
+
+    def nextset(self):
+        self.results.pop(0)
+        if not self.results:
+            return False
+        self.__load()
+        return True
+
+    def __load(self):
+        from mysql.connector import Error
+        sql = self.results[0]
+        if sql.startswith('FAIL'):
+            raise Error(msg=sql)
+        self.description = [('x',)] if sql.startswith('SELECT') else None
+        self.rowcount = 2 if sql.startswith('SELECT') else len(sql)
+
+    def fetchall(self):
+        return [(1,), (2,)]
+
+    def close(self):
+        pass
+
+
+class FakeConn:
+    unread_result = False
+    python_charset = 'utf-8'
+    sql_mode = ''
+
+    def __init__(self):
+        from mysql.connector.conversion import MySQLConverter
+        self.converter = MySQLConverter()
+        self.calls = []
+        self.log = []
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.log.append('COMMIT')
+
+    def rollback(self):
+        self.log.append('ROLLBACK')
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def db():
+    pytest.importorskip('mysql.connector')
+    from ...db.mysql import MySQL
+
+    class FakeMySQL(MySQL):
+        def connect(self, config):
+            return FakeConn()
+
+    return FakeMySQL({'host': 'fake'})
+
+
+class TestScript:
+    def test_split(self):
+        """Only the ; outside of literals and comments split the script"""
+        sql = "INSERT t VALUES ('a;b'); -- done;\n/* x; */ UPDATE t SET `c;` = 1;\n-- trailing;"
+        assert Script.split(sql) == ["INSERT t VALUES ('a;b')", '-- done;\n/* x; */ UPDATE t SET `c;` = 1']
+
+    def test_params(self):
+        """Statements take their own or the shared parameters, named ones become positional"""
+        script = Script([
+            ('INSERT t VALUES (%s)', (1,)),
+            ('UPDATE t SET a = %(a)s WHERE id = %(id)s', {'id': 1, 'a': 2}),
+            'DELETE FROM t WHERE a = %s',
+        ], (9,))
+        assert script.text == 'INSERT t VALUES (%s);\nUPDATE t SET a = %s WHERE id = %s;\nDELETE FROM t WHERE a = %s'
+        assert script.params == [1, 2, 1, 9]
+
+    def test_percent_literal(self):
+        """A `%` inside a literal or a comment is not a placeholder"""
+        script = Script(["SELECT 1 FROM t WHERE a LIKE '%sales%'", "SELECT DATE_FORMAT(NOW(), '%H:%i:%s')"])
+        assert script.statements == ["SELECT 1 FROM t WHERE a LIKE '%sales%'", "SELECT DATE_FORMAT(NOW(), '%H:%i:%s')"]
+        assert script.params == [] and script.counts == [0, 0]
+        script = Script([("SELECT %s, '%s' /* %s */ FROM t WHERE b LIKE '%x%'", (1,)), "SELECT '%s'"])
+        assert script.statements[0] == "SELECT %s, '%s' /* %s */ FROM t WHERE b LIKE '%x%'"
+        assert script.params == [1] and script.counts == [1, 0]
+
+    def test_fallback_literal(self, tmp_path):
+        """Statement lists with `%` in literals run through `exec` of SQLite"""
+        from ...db.conn import connect
+        sqlite = connect(f'sqlite:///{tmp_path}/s.db')
+        assert sqlite.exec(['CREATE TABLE t (a TEXT)', "INSERT INTO t VALUES ('%sales%')", ("INSERT INTO t VALUES (%s)", ('x',))]) == [True] * 3
+        assert sqlite.all("SELECT a FROM t WHERE a LIKE '%sales%'") == [{'a': '%sales%'}]
+        sqlite.close()
+
+
+class TestMySQLScript:
+    def test_one_round_trip(self, db):
+        result = db.script('UPDATE a; SELECT 1; DELETE b')
+        assert len(db.conn.calls) == 1
+        assert result and result.rowcounts == [8, 2, 8]
+        assert result.results[1]['rows'] == [(1,), (2,)]
+        assert db.conn.log == ['COMMIT']
+
+    def test_error_index(self, db):
+        """The failing statement is reported and the script rolled back"""
+        result = db.script(['UPDATE a', 'FAIL b', 'DELETE c'])
+        assert not result
+        assert result.index == 1
+        assert result.rowcounts == [8]
+        assert db.conn.log == ['ROLLBACK']
+
+    def test_exec_list(self, db):
+        assert db.exec(['UPDATE a', 'UPDATE b']) == [True, True]
+        assert len(db.conn.calls) == 1
+        assert db.exec(['UPDATE a', 'FAIL b', 'UPDATE c']) == [True, False]
+
+    def test_percent_literal(self, db):
+        """A `%` inside a literal survives next to a statement with parameters"""
+        result = db.script(["UPDATE t SET flag=1 WHERE name LIKE '%sales%'", ('INSERT INTO log (id, note) VALUES (%s, %s)', (7, "it's"))])
+        assert result, result.error
+        assert db.conn.calls == [(b"UPDATE t SET flag=1 WHERE name LIKE '%sales%';\nINSERT INTO log (id, note) VALUES (7, 'it\\'s')", None)]
+
+    def test_connector_substitution(self, db):
+        """The connector fills the `%s` of the literals too, so the script cannot be sent with parameters"""
+        from mysql.connector import ProgrammingError
+        script = Script(["UPDATE t SET flag=1 WHERE name LIKE '%sales%'", ('INSERT INTO log (id) VALUES (%s)', (7,))])
+        with pytest.raises(ProgrammingError):
+            db.conn.cursor().execute(script.text, script.params, map_results=True)
@@ -0,0 +1,70 @@
+import pytest
+from ...db.snapshot import Snapshot
+from ...db.models.types import number, string
+from .test_reverse import SchemaDb
+
+pytestmark = pytest.mark.db
+
+
+class FingerprintDb(SchemaDb):
+    """Driver that also answers the fingerprint query"""
+
+    def _check_config(self, cfg: dict) -> dict:
+        self.created = {'orders': '2024-01-01', 'users': '2024-01-01'}
+        return super()._check_config(cfg)
+
+    def query(self, sql, param=[]):
+        if 'CRC32' not in sql:
+            yield from super().query(sql, param)
+            return
+        self.log.append((sql, param))
+        for name, created in self.created.items():
+            yield {str(i): v for i, v in enumerate(('shop', name, created, 'InnoDB') + (None,) * 11)}
+
+
+@pytest.fixture
+def db():
+    return FingerprintDb({'host': 'memory'})
+
+
+class TestSnapshot:
+    def test_refresh(self, db):
+        snap = Snapshot(db, 'shop')
+        assert snap.refresh() == {'added': ['shop.orders', 'shop.users'], 'changed': [], 'removed': []}
+        assert set(snap.tables['shop']) == {'orders', 'users'}
+
+        db.log.clear()
+        assert snap.refresh() == {'added': [], 'changed': [], 'removed': []}
+        assert len(db.log) == 1
+
+    def test_changed_only(self, db):
+        snap = Snapshot(db, 'shop')
+        snap.refresh()
+        db.log.clear()
+        db.created['users'] = '2024-02-01'
+        assert snap.refresh()['changed'] == ['shop.users']
+        reads = db.log[1:]
+        assert reads and all(param[-2:] == ['shop', 'users'] for sql, param in reads if 'SCHEMATA' not in sql)
+
+    def test_removed(self, db):
+        snap = Snapshot(db, 'shop')
+        snap.refresh()
+        del db.created['users']
+        assert snap.refresh()['removed'] == ['shop.users']
+        assert list(snap.tables['shop']) == ['orders']
+
+    def test_file(self, db, tmp_path):
+        file = str(tmp_path / 'snapshot' / 'shop.json')
+        Snapshot(db, 'shop', file).refresh()
+
+        db.log.clear()
+        snap = Snapshot(db, 'shop', file)
+        assert snap.refresh() == {'added': [], 'changed': [], 'removed': []}
+        assert len(db.log) == 1
+        orders = snap.tables['shop']['orders']
+        assert (orders.engine, orders.db.name) == ('InnoDB', 'shop')
+        assert type(orders.fields.id) is number.BigInt and orders.fields.id.auto_increment
+        assert type(orders.fields.status) is string.Enum and orders.fields.status.values == ('new', "it's paid")
+        assert orders.keys.user.columns == ['user_id', 'status']
+        assert orders.foreignKey.fk_user.table == 'users'
+        assert (orders.partitions.method, orders.partitions.p0.rows) == ('RANGE', 15)
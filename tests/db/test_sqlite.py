@@ -0,0 +1,75 @@
+import pytest
+from ...core import fn
+from ...db.conn import connect
+from ...db.sqlite import SQLite
+
+pytestmark = pytest.mark.db
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = connect(f'sqlite:///{tmp_path}/stage.db')
+    db.exec('CREATE TABLE t (id INTEGER PRIMARY KEY, name TEXT, amount REAL)')
+    yield db
+    db.close()
+
+
+class TestSQLite:
+    def test_dsn(self, tmp_path):
+        assert fn.dsn('sqlite:////var/data/a.db')['path'] == '/var/data/a.db'
+        assert fn.dsn('sqlite:///a.db')['path'] == 'a.db'
+        assert isinstance(connect('sqlite:///:memory:'), SQLite)
+
+    def test_pragmas(self, db):
+        assert db.value('PRAGMA journal_mode') == 'wal'
+        assert db.value('PRAGMA mmap_size') > 0
+
+    def test_placeholders(self):
+        assert SQLite.placeholders("SELECT '%s', %s, %(id)s, 5 %% 2") == "SELECT '%s', ?, :id, 5 % 2"
+
+    def test_exec_query(self, db):
+        assert db.exec('INSERT INTO t VALUES (%s, %s, %s)', (1, 'a', 1.5))
+        assert db.exec('INSERT INTO t VALUES (%(id)s, %(name)s, NULL)', {'id': 2, 'name': 'b'})
+        assert db.all('SELECT * FROM t WHERE id > %s ORDER BY id', (0,)) == [
+            {'id': 1, 'name': 'a', 'amount': 1.5},
+            {'id': 2, 'name': 'b', 'amount': None},
+        ]
+        assert not db.exec('INSERT INTO t VALUES (1, NULL, NULL)')
+        assert db.error is not None
+
+    def test_many(self, db):
+        result = db.many('t', ({'id': i, 'name': str(i)} for i in range(1, 101)), {'max_rows': 30})
+        assert result and (result.rows, result.batches) == (100, 4)
+        assert db.value('SELECT COUNT(*) FROM t') == 100
+
+    def test_many_errors(self, db):
+        """A failing batch is undone and the others are kept"""
+        db.exec('INSERT INTO t VALUES (15, NULL, NULL)')
+        result = db.many('t', [{'id': i} for i in range(1, 31)], {'max_rows': 10})
+        assert not result
+        assert [e['batch'] for e in result.errors] == [2]
+        assert db.value('SELECT COUNT(*) FROM t') == 21
+
+    def test_upsert(self, db):
+        db.many('t', [{'id': 1, 'name': 'a'}])
+        db.many('t', [{'id': 1, 'name': 'b'}], {'update': ['name']})
+        assert db.value('SELECT name FROM t WHERE id = 1') == 'b'
+
+    def test_transaction(self, db):
+        with db.transaction():
+            db.exec('INSERT INTO t (id) VALUES (1)')
+            with db.transaction():
+                db.exec('INSERT INTO t (id) VALUES (2)')
+                db.exec('INSERT INTO t (id) VALUES (1)')
+        assert [r['id'] for r in db.all('SELECT id FROM t')] == [1]
+
+    def test_script(self, db):
+        result = db.script('INSERT INTO t (id) VALUES (1); INSERT INTO t (id) VALUES (1); INSERT INTO t (id) VALUES (2)')
+        assert result.index == 1
+        assert db.value('SELECT COUNT(*) FROM t') == 0
+
+    def test_columns(self, db):
+        np = pytest.importorskip('numpy')
+        db.many('t', [{'id': 1, 'amount': 2.5}, {'id': 2, 'amount': 3.5}])
+        cols = db.query_columns('SELECT id, amount FROM t')
+        assert np.asarray(cols['amount'], dtype=float).sum() == 6.0
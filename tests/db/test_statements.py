@@ -0,0 +1,76 @@
+import pytest
+from ...db.statements import Statements
+
+pytestmark = pytest.mark.db
+
+
+class FakeCursor:
+    def __init__(self):
+        self.executed = []
+        self.closed = False
+
+    def execute(self, operation, params=()):
+        self.executed.append((operation, params))
+
+    def close(self):
+        self.closed = True
+
+
+class FakeConn:
+    def __init__(self):
+        self.connection_id = 1
+        self.cursors = []
+
+    def cursor(self, prepared=False):
+        assert prepared
+        self.cursors.append(FakeCursor())
+        return self.cursors[-1]
+
+
+class TestStatements:
+    def test_hit_miss(self):
+        """The same SQL reuses its prepared cursor and operation object"""
+        conn = FakeConn()
+        cache = Statements.of(conn)
+        sql = 'SELECT * FROM t WHERE id = %s'
+        first = cache.execute(sql, (1,))
+        second = cache.execute(''.join(sql), (2,))
+        assert first is second
+        assert first.executed[0][0] is first.executed[1][0]
+        assert cache.stats == {'size': 1, 'hits': 1, 'misses': 1}
+        assert Statements.of(conn) is cache
+
+    def test_named(self):
+        """Named placeholders are prepared once as positional"""
+        conn = FakeConn()
+        cache = Statements(conn)
+        cursor = cache.execute('SELECT %(b)s, %(a)s', {'a': 1, 'b': 2})
+        assert cursor.executed == [('SELECT %s, %s', (2, 1))]
+
+    def test_lru(self):
+        """The least recently used statement is closed past the size"""
+        conn = FakeConn()
+        cache = Statements(conn, 2)
+        cache.execute('A')
+        cache.execute('B')
+        cache.execute('A')
+        cache.execute('C')
+        assert 'B' not in cache
+        assert 'A' in cache and 'C' in cache
+        assert conn.cursors[1].closed
+
+    def test_reconnect(self):
+        """A new connection id drops the statements"""
+        conn = FakeConn()
+        cache = Statements.of(conn)
+        cache.execute('A')
+        conn.connection_id = 2
+        assert len(Statements.of(conn)) == 0
+
+    def test_clear(self):
+        conn = FakeConn()
+        cache = Statements(conn)
+        cache.execute('A')
+        cache.clear()
+        assert len(cache) == 0
+        assert conn.cursors[0].closed
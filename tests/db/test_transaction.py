@@ -0,0 +1,155 @@
+import pytest
+from ...db.main import Main
+
+pytestmark = pytest.mark.db
+
+
+class LogConn:
+    """DB-API connection that records what it is asked to do"""
+
+    def __init__(self):
+        self.log = []
+
+    def cursor(self):
+        return self
+
+    def execute(self, sql, param=()):
+        self.log.append(sql)
+
+    def commit(self):
+        self.log.append('COMMIT')
+
+    def rollback(self):
+        self.log.append('ROLLBACK')
+
+    def close(self):
+        pass
+
+
+class TxDb(Main):
+    """Driver whose exec fails on statements with FAIL"""
+
+    def _check_config(self, cfg: dict) -> dict:
+        return cfg
+
+    def connect(self, config):
+        return LogConn()
+
+    def select_db(self, db) -> bool:
+        return True
+
+    def exec(self, sql, param=[]):
+        if 'FAIL' in sql:
+            self.error = RuntimeError(sql)
+            return False
+        self.conn.execute(sql)
+        self._commit()
+        return True
+
+    def many(self, tbl, data, config={}):
+        return True
+
+    def query(self, sql, param=[]):
+        return iter([])
+
+
+@pytest.fixture
+def db():
+    return TxDb({'host': 'memory'})
+
+
+class TestTransaction:
+    def test_autocommit(self, db):
+        db.exec('A')
+        db.exec('B')
+        assert db.conn.log == ['A', 'COMMIT', 'B', 'COMMIT']
+
+    def test_one_commit(self, db):
+        with db.transaction():
+            db.exec('A')
+            db.exec('B')
+            assert db.in_transaction
+        assert db.conn.log == ['A', 'B', 'COMMIT']
+        assert not db.in_transaction
+
+    def test_failed_statement(self, db):
+        """A statement that fails rolls the block back"""
+        with db.transaction():
+            db.exec('A')
+            db.exec('FAIL')
+        assert db.conn.log == ['A', 'ROLLBACK']
+
+    def test_exception(self, db):
+        with pytest.raises(KeyError):
+            with db.transaction():
+                db.exec('A')
+                raise KeyError('x')
+        assert db.conn.log == ['A', 'ROLLBACK']
+
+    def test_savepoint(self, db):
+        """A nested failure only undoes the savepoint"""
+        with db.transaction():
+            db.exec('A')
+            with db.transaction():
+                db.exec('B')
+                db.exec('FAIL')
+            with db.transaction():
+                db.exec('C')
+        assert db.conn.log == [
+            'A',
+            'SAVEPOINT liger_sp1', 'B', 'ROLLBACK TO SAVEPOINT liger_sp1',
+            'SAVEPOINT liger_sp1', 'C', 'RELEASE SAVEPOINT liger_sp1',
+            'COMMIT',
+        ]
+
+    def test_joined(self, db):
+        """Without savepoint a nested failure rolls back everything"""
+        with db.transaction():
+            db.exec('A')
+            with db.transaction(savepoint=False):
+                db.exec('FAIL')
+        assert db.conn.log == ['A', 'ROLLBACK']
+
+
+class TestGroupCommit:
+    def test_statements(self, db):
+        db.group_commit = {'statements': 3, 'seconds': 60}
+        for sql in 'ABCDE':
+            db.exec(sql)
+        assert db.conn.log == ['A', 'B', 'C', 'COMMIT', 'D', 'E']
+        assert db.flush() == 2
+        assert db.conn.log[-1] == 'COMMIT'
+        assert db.flush() == 0
+
+    def test_seconds(self, db):
+        db.group_commit = {'statements': 100, 'seconds': 0}
+        db.exec('A')
+        assert db.conn.log == ['A', 'COMMIT']
+
+    def test_seconds_on_query(self, db, monkeypatch):
+        """A query commits the pending writes once the oldest is `seconds` old"""
+        import time
+        clock = [100.0]
+        monkeypatch.setattr(time, 'monotonic', lambda: clock[0])
+        db.group_commit = {'statements': 100, 'seconds': 5}
+        db.exec('A')
+        db.all('SELECT 1')
+        assert db.conn.log == ['A']
+        clock[0] += 5
+        db.all('SELECT 1')
+        assert db.conn.log == ['A', 'COMMIT']
+
+    def test_close(self, db):
+        """Pending writes are committed when the connection closes"""
+        db.group_commit = True
+        db.exec('A')
+        conn = db.conn
+        db.close()
+        assert conn.log == ['A', 'COMMIT']
+
+    def test_transaction_flushes(self, db):
+        db.group_commit = True
+        db.exec('A')
+        with db.transaction():
+            db.exec('B')
+        assert db.conn.log == ['A', 'COMMIT', 'B', 'COMMIT']
@@ -0,0 +1,45 @@
+import pickle
+import pytest
+from ...db.models.types import number, string, time, geo, element
+
+pytestmark = pytest.mark.db
+
+
+class TestTypes:
+    def test_interned(self):
+        """Equal definitions are one object"""
+        assert string.VarChar(255) is string.VarChar(255)
+        assert string.VarChar(255) is not string.VarChar(255, not_null=True)
+        assert string.VarChar(255) is not string.Char(255)
+        assert element.EMail(120) is element.EMail(120)
+        assert string.Enum(['a', 'b']) is string.Enum(('a', 'b'))
+
+    def test_interned_types(self):
+        """Equal values of other types are other definitions"""
+        assert number.Int(default=True) is not number.Int(default=1)
+        assert type(number.Int(default=1).default) is int
+        assert number.Decimal(default=1) is not number.Decimal(default=1.0)
+        assert type(number.Decimal(default=1).default) is int
+
+    def test_slots(self):
+        for t in (number.Int(), number.Decimal(10, 2), string.Text(), time.DateTime(), time.TimeStamp(), geo.Polygon()):
+            assert not hasattr(t, '__dict__')
+
+    def test_immutable(self):
+        t = number.Int(11)
+        with pytest.raises(AttributeError):
+            t.length = 5
+        with pytest.raises(AttributeError):
+            del t.length
+        assert t.length == 11
+
+    def test_replace(self):
+        t = number.Decimal(10, 2)
+        assert t.replace(not_null=True) is number.Decimal(10, 2, not_null=True)
+        assert t.decimals == 2 and not t.not_null
+
+    def test_state(self):
+        t = time.DateTime(3, not_null=True)
+        assert time.DateTime.from_state(t.state()) is t
+        assert pickle.loads(pickle.dumps(t)) is t
+        assert 'len' not in t.state() and t.state()['length'] == 3
@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+from ...db.validate import Validator
+from ...db.dummy import Dummy
+from ...db.models.types import number as n, string as s, time as t
+
+pytestmark = pytest.mark.db
+
+FIELDS = {
+    'id': n.Int(auto_increment=True, not_null=True),
+    'age': n.TinyInt(unsigned=True, not_null=True),
+    'price': n.Decimal(5, 2),
+    'name': s.VarChar(5, not_null=True),
+    'status': s.Enum(['new', 'done']),
+    'tags': s.Set(['a', 'b']),
+    'year': t.Year(),
+}
+
+
+class TestValidator:
+    def test_plan(self):
+        plan = Validator(FIELDS).plan
+        assert ('id', 'null', None) not in plan
+        assert ('age', 'min', 0) in plan and ('age', 'max', 255) in plan
+        assert ('price', 'max', 999.99) in plan
+        assert ('name', 'length', 5) in plan
+
+    def test_valid(self):
+        rows = [
+            {'age': 30, 'price': 12.5, 'name': 'ann', 'status': 'new', 'tags': 'a,b', 'year': 2020},
+            {'age': 0, 'price': None, 'name': 'bob', 'status': None, 'tags': '', 'year': None},
+        ]
+        result = Validator(FIELDS).check(rows)
+        assert result and result.errors() == []
+
+    def test_masks(self):
+        rows = [
+            {'age': 30, 'name': 'ann'},
+            {'age': 256, 'name': 'bob'},
+            {'age': None, 'name': 'toolong'},
+            {'age': 'x', 'name': 'eve', 'price': 1000},
+            {'age': 1.5, 'name': 'joe', 'status': 'old', 'tags': 'a,c', 'year': 1800},
+        ]
+        result = Validator(FIELDS).check(rows)
+        assert not result
+        assert result.invalid.tolist() == [False, True, True, True, True]
+        assert result.masks['age']['max'].tolist() == [False, True, False, False, False]
+        assert result.masks['age']['null'].tolist() == [False, False, True, False, False]
+        assert result.masks['age']['type'].tolist() == [False, False, False, True, True]
+        assert result.masks['name']['length'].tolist() == [False, False, True, False, False]
+        assert {(e['column'], e['rule']) for e in result.errors() if e['row'] == 4} == \
+            {('age', 'type'), ('status', 'values'), ('tags', 'values'), ('year', 'min')}
+        assert result.errors()[0] == {'row': 1, 'column': 'age', 'rule': 'max'}
+        assert result.select(rows) == rows[:1]
+
+    def test_columns(self):
+        """Columns as arrays, like query_columns()"""
+        result = Validator({'v': n.SmallInt(not_null=True)}).check({'v': np.array([1.0, np.nan, 40000])})
+        assert result.invalid.tolist() == [False, True, True]
+
+    def test_bigint(self):
+        """The limits of BIGINT are checked exactly, not on float64"""
+        fields = {'u': n.BigInt(unsigned=True), 'b': n.BigInt()}
+        rows = [
+            {'u': 2**64 - 1, 'b': 2**63 - 1},
+            {'u': 2**64, 'b': -2**63},
+            {'u': 0, 'b': 2**63},
+            {'u': 0, 'b': -2**63 - 1},
+            {'u': str(2**64), 'b': None},
+        ]
+        result = Validator(fields).check(rows)
+        assert result.masks['u']['max'].tolist() == [False, True, False, False, True]
+        assert result.masks['b']['max'].tolist() == [False, False, True, False, False]
+        assert result.masks['b']['min'].tolist() == [False, False, False, True, False]
+        columns = {'u': np.array([2**64 - 1, 1], dtype=np.uint64), 'b': np.array([2**63 - 1, -2**63], dtype=np.int64)}
+        assert Validator(fields).check(columns)
+
+    def test_stream(self):
+        rows = [{'age': i, 'name': 'x'} for i in range(250, 260)]
+        rejected = []
+        out = list(Validator(FIELDS).stream(rows, size=4, rejected=rejected))
+        assert out == rows[:6]
+        assert len(rejected) == 4 and rejected[0][1] == [{'column': 'age', 'rule': 'max'}]
+
+    def test_dummy(self):
+        """Rows generated from the types are valid"""
+        tables = {'t': {k: v for k, v in FIELDS.items() if k not in ('status', 'tags')}}
+        rows = Dummy({'scheme': 'dummy', 'rows': 500, 'seed': 1, 'tables': tables}).all('SELECT * FROM t')
+        assert Validator(tables['t']).check(rows)